@@ -0,0 +1,200 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from decodificador_bruno_c_t_elias import (TESTES, Instruction, MIPSDecoder, TIPO_POR_OPCODE, format_output,
+                                           parse_int, print_output)
+
+# Benchmark dos caminhos quentes do decodificador. Cada cenário roda uma função sobre um corpus de entradas
+# e mede operações por segundo, percentis do tempo médio por chamada em lotes de TAMANHO_LOTE chamadas
+# (não de chamadas isoladas: o perf_counter custa quase o mesmo que uma chamada) e pico de memória
+# (tracemalloc, numa rodada separada pra não atrapalhar o tempo). O resultado vai pra um JSON que pode ser comparado com
+# uma rodada anterior usando --compara.
+#
+# Uso: python benchmark.py [--n 20000] [--seed 42] [--saida resultado.json] [--compara anterior.json]
+
+# mistura "realista": frequência aproximada de código compilado (muito load/store, addiu, desvio e nop)
+MISTURA_REALISTA = (
+    ('lw', 22), ('sw', 12), ('addiu', 15), ('addu', 8), ('sll', 6), ('nop', 6), ('beq', 6), ('bne', 6),
+    ('lui', 4), ('ori', 3), ('jal', 3), ('jr', 3), ('slt', 2), ('andi', 2), ('subu', 1), ('lbu', 1),
+)
+
+# quantas chamadas entram em cada medida de tempo (medir uma chamada só teria mais ruído que sinal)
+TAMANHO_LOTE = 64
+
+
+def palavras_testes() -> list:
+    return [int(bits, 2) for bits in TESTES]
+
+
+def palavras_aleatorias(n: int, rng: random.Random) -> list:
+    return [rng.getrandbits(32) for _ in range(n)]
+
+
+def palavras_realistas(n: int, rng: random.Random) -> list:
+    nomes = [nome for nome, _ in MISTURA_REALISTA]
+    pesos = [peso for _, peso in MISTURA_REALISTA]
+    opcodes = {nome: opcode for opcode, (nome, _) in MIPSDecoder.OPCODES.items()}
+    functs = {nome: funct for funct, nome in MIPSDecoder.FUNCTIONS.items()}
+    palavras = []
+    for nome in rng.choices(nomes, pesos, k=n):
+        rs, rt, rd = rng.choice((29, 28, 16, 17, 4, 8)), rng.randrange(32), rng.randrange(32)
+        if nome == 'nop':
+            palavras.append(0)
+        elif nome in functs:
+            shamt = rng.randrange(32) if nome == 'sll' else 0
+            palavras.append((rs << 21) | (rt << 16) | (rd << 11) | (shamt << 6) | functs[nome])
+        elif nome == 'jal':
+            palavras.append((3 << 26) | rng.randrange(0x100000, 0x110000))
+        else:
+            imediato = rng.randrange(-64, 64) & 0xFFFF if nome in ('beq', 'bne') else rng.randrange(0, 256) * 4
+            palavras.append((opcodes[nome] << 26) | (rs << 21) | (rt << 16) | imediato)
+    return palavras
+
+
+class _Descarta:
+    # stdout falso pro cenário do print_output: o custo de formatar e chamar print fica, o terminal não
+    def write(self, texto: str) -> int:
+        return len(texto)
+
+    def flush(self) -> None:
+        pass
+
+
+def _cenarios(palavras: list) -> dict:
+    # nome do cenário -> (fábrica da função que recebe uma entrada, lista de entradas já preparadas).
+    # a fábrica é chamada antes de cada rodada do _mede, então cenário com estado (o cache do decode_cached)
+    # começa frio tanto na rodada de tempo quanto na de memória; os sem estado devolvem sempre a mesma função
+    decoder = MIPSDecoder()
+    instrucoes = [decoder.decode_word(w) for w in palavras]
+    campos = [(f'{w:032b}', TIPO_POR_OPCODE[w >> 26], w >> 26) for w in palavras]
+    textos = [random.Random(i).choice((bin(w), hex(w), str(w), oct(w))) for i, w in enumerate(palavras)]
+    pares = [(instr, decoder.get_sinais_de_controle(instr)) for instr in instrucoes]
+
+    def ponta_a_ponta(texto):
+        instr = decoder.decode_word(parse_int(texto))
+        return format_output(instr, decoder.get_sinais_de_controle(instr))
+
+    def mnemonico(instr):
+        return Instruction.get_mnemonic(instr.fields, instr.type)
+
+    def sem_estado(funcao):
+        return lambda: funcao
+
+    return {
+        'parse_int': (sem_estado(parse_int), textos),
+        'Instruction.get_fields': (sem_estado(lambda c: Instruction.get_fields(*c)), campos),
+        'get_mnemonic': (sem_estado(mnemonico), instrucoes),
+        'get_sinais_de_controle': (sem_estado(decoder.get_sinais_de_controle), instrucoes),
+        'print_output': (sem_estado(lambda par: print_output(*par)), pares),
+        'parse_instruction': (sem_estado(decoder.parse_instruction), [c[0] for c in campos]),
+        'decode_word': (sem_estado(decoder.decode_word), palavras),
+        'decode_cached': (lambda: MIPSDecoder(cache_size=4096).decode_cached, palavras),
+        'ponta_a_ponta': (sem_estado(ponta_a_ponta), textos),
+    }
+
+
+def _percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def _mede(fabrica, entradas: list) -> dict:
+    # fabrica() dá uma função nova pra cada rodada (ver _cenarios)
+    funcao = fabrica()
+    latencias = []
+    inicio_total = time.perf_counter_ns()
+    for i in range(0, len(entradas), TAMANHO_LOTE):
+        lote = entradas[i:i + TAMANHO_LOTE]
+        inicio = time.perf_counter_ns()
+        for entrada in lote:
+            funcao(entrada)
+        latencias.append((time.perf_counter_ns() - inicio) / len(lote))
+    total = (time.perf_counter_ns() - inicio_total) / 1e9
+    funcao = fabrica()
+    tracemalloc.start()
+    for entrada in entradas:
+        funcao(entrada)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'chamadas': len(entradas),
+        'ops_por_segundo': len(entradas) / total if total else 0.0,
+        # percentis sobre as médias de cada lote, não sobre chamadas individuais
+        'latencia_media_lote_ns': {
+            'p50': _percentil(latencias, 50),
+            'p90': _percentil(latencias, 90),
+            'p99': _percentil(latencias, 99),
+        },
+        'pico_memoria_bytes': pico,
+    }
+
+
+def roda(n: int = 20000, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    misturas = {
+        'testes': (palavras_testes() * (n // len(TESTES) + 1))[:n],
+        'aleatorio': palavras_aleatorias(n, rng),
+        'realista': palavras_realistas(n, rng),
+    }
+    resultados = {}
+    with contextlib.redirect_stdout(_Descarta()):
+        for nome_mistura, palavras in misturas.items():
+            for nome, (fabrica, entradas) in _cenarios(palavras).items():
+                resultados[f'{nome_mistura}/{nome}'] = _mede(fabrica, entradas)
+    return {
+        'meta': {
+            'n': n,
+            'seed': seed,
+            'python': sys.version.split()[0],
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+            'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'resultados': resultados,
+    }
+
+
+def formata(resultado: dict, anterior: dict = None) -> str:
+    linhas = [f'{"cenário":<40} {"ops/s":>12} {"p50 lote":>9} {"p99 lote":>9} {"pico KiB":>9}'
+              + (f' {"vs anterior":>12}' if anterior else '')]
+    for nome, r in resultado['resultados'].items():
+        linha = (f'{nome:<40} {r["ops_por_segundo"]:>12.0f} {r["latencia_media_lote_ns"]["p50"]:>9.0f} '
+                 f'{r["latencia_media_lote_ns"]["p99"]:>9.0f} {r["pico_memoria_bytes"] / 1024:>9.1f}')
+        if anterior:
+            antes = anterior['resultados'].get(nome)
+            if antes and antes['ops_por_segundo']:
+                linha += f' {r["ops_por_segundo"] / antes["ops_por_segundo"]:>11.2f}x'
+            else:
+                linha += f' {"-":>12}'
+        linhas.append(linha)
+    return '\n'.join(linhas) + '\n'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark dos caminhos quentes do decodificador MIPS')
+    parser.add_argument('--n', type=int, default=20000, help='entradas por cenário')
+    parser.add_argument('--seed', type=int, default=42, help='semente das misturas aleatória e realista')
+    parser.add_argument('--saida', help='arquivo JSON onde salvar o resultado')
+    parser.add_argument('--compara', help='JSON de uma rodada anterior pra comparar')
+    args = parser.parse_args()
+
+    resultado = roda(args.n, args.seed)
+    anterior = None
+    if args.compara:
+        with open(args.compara, encoding='utf-8') as f:
+            anterior = json.load(f)
+    print(formata(resultado, anterior), end='')
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
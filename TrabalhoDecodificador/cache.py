@@ -0,0 +1,231 @@
+import random
+from array import array
+
+from perfis import ACESSO_MEMORIA, ESCREVE_MEMORIA
+
+# Simulador de cache guiado por trace: L1 de instrução, L1 de dados e uma L2 unificada atrás das duas.
+# Consome o mesmo trace do pipeline.py (MIPSSimulator.rastreia(): pc, palavra, próximo pc, endereço):
+# toda instrução é uma busca na L1I e, se tiver endereço, um acesso na L1D, que é escrita quando a
+# instrução escreve na memória (MemWrite da ROM, ou swc1) e leitura nos outros casos.
+#
+# Cada nível guarda as tags num array só (conjuntos * vias posições, -1 = vazia), com outro array pra idade
+# (último uso no LRU, chegada no FIFO) e um bytearray de bits sujos. A tag guardada é o número do bloco
+# inteiro (endereço >> bits da linha), então não precisa remontar o endereço na hora de expulsar.
+
+SUBSTITUICOES = ('LRU', 'FIFO', 'random')
+POLITICAS_ESCRITA = ('write-back', 'write-through')
+
+
+def _potencia_de_2(valor: int, nome: str) -> int:
+    if valor <= 0 or valor & (valor - 1):
+        raise ValueError(f'{nome} precisa ser potência de 2, não {valor}')
+    return valor.bit_length() - 1
+
+
+class Cache:
+
+    def __init__(self, nome: str, tamanho: int = 32 * 1024, associatividade: int = 4, linha: int = 32,
+                 substituicao: str = 'LRU', escrita: str = 'write-back', aloca_na_escrita: bool = None,
+                 proximo: 'Cache' = None, semente: int = 0) -> None:
+        # tamanho e linha em bytes. aloca_na_escrita=None usa o par mais comum: write-back aloca,
+        # write-through não. proximo é o nível de baixo (None = memória principal)
+        if substituicao not in SUBSTITUICOES:
+            raise ValueError(f'substituição desconhecida: {substituicao!r} (use {", ".join(SUBSTITUICOES)})')
+        if escrita not in POLITICAS_ESCRITA:
+            raise ValueError(f'política de escrita desconhecida: {escrita!r} (use {", ".join(POLITICAS_ESCRITA)})')
+        self.nome = nome
+        self.tamanho = tamanho
+        self.associatividade = associatividade
+        self.linha = linha
+        self.substituicao = substituicao
+        self.escrita = escrita
+        self.write_back = escrita == 'write-back'
+        self.aloca_na_escrita = self.write_back if aloca_na_escrita is None else aloca_na_escrita
+        self.proximo = proximo
+        self.bits_linha = _potencia_de_2(linha, 'linha')
+        conjuntos = tamanho // (linha * associatividade)
+        _potencia_de_2(conjuntos, 'tamanho / (linha * associatividade)')
+        self.conjuntos = conjuntos
+        self._mascara = conjuntos - 1
+        posicoes = conjuntos * associatividade
+        self.tags = array('q', [-1]) * posicoes
+        self.idade = array('Q', bytes(8 * posicoes))
+        self.sujo = bytearray(posicoes)
+        self._relogio = 0
+        self._aleatorio = random.Random(semente)
+        self.reset_estatisticas()
+
+    def reset_estatisticas(self) -> None:
+        self.leituras = 0
+        self.escritas = 0
+        self.falhas_leitura = 0
+        self.falhas_escrita = 0
+        self.writebacks = 0  # linhas sujas mandadas pra baixo na expulsão
+        self.escritas_diretas = 0  # escritas repassadas pra baixo pelo write-through / sem alocação
+        self.acessos_memoria = 0  # quando não tem próximo nível: leituras + escritas na memória principal
+
+    def _desce(self, endereco: int, escrita: bool) -> None:
+        if self.proximo is not None:
+            self.proximo.acessa(endereco, escrita)
+        else:
+            self.acessos_memoria += 1
+
+    def _vitima(self, inicio: int) -> int:
+        fim = inicio + self.associatividade
+        tags = self.tags
+        try:
+            return tags.index(-1, inicio, fim)  # ainda tem via vazia
+        except ValueError:
+            pass
+        if self.substituicao == 'random':
+            return inicio + self._aleatorio.randrange(self.associatividade)
+        idade = self.idade
+        return min(range(inicio, fim), key=idade.__getitem__)
+
+    def acessa(self, endereco: int, escrita: bool = False) -> bool:
+        # devolve True se foi acerto
+        bloco = endereco >> self.bits_linha
+        inicio = (bloco & self._mascara) * self.associatividade
+        tags = self.tags
+        self._relogio += 1
+        if escrita:
+            self.escritas += 1
+        else:
+            self.leituras += 1
+        try:
+            posicao = tags.index(bloco, inicio, inicio + self.associatividade)
+        except ValueError:
+            posicao = -1
+        if posicao >= 0:
+            if self.substituicao == 'LRU':
+                self.idade[posicao] = self._relogio
+            if escrita:
+                if self.write_back:
+                    self.sujo[posicao] = 1
+                else:
+                    self.escritas_diretas += 1
+                    self._desce(endereco, True)
+            return True
+
+        # falha
+        if escrita:
+            self.falhas_escrita += 1
+            if not self.aloca_na_escrita:
+                self.escritas_diretas += 1
+                self._desce(endereco, True)
+                return False
+        else:
+            self.falhas_leitura += 1
+        posicao = self._vitima(inicio)
+        if self.sujo[posicao]:
+            self.writebacks += 1
+            self._desce(tags[posicao] << self.bits_linha, True)
+        self._desce(endereco, False)  # busca a linha no nível de baixo
+        tags[posicao] = bloco
+        self.idade[posicao] = self._relogio
+        self.sujo[posicao] = 0
+        if escrita:
+            if self.write_back:
+                self.sujo[posicao] = 1
+            else:
+                self.escritas_diretas += 1
+                self._desce(endereco, True)
+        return False
+
+    def esvazia(self) -> None:
+        # manda todas as linhas sujas pra baixo (fim da simulação, por exemplo)
+        for posicao, sujo in enumerate(self.sujo):
+            if sujo:
+                self.writebacks += 1
+                self._desce(self.tags[posicao] << self.bits_linha, True)
+                self.sujo[posicao] = 0
+
+    def estatisticas(self) -> dict:
+        acessos = self.leituras + self.escritas
+        falhas = self.falhas_leitura + self.falhas_escrita
+        return {
+            'acessos': acessos,
+            'leituras': self.leituras,
+            'escritas': self.escritas,
+            'falhas': falhas,
+            'falhas_leitura': self.falhas_leitura,
+            'falhas_escrita': self.falhas_escrita,
+            'taxa_acerto': (acessos - falhas) / acessos if acessos else 0.0,
+            'writebacks': self.writebacks,
+            'escritas_diretas': self.escritas_diretas,
+            'acessos_memoria': self.acessos_memoria,
+        }
+
+
+class CacheHierarchy:
+
+    def __init__(self, l1i: Cache = None, l1d: Cache = None, l2: Cache = None, bits_regiao: int = 12) -> None:
+        # sem parâmetro: L1I e L1D de 32 KiB 4 vias, L2 de 256 KiB 8 vias, linhas de 32 e 64 bytes.
+        # bits_regiao: tamanho das regiões de dados do relatório (12 = páginas de 4 KiB)
+        self.l2 = l2 if l2 is not None else Cache('L2', 256 * 1024, 8, 64)
+        self.l1i = l1i if l1i is not None else Cache('L1I', 32 * 1024, 4, 32)
+        self.l1d = l1d if l1d is not None else Cache('L1D', 32 * 1024, 4, 32)
+        for l1 in (self.l1i, self.l1d):
+            if l1.proximo is None:
+                l1.proximo = self.l2
+        self.bits_regiao = bits_regiao
+        # pc -> [buscas, falhas na busca, acessos a dados, falhas de dados]
+        self.por_pc = {}
+        # região -> [acessos, falhas]
+        self.por_regiao = {}
+        self.instrucoes = 0
+
+    def consome(self, pc: int, word: int, proximo_pc: int = None, endereco: int = None) -> None:
+        contadores = self.por_pc.get(pc)
+        if contadores is None:
+            contadores = self.por_pc[pc] = [0, 0, 0, 0]
+        contadores[0] += 1
+        if not self.l1i.acessa(pc):
+            contadores[1] += 1
+        if endereco is not None:
+            escrita = ACESSO_MEMORIA[((word >> 20) & 0xFC0) | (word & 0x3F)] == ESCREVE_MEMORIA
+            regiao = self.por_regiao.get(endereco >> self.bits_regiao)
+            if regiao is None:
+                regiao = self.por_regiao[endereco >> self.bits_regiao] = [0, 0]
+            contadores[2] += 1
+            regiao[0] += 1
+            if not self.l1d.acessa(endereco, escrita):
+                contadores[3] += 1
+                regiao[1] += 1
+        self.instrucoes += 1
+
+    def processa(self, trace) -> dict:
+        # trace: tuplas (pc, palavra, próximo pc, endereço ou None), ex.: MIPSSimulator.rastreia()
+        consome = self.consome
+        for evento in trace:
+            consome(*evento[:4])
+        return self.relatorio()
+
+    def relatorio(self) -> dict:
+        return {
+            'instrucoes': self.instrucoes,
+            'niveis': {cache.nome: cache.estatisticas() for cache in (self.l1i, self.l1d, self.l2)},
+            'por_pc': {pc: {'buscas': c[0], 'falhas_busca': c[1], 'acessos_dados': c[2], 'falhas_dados': c[3]}
+                       for pc, c in self.por_pc.items()},
+            'por_regiao': {regiao << self.bits_regiao: {'acessos': c[0], 'falhas': c[1]}
+                           for regiao, c in self.por_regiao.items()},
+        }
+
+    def formata_relatorio(self, top: int = 10) -> str:
+        r = self.relatorio()
+        linhas = [f'Instruções: {r["instrucoes"]}']
+        for nome, e in r['niveis'].items():
+            linhas.append(f'- {nome}: {e["acessos"]} acessos, {e["falhas"]} falhas '
+                          f'({100 * e["taxa_acerto"]:.2f}% de acerto), {e["writebacks"]} writebacks')
+        linhas.append('- Endereços com mais falhas (busca + dados):')
+        piores = sorted(r['por_pc'].items(), key=lambda item: item[1]['falhas_busca'] + item[1]['falhas_dados'],
+                        reverse=True)[:top]
+        for pc, c in piores:
+            linhas.append(f'\t0x{pc:08x}: busca {c["falhas_busca"]}/{c["buscas"]}, '
+                          f'dados {c["falhas_dados"]}/{c["acessos_dados"]}')
+        linhas.append(f'- Regiões de dados com mais falhas:')
+        piores = sorted(r['por_regiao'].items(), key=lambda item: item[1]['falhas'], reverse=True)[:top]
+        for regiao, c in piores:
+            linhas.append(f'\t0x{regiao:08x}: {c["falhas"]}/{c["acessos"]} '
+                          f'({100 * (1 - c["falhas"] / c["acessos"]):.2f}% de acerto)')
+        return '\n'.join(linhas) + '\n'
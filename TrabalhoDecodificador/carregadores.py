@@ -0,0 +1,314 @@
+import mmap
+import os
+import re
+import struct
+
+import numpy as np
+
+import lote
+from decodificador_bruno_c_t_elias import parse_int
+from programa import DecodedProgram
+
+# Carregadores de arquivos de verdade: ELF32 MIPS (só a seção .text), Intel HEX, dump de texto (uma palavra
+# por token, em hexa ou binário) e a saída do objdump -d. Todos entregam o resultado em blocos
+# (endereços, palavras), dois arrays uint32 do mesmo tamanho, sem montar lista Python com o arquivo inteiro.
+# O ELF nem é copiado: as palavras são uma visão (memmap) direto do arquivo.
+
+TAMANHO_BLOCO = 1 << 20  # palavras por bloco
+
+_ELF_MAGICO = b'\x7fELF'
+_EM_MIPS = 8
+
+
+class LoaderError(ValueError):
+    pass
+
+
+def _enderecos(inicio: int, n: int) -> np.ndarray:
+    return (inicio + 4 * np.arange(n, dtype=np.uint64)).astype(np.uint32)
+
+
+# ---------------------------------------------------------------- ELF
+
+
+def secao_elf(caminho: str, secao: str = '.text') -> tuple:
+    # lê só os cabeçalhos do ELF e devolve (palavras, endereço da seção, endian). palavras é um memmap
+    # com a ordem de bytes do arquivo, então a conversão acontece só quando alguém lê o valor
+    if os.path.getsize(caminho) == 0:
+        # o mmap nem aceita arquivo vazio
+        raise LoaderError(f'{caminho}: arquivo vazio')
+    with open(caminho, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        if m[:4] != _ELF_MAGICO:
+            raise LoaderError(f'{caminho}: não é um arquivo ELF')
+        if m[4] != 1:
+            raise LoaderError(f'{caminho}: só ELF de 32 bits é suportado')
+        if m[5] not in (1, 2):
+            raise LoaderError(f'{caminho}: ordem de bytes inválida no cabeçalho ({m[5]})')
+        endian = 'little' if m[5] == 1 else 'big'
+        prefixo = '<' if m[5] == 1 else '>'
+        (_, maquina, _, _, _, shoff, _, _, _, _, shentsize, shnum, shstrndx) = \
+            struct.unpack_from(prefixo + 'HHIIIIIHHHHHH', m, 16)
+        if maquina != _EM_MIPS:
+            raise LoaderError(f'{caminho}: não é um ELF MIPS (e_machine = {maquina})')
+        cabecalho = struct.Struct(prefixo + 'IIIIIIIIII')
+
+        def le_secao(indice: int) -> tuple:
+            return cabecalho.unpack_from(m, shoff + indice * shentsize)
+
+        if shoff == 0 or shstrndx >= shnum:
+            raise LoaderError(f'{caminho}: ELF sem tabela de seções')
+        nomes_offset = le_secao(shstrndx)[4]
+        procurado = secao.encode('ascii')
+        for indice in range(shnum):
+            nome, _, _, endereco, offset, tamanho = le_secao(indice)[:6]
+            inicio = nomes_offset + nome
+            if m[inicio:m.find(b'\x00', inicio)] == procurado:
+                break
+        else:
+            raise LoaderError(f'{caminho}: seção {secao!r} não encontrada')
+    n = tamanho // 4
+    if n == 0:
+        return np.zeros(0, dtype=lote._dtype(endian)), endereco, endian
+    return np.memmap(caminho, dtype=lote._dtype(endian), mode='r', offset=offset, shape=(n,)), endereco, endian
+
+
+def blocos_elf(caminho: str, secao: str = '.text', tamanho_bloco: int = TAMANHO_BLOCO):
+    palavras, endereco, _ = secao_elf(caminho, secao)
+    for inicio in range(0, len(palavras), tamanho_bloco):
+        bloco = palavras[inicio:inicio + tamanho_bloco]
+        yield _enderecos(endereco + 4 * inicio, len(bloco)), bloco
+
+
+# ---------------------------------------------------------------- Intel HEX
+
+
+def blocos_ihex(caminho: str, endian: str = 'big', tamanho_bloco: int = TAMANHO_BLOCO):
+    # registros suportados: 00 (dados), 01 (fim), 02 (segmento estendido), 04 (endereço linear estendido);
+    # 03 e 05 (endereço de início) são ignorados. Cada sequência contígua de bytes vira palavras de 4 bytes
+    dtype = lote._dtype(endian)
+    dados = bytearray()
+    inicio = None  # endereço do primeiro byte em dados
+    alto = 0  # parte alta do endereço (registro 02 ou 04)
+
+    def corta(tudo: bool):
+        # entrega as palavras completas que estão em dados
+        nonlocal dados, inicio
+        n = len(dados) // 4
+        if tudo and len(dados) % 4:
+            raise LoaderError(f'{caminho}: trecho em 0x{inicio:08x} não termina numa palavra inteira')
+        if n:
+            palavras = np.frombuffer(bytes(dados[:4 * n]), dtype=dtype).astype(np.uint32)
+            enderecos = _enderecos(inicio, n)
+            del dados[:4 * n]
+            inicio += 4 * n
+            return enderecos, palavras
+        return None
+
+    with open(caminho, 'rb') as f:
+        for numero, linha in enumerate(f, 1):
+            linha = linha.strip()
+            if not linha:
+                continue
+            if linha[:1] != b':':
+                raise LoaderError(f'{caminho}:{numero}: registro sem ":"')
+            try:
+                registro = bytes.fromhex(linha[1:].decode('ascii'))
+            except ValueError:
+                raise LoaderError(f'{caminho}:{numero}: registro com caractere inválido') from None
+            if len(registro) < 5 or len(registro) != registro[0] + 5:
+                raise LoaderError(f'{caminho}:{numero}: tamanho do registro não confere')
+            if sum(registro) & 0xFF:
+                raise LoaderError(f'{caminho}:{numero}: checksum errado')
+            tipo = registro[3]
+            if tipo == 0:
+                endereco = alto + ((registro[1] << 8) | registro[2])
+                if inicio is None or endereco != inicio + len(dados):
+                    # buraco no endereço: fecha o trecho anterior e começa outro
+                    if inicio is not None:
+                        bloco = corta(True)
+                        if bloco is not None:
+                            yield bloco
+                    inicio = endereco
+                    dados = bytearray()
+                dados += registro[4:-1]
+                if len(dados) >= 4 * tamanho_bloco:
+                    yield corta(False)
+            elif tipo == 1:
+                break
+            elif tipo == 2:
+                alto = ((registro[4] << 8) | registro[5]) << 4
+            elif tipo == 4:
+                alto = ((registro[4] << 8) | registro[5]) << 16
+            elif tipo not in (3, 5):
+                raise LoaderError(f'{caminho}:{numero}: tipo de registro desconhecido ({tipo:02x})')
+    if inicio is not None:
+        bloco = corta(True)
+        if bloco is not None:
+            yield bloco
+
+
+# ---------------------------------------------------------------- texto
+
+
+_ESPACOS = b' \t\r\n\f\v'
+
+
+def _pedacos_texto(caminho: str, tamanho: int, separadores: bytes = _ESPACOS):
+    # lê o arquivo em pedaços de ~tamanho bytes, cada um cortado no último separador (espaço em branco pros
+    # dumps de palavras, só b'\n' pro objdump, que precisa da linha inteira). O que sobra depois do corte vai
+    # pro começo do próximo pedaço, então um arquivo sem '\n' nenhum não vira um pedaço gigante
+    with open(caminho, 'rb') as f:
+        resto = b''
+        while True:
+            lido = f.read(tamanho)
+            if not lido:
+                if resto:
+                    yield resto
+                break
+            pedaco = resto + lido
+            corte = max(pedaco.rfind(separador) for separador in separadores)
+            if corte < 0:
+                # nenhum separador ainda (token maior que o pedaço): continua juntando
+                resto = pedaco
+                continue
+            resto = pedaco[corte + 1:]
+            yield pedaco[:corte + 1]
+
+
+# prefixo só no começo do token (e com dígito depois); no meio do token ("100x5") fica e vira erro
+_PREFIXO_HEXA = re.compile(rb'(?<!\S)0[xX](?=[0-9a-fA-F])')
+_PREFIXO_BINARIO = re.compile(rb'(?<!\S)0[bB](?=[01])')
+_DIGITOS_HEXA = re.compile(rb'[0-9a-fA-F]+')
+_DIGITOS_BINARIO = re.compile(rb'[01]+')
+
+
+def _converte_tokens(tokens: list, digitos: re.Pattern, base: int, nome: str) -> np.ndarray:
+    # caminho lento, token a token. O int() sozinho aceitaria sinal, '_' e outro prefixo, por isso o fullmatch
+    for token in tokens:
+        if digitos.fullmatch(token) is None:
+            raise LoaderError(f'token {nome} inválido: {token.decode("ascii", "replace")!r}')
+    return np.array([int(token, base) & 0xFFFFFFFF for token in tokens], dtype=np.uint32)
+
+
+def _tokens_hexa(pedaco: bytes) -> np.ndarray:
+    tokens = _PREFIXO_HEXA.sub(b'', pedaco).split()
+    if not tokens:
+        return np.zeros(0, dtype=np.uint32)
+    if set(map(len, tokens)) == {8}:
+        # caso comum (todo mundo com 8 dígitos): converte tudo de uma vez, sem int() por token
+        try:
+            return np.frombuffer(bytes.fromhex(b''.join(tokens).decode('ascii')), dtype='>u4').astype(np.uint32)
+        except ValueError:
+            pass
+    return _converte_tokens(tokens, _DIGITOS_HEXA, 16, 'hexa')
+
+
+def _tokens_binario(pedaco: bytes) -> np.ndarray:
+    tokens = _PREFIXO_BINARIO.sub(b'', pedaco).split()
+    if not tokens:
+        return np.zeros(0, dtype=np.uint32)
+    if set(map(len, tokens)) == {32}:
+        bits = np.frombuffer(b''.join(tokens), dtype=np.uint8).reshape(-1, 32) - ord('0')
+        if bits.max() <= 1:
+            # cada linha de 32 bits vira 4 bytes big-endian
+            return np.packbits(bits, axis=1).view('>u4').ravel().astype(np.uint32)
+    return _converte_tokens(tokens, _DIGITOS_BINARIO, 2, 'binário')
+
+
+def _tokens_qualquer(pedaco: bytes) -> np.ndarray:
+    # cada token na base que o parse_int descobrir (caminho lento, mas aceita misturar bases)
+    try:
+        return np.array([parse_int(token.decode('ascii')) & 0xFFFFFFFF for token in pedaco.split()],
+                        dtype=np.uint32)
+    except ValueError as erro:
+        raise LoaderError(f'token inválido: {erro}') from None
+
+
+_TOKENIZADORES = {16: _tokens_hexa, 2: _tokens_binario, 0: _tokens_qualquer}
+
+
+def blocos_texto(caminho: str, base: int = 16, endereco: int = 0, tamanho_bloco: int = TAMANHO_BLOCO):
+    # dump de texto com as palavras separadas por espaço ou linha. base: 16, 2 ou 0 (cada token no parse_int).
+    # os endereços são contados a partir de endereco, 4 em 4
+    try:
+        tokenizador = _TOKENIZADORES[base]
+    except KeyError:
+        raise ValueError(f'base inválida: {base!r} (use 16, 2 ou 0)') from None
+    # ~9 bytes por palavra em hexa, ~33 em binário
+    bytes_por_palavra = 33 if base == 2 else 9
+    for pedaco in _pedacos_texto(caminho, tamanho_bloco * bytes_por_palavra):
+        palavras = tokenizador(pedaco)
+        if len(palavras):
+            yield _enderecos(endereco, len(palavras)), palavras
+            endereco += 4 * len(palavras)
+
+
+# linha de instrução do objdump -d: "  400000:\t3c1c0042 \tlui\tgp,0x42"
+_LINHA_OBJDUMP = re.compile(rb'^\s*([0-9a-fA-F]+):\s+([0-9a-fA-F]{8})\b', re.MULTILINE)
+
+
+def blocos_objdump(caminho: str, tamanho_bloco: int = TAMANHO_BLOCO):
+    # usa o endereço que vem na própria linha; cabeçalhos, rótulos e linhas de dados são ignorados
+    for pedaco in _pedacos_texto(caminho, tamanho_bloco * 40, b'\n'):
+        achados = _LINHA_OBJDUMP.findall(pedaco)
+        if not achados:
+            continue
+        enderecos = np.array([int(endereco, 16) for endereco, _ in achados], dtype=np.uint32)
+        palavras = np.frombuffer(bytes.fromhex(b''.join(palavra for _, palavra in achados).decode('ascii')),
+                                 dtype='>u4').astype(np.uint32)
+        yield enderecos, palavras
+
+
+# ---------------------------------------------------------------- entrada única
+
+
+_CARREGADORES = {'elf': blocos_elf, 'ihex': blocos_ihex, 'texto': blocos_texto, 'objdump': blocos_objdump}
+# opções que cada carregador aceita além do caminho e do tamanho_bloco
+_OPCOES = {'elf': ('secao',), 'ihex': ('endian',), 'texto': ('base', 'endereco'), 'objdump': ()}
+
+
+def blocos(caminho: str, formato: str = None, tamanho_bloco: int = TAMANHO_BLOCO, **opcoes):
+    # escolhe o carregador pelo formato ('elf', 'ihex', 'texto', 'objdump') ou, se não vier, pelo conteúdo.
+    # cada carregador só recebe as opções dele (ex.: endian é ignorado num ELF, que já diz a própria ordem
+    # de bytes); opção que nenhum carregador conhece é erro
+    desconhecidas = set(opcoes).difference(*_OPCOES.values())
+    if desconhecidas:
+        raise TypeError(f'opções desconhecidas: {", ".join(sorted(desconhecidas))}')
+    if formato is None:
+        with open(caminho, 'rb') as f:
+            inicio = f.read(4096)
+        if inicio.startswith(_ELF_MAGICO):
+            formato = 'elf'
+        elif inicio.lstrip().startswith(b':'):
+            formato = 'ihex'
+        elif _LINHA_OBJDUMP.search(inicio):
+            formato = 'objdump'
+        else:
+            formato = 'texto'
+    if formato not in _CARREGADORES:
+        raise ValueError(f'formato desconhecido: {formato!r} (use elf, ihex, texto ou objdump)')
+    opcoes = {nome: valor for nome, valor in opcoes.items() if nome in _OPCOES[formato]}
+    return _CARREGADORES[formato](caminho, tamanho_bloco=tamanho_bloco, **opcoes)
+
+
+def decodifica_blocos(fonte):
+    # decodifica bloco a bloco com o lote.decodifica_lote; devolve (endereços, colunas) de cada bloco
+    for enderecos, palavras in fonte:
+        yield enderecos, lote.decodifica_lote(palavras)
+
+
+def carrega_programa(caminho: str, formato: str = None, **opcoes) -> DecodedProgram:
+    # junta tudo num DecodedProgram; como ele só guarda o endereço base, os blocos precisam ser contíguos
+    programa = None
+    proximo = None
+    for enderecos, colunas in decodifica_blocos(blocos(caminho, formato, **opcoes)):
+        if not len(enderecos):
+            continue
+        if programa is None:
+            programa = DecodedProgram(int(enderecos[0]))
+        elif int(enderecos[0]) != proximo:
+            raise LoaderError(f'{caminho}: endereços não contíguos em 0x{proximo:08x}, '
+                              f'use blocos() para ler trechos separados')
+        programa.extend_colunas(colunas)
+        proximo = int(enderecos[-1]) + 4
+    return programa if programa is not None else DecodedProgram()
@@ -0,0 +1,219 @@
+from bisect import bisect_right, insort
+
+import numpy as np
+
+from decodificador_bruno_c_t_elias import ID_NOME_ROM, NOMES, RENDERIZADORES
+from programa import DecodedProgram
+
+# Grafo de fluxo de controle (CFG) de um DecodedProgram inteiro. Os alvos dos desvios são resolvidos com o
+# imediato estendido com sinal (pc + 4 + imm * 4) e os do j/jal com os 4 bits altos do pc + 4 (sem delay slot,
+# igual ao simulador). O programa é cortado em blocos básicos pelos líderes (primeira instrução, alvos e a
+# instrução depois de um desvio/salto), e cada bloco é identificado pelo índice da sua primeira instrução.
+#
+# A construção é linear (vetorizada com NumPy) e o patch de um trecho só refaz os blocos encostados nele:
+# cada instrução guarda o próprio alvo e cada alvo guarda quantos desvios apontam pra ele, então dá pra saber
+# exatamente quais líderes mudaram sem olhar o resto do programa.
+
+# tipo de fluxo de cada instrução
+NORMAL, DESVIO, SALTO, CHAMADA, INDIRETO, CHAMADA_INDIRETA = range(6)
+
+_FLUXO_POR_NOME = {
+    'beq': DESVIO, 'bne': DESVIO, 'bgez': DESVIO, 'bgtz': DESVIO, 'blez': DESVIO,
+    'j': SALTO,
+    'jal': CHAMADA,
+    'jr': INDIRETO,
+    'jalr': CHAMADA_INDIRETA,
+}
+# tipo de fluxo por (opcode << 6) | funct
+FLUXO = np.array([_FLUXO_POR_NOME.get(NOMES[i], NORMAL) for i in ID_NOME_ROM], dtype=np.uint8)
+# quem termina bloco: desvio, salto e jr. Chamada volta pra instrução seguinte, então não corta o bloco
+_TERMINA = np.zeros(6, dtype=bool)
+_TERMINA[[DESVIO, SALTO, INDIRETO]] = True
+
+FORA = -1  # sem alvo conhecido dentro do programa
+
+
+class ControlFlowGraph:
+
+    def __init__(self, programa: DecodedProgram) -> None:
+        self.programa = programa
+        self.n = len(programa)
+        self.fluxo = np.zeros(self.n, dtype=np.uint8)
+        self.alvo = np.full(self.n, FORA, dtype=np.int64)  # índice do alvo dentro do programa
+        self.entradas = np.zeros(self.n, dtype=np.int32)  # quantos desvios/saltos apontam pra cada instrução
+        self.chamadas = np.zeros(self.n, dtype=np.int32)  # quantos jal apontam pra cada instrução
+        self.lider = np.zeros(self.n, dtype=bool)
+        self.lideres = []  # índices dos líderes em ordem
+        self.sucessores = {}  # líder -> tupla de líderes
+        self.predecessores = {}  # líder -> lista de líderes
+        self._constroi()
+
+    # ------------------------------------------------------------ construção
+
+    def _alvos(self, inicio: int, fim: int) -> tuple:
+        # (fluxo, alvo) das instruções inicio..fim-1, vetorizado
+        w = np.frombuffer(self.programa.word, dtype=np.uint32)[inicio:fim].astype(np.int64)
+        fluxo = FLUXO[((w >> 20) & 0xFC0) | (w & 0x3F)]
+        pc = self.programa.base + 4 * np.arange(inicio, fim, dtype=np.int64)
+        imm = (w & 0xFFFF).astype(np.uint16).view(np.int16).astype(np.int64)
+        endereco = np.where(fluxo == DESVIO, (pc + 4 + (imm << 2)) & 0xFFFFFFFF,
+                            ((pc + 4) & 0xF0000000) | ((w & 0x3FFFFFF) << 2))
+        indice = (endereco - self.programa.base) >> 2
+        valido = ((fluxo == DESVIO) | (fluxo == SALTO) | (fluxo == CHAMADA)) & \
+                 (endereco >= self.programa.base) & (indice < self.n)
+        return fluxo, np.where(valido, indice, FORA)
+
+    def _e_lider(self, i: int) -> bool:
+        return i == 0 or self.entradas[i] > 0 or self.chamadas[i] > 0 or bool(_TERMINA[self.fluxo[i - 1]])
+
+    def _constroi(self) -> None:
+        if self.n == 0:
+            return
+        self.fluxo, self.alvo = self._alvos(0, self.n)
+        tem_alvo = self.alvo != FORA
+        chamada = self.fluxo == CHAMADA
+        self.entradas = np.bincount(self.alvo[tem_alvo & ~chamada], minlength=self.n).astype(np.int32)
+        self.chamadas = np.bincount(self.alvo[tem_alvo & chamada], minlength=self.n).astype(np.int32)
+        lider = (self.entradas > 0) | (self.chamadas > 0)
+        lider[0] = True
+        lider[1:] |= _TERMINA[self.fluxo[:-1]]
+        self.lider = lider
+        self.lideres = np.flatnonzero(lider).tolist()
+        for inicio in self.lideres:
+            self._liga(inicio)
+
+    def _fim(self, inicio: int) -> int:
+        # índice logo depois da última instrução do bloco que começa em inicio
+        k = bisect_right(self.lideres, inicio)
+        return self.lideres[k] if k < len(self.lideres) else self.n
+
+    def _liga(self, inicio: int) -> None:
+        # calcula os sucessores do bloco e registra ele como predecessor de cada um
+        fim = self._fim(inicio)
+        ultimo = fim - 1
+        fluxo = self.fluxo[ultimo]
+        alvo = int(self.alvo[ultimo])
+        sucessores = []
+        if fluxo != SALTO and fluxo != INDIRETO and fim < self.n:
+            sucessores.append(fim)
+        if (fluxo == DESVIO or fluxo == SALTO) and alvo != FORA and alvo not in sucessores:
+            sucessores.append(alvo)
+        self.sucessores[inicio] = tuple(sucessores)
+        for sucessor in sucessores:
+            self.predecessores.setdefault(sucessor, []).append(inicio)
+
+    def _desliga(self, inicio: int) -> None:
+        for sucessor in self.sucessores.pop(inicio, ()):
+            self.predecessores[sucessor].remove(inicio)
+
+    # ------------------------------------------------------------ consultas
+
+    def bloco_de(self, indice: int) -> int:
+        # líder do bloco que contém a instrução
+        return self.lideres[bisect_right(self.lideres, indice) - 1]
+
+    def bloco(self, inicio: int) -> tuple:
+        # (primeiro índice, índice depois do último) do bloco
+        return inicio, self._fim(inicio)
+
+    def blocos(self):
+        lideres = self.lideres
+        for k, inicio in enumerate(lideres):
+            yield inicio, lideres[k + 1] if k + 1 < len(lideres) else self.n
+
+    def pc(self, indice: int) -> int:
+        return self.programa.base + 4 * indice
+
+    def endereco_alvo(self, indice: int):
+        # endereço resolvido do desvio/salto (mesmo se cair fora do programa); None pra jr/jalr e o resto
+        fluxo = self.fluxo[indice]
+        if fluxo not in (DESVIO, SALTO, CHAMADA):
+            return None
+        word = self.programa.word[indice]
+        pc = self.pc(indice)
+        if fluxo == DESVIO:
+            imm = word & 0xFFFF
+            return (pc + 4 + ((imm - 0x10000 if imm & 0x8000 else imm) << 2)) & 0xFFFFFFFF
+        return ((pc + 4) & 0xF0000000) | ((word & 0x3FFFFFF) << 2)
+
+    def rotulo(self, indice: int):
+        # nome do rótulo da instrução, se alguém desvia/chama ela
+        if self.chamadas[indice]:
+            return f'func_{self.pc(indice):08x}'
+        if self.entradas[indice]:
+            return f'L_{self.pc(indice):08x}'
+        return None
+
+    # ------------------------------------------------------------ patch incremental
+
+    def patch(self, inicio: int, words) -> None:
+        # troca as palavras no programa e refaz só o que depende delas
+        self.programa.patch(inicio, words)
+        fim = min(inicio + len(words), self.n)
+        # posições cujo status de líder pode mudar: o trecho, a instrução logo depois e os alvos antigos/novos
+        tocados = set(range(inicio, min(fim + 1, self.n)))
+        for i in range(inicio, fim):
+            alvo = int(self.alvo[i])
+            if alvo != FORA:
+                (self.chamadas if self.fluxo[i] == CHAMADA else self.entradas)[alvo] -= 1
+                tocados.add(alvo)
+        fluxo, alvos = self._alvos(inicio, fim)
+        self.fluxo[inicio:fim] = fluxo
+        self.alvo[inicio:fim] = alvos
+        for i in range(inicio, fim):
+            alvo = int(self.alvo[i])
+            if alvo != FORA:
+                (self.chamadas if self.fluxo[i] == CHAMADA else self.entradas)[alvo] += 1
+                tocados.add(alvo)
+
+        # blocos que encostam numa posição tocada, antes e depois de atualizar os líderes
+        afetados = set()
+        for p in tocados:
+            afetados.add(self.bloco_de(p))
+            if p:
+                afetados.add(self.bloco_de(p - 1))
+        for p in tocados:
+            novo = self._e_lider(p)
+            if novo != self.lider[p]:
+                self.lider[p] = novo
+                if novo:
+                    insort(self.lideres, p)
+                else:
+                    del self.lideres[bisect_right(self.lideres, p) - 1]
+        for p in tocados:
+            afetados.add(self.bloco_de(p))
+            if p:
+                afetados.add(self.bloco_de(p - 1))
+
+        for lider in afetados:
+            self._desliga(lider)
+        for lider in afetados:
+            if self.lider[lider]:
+                self._liga(lider)
+            elif not self.predecessores.get(lider, True):
+                del self.predecessores[lider]
+
+    # ------------------------------------------------------------ desmontagem
+
+    def linhas(self, inicio: int = 0, fim: int = None):
+        # desmontagem com rótulos: cada bloco separado por uma linha em branco, alvos trocados pelo rótulo
+        fim = self.n if fim is None else fim
+        word = self.programa.word
+        for i in range(inicio, fim):
+            if self.lider[i]:
+                rotulo = self.rotulo(i)
+                if i != inicio:
+                    yield ''
+                if rotulo is not None:
+                    yield f'{rotulo}:'
+            w = word[i]
+            texto = RENDERIZADORES[((w >> 20) & 0xFC0) | (w & 0x3F)](w)
+            endereco = self.endereco_alvo(i)
+            if endereco is not None:
+                alvo = int(self.alvo[i])
+                destino = self.rotulo(alvo) if alvo != FORA else f'0x{endereco:08x}'
+                texto = f'{texto.rsplit(" ", 1)[0]} {destino}'
+            yield f'    {self.pc(i):08x}:  {w:08x}  {texto}'
+
+    def desmonta(self, inicio: int = 0, fim: int = None) -> str:
+        return '\n'.join(self.linhas(inicio, fim)) + '\n'
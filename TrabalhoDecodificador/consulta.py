@@ -0,0 +1,209 @@
+import numpy as np
+
+from decodificador_bruno_c_t_elias import ID_NOME, INDICE_REGISTRADOR, InstrType
+from perfis import PERFIS
+from programa import COLUNAS, DecodedProgram
+
+# Índice invertido sobre um DecodedProgram: pra cada valor de nome, opcode, funct, tipo e registrador (em cada
+# papel: rs, rt, rd) guarda a lista em ordem crescente dos índices das instruções que têm aquele valor.
+# Uma consulta ordena os filtros pelo tamanho das listas, copia só a menor e testa cada candidato nas outras
+# por busca binária (np.searchsorted), então o custo segue a menor lista e não a maior. Só no fim aplica os
+# filtros numéricos (ex.: immediate > 4096) nos candidatos que sobraram, sem varrer o programa inteiro.
+# As listas só crescem, num buffer NumPy que dobra quando enche: palavras novas no programa entram com
+# atualiza() e a consulta usa uma visão dos itens já escritos, sem copiar.
+# Limitação: o DecodedProgram.patch troca palavras no meio do programa sem avisar ninguém, e o índice não tem
+# como perceber; depois de um patch as listas ficam velhas até chamar reconstroi() (ou criar outro índice).
+#
+#   indice = InvertedIndex(programa)
+#   indice.consulta(nome='sw', rs='$sp')                      # todo sw com base no $sp
+#   indice.consulta(nome=('jr', 'jalr'), rs='$t9')            # $t9 usado como registrador de salto
+#   indice.consulta(opcode=0b100011, onde={'immediate': lambda v: v > 4096})
+
+
+def _campos(perfil: tuple) -> tuple:
+    # campos de registrador que a instrução usa de verdade (pelos PERFIS, como no dependencias.py): o jr não
+    # tem rt nem rd, o sll não tem rs, o lui não tem rs...
+    le_rs, le_rt, destino = perfil[:3]
+    return (('rs',) if le_rs else ()) + (('rt',) if le_rt or destino == 'rt' else ()) + \
+        (('rd',) if destino == 'rd' else ())
+
+
+# campos de registrador usados por (opcode << 6) | funct
+_CAMPOS = tuple(_campos(perfil) for perfil in PERFIS)
+
+CHAVES = ('nome', 'opcode', 'funct', 'tipo', 'rs', 'rt', 'rd', 'registrador')
+_VAZIO = np.zeros(0, dtype=np.uint32)
+_VAZIO.flags.writeable = False
+
+
+def _valor_registrador(registrador) -> int:
+    if isinstance(registrador, str):
+        try:
+            return INDICE_REGISTRADOR[registrador]
+        except KeyError:
+            raise ValueError(f'registrador desconhecido: {registrador!r}') from None
+    return registrador
+
+
+def _valor(chave: str, valor) -> int:
+    # converte o jeito amigável (nome da instrução, nome do registrador, InstrType ou 'R') pro número indexado
+    if chave == 'nome':
+        if isinstance(valor, str):
+            try:
+                return ID_NOME[valor]
+            except KeyError:
+                raise ValueError(f'instrução desconhecida: {valor!r}') from None
+        return valor
+    if chave == 'tipo':
+        if isinstance(valor, InstrType):
+            return valor.value
+        if isinstance(valor, str):
+            try:
+                return InstrType[valor].value
+            except KeyError:
+                raise ValueError(f'tipo desconhecido: {valor!r}') from None
+        return valor
+    if chave in ('rs', 'rt', 'rd', 'registrador'):
+        return _valor_registrador(valor)
+    return valor
+
+
+def _uniao(alternativas: list) -> np.ndarray:
+    # sempre devolve uma cópia nova (quem chama pode mexer nela)
+    if len(alternativas) == 1:
+        return alternativas[0].copy()
+    return np.unique(np.concatenate(alternativas)) if alternativas else _VAZIO.copy()
+
+
+def _contidos(candidatos: np.ndarray, ordenado: np.ndarray) -> np.ndarray:
+    # máscara de quais candidatos estão no array ordenado, por busca binária
+    if not len(ordenado):
+        return np.zeros(len(candidatos), dtype=bool)
+    posicao = np.searchsorted(ordenado, candidatos)
+    np.minimum(posicao, len(ordenado) - 1, out=posicao)
+    return ordenado[posicao] == candidatos
+
+
+class _IndexList:
+    # lista crescente de índices num buffer NumPy com o tamanho à parte; quando enche, o buffer dobra (append
+    # O(1) amortizado). Uma visão já entregue continua certa: os appends só escrevem depois do fim dela
+
+    __slots__ = ('dados', 'tamanho')
+
+    def __init__(self) -> None:
+        self.dados = np.empty(8, dtype=np.uint32)
+        self.tamanho = 0
+
+    def __len__(self) -> int:
+        return self.tamanho
+
+    def append(self, indice: int) -> None:
+        if self.tamanho == len(self.dados):
+            maior = np.empty(2 * len(self.dados), dtype=np.uint32)
+            maior[:self.tamanho] = self.dados
+            self.dados = maior
+        self.dados[self.tamanho] = indice
+        self.tamanho += 1
+
+    def visao(self) -> np.ndarray:
+        visao = self.dados[:self.tamanho]
+        visao.flags.writeable = False
+        return visao
+
+
+class InvertedIndex:
+
+    def __init__(self, programa: DecodedProgram) -> None:
+        self.programa = programa
+        # chave -> {valor: _IndexList de índices}
+        self.listas = {chave: {} for chave in CHAVES}
+        self.indexados = 0
+        self.atualiza()
+
+    def reconstroi(self) -> None:
+        # joga tudo fora e indexa de novo (depois de um patch no programa, por exemplo)
+        self.listas = {chave: {} for chave in CHAVES}
+        self.indexados = 0
+        self.atualiza()
+
+    def atualiza(self) -> int:
+        # indexa só as instruções que entraram no programa desde a última vez; devolve quantas foram
+        p = self.programa
+        inicio, fim = self.indexados, len(p)
+        listas = self.listas
+        colunas = (('nome', p.name), ('opcode', p.opcode), ('tipo', p.type))
+        for i in range(inicio, fim):
+            for chave, coluna in colunas:
+                self._adiciona(listas[chave], coluna[i], i)
+            if p.type[i] == InstrType.R.value:
+                self._adiciona(listas['funct'], p.funct[i], i)
+            w = p.word[i]
+            vistos = set()
+            for campo in _CAMPOS[((w >> 20) & 0xFC0) | (w & 0x3F)]:
+                registrador = getattr(p, campo)[i]
+                self._adiciona(listas[campo], registrador, i)
+                if registrador not in vistos:
+                    vistos.add(registrador)
+                    self._adiciona(listas['registrador'], registrador, i)
+        self.indexados = fim
+        return fim - inicio
+
+    @staticmethod
+    def _adiciona(por_valor: dict, valor: int, indice: int) -> None:
+        lista = por_valor.get(valor)
+        if lista is None:
+            lista = por_valor[valor] = _IndexList()
+        lista.append(indice)
+
+    def _array(self, chave: str, valor: int) -> np.ndarray:
+        # a lista como array NumPy somente leitura (visão do buffer, sem cópia)
+        lista = self.listas[chave].get(valor)
+        return _VAZIO if lista is None else lista.visao()
+
+    def _alternativas(self, chave: str, valor) -> list:
+        # arrays das alternativas do filtro (valor pode ser uma tupla/lista de valores, que viram união)
+        if chave not in self.listas:
+            raise ValueError(f'chave desconhecida: {chave!r} (use {", ".join(CHAVES)})')
+        if isinstance(valor, (tuple, list, set, frozenset)):
+            return [self._array(chave, _valor(chave, v)) for v in valor]
+        return [self._array(chave, _valor(chave, valor))]
+
+    def lista(self, chave: str, valor) -> np.ndarray:
+        # índices com chave == valor (valor pode ser uma tupla/lista de alternativas, que viram união)
+        return _uniao(self._alternativas(chave, valor))
+
+    def consulta(self, onde: dict = None, **filtros) -> np.ndarray:
+        # filtros: chave=valor (ou tupla de valores) das CHAVES, todos combinados com "e".
+        # onde: {coluna do programa: função que recebe o array da coluna nos candidatos e devolve máscara}.
+        # Devolve os índices das instruções em ordem crescente
+        if self.indexados != len(self.programa):
+            self.atualiza()
+        filtros = [self._alternativas(chave, valor) for chave, valor in filtros.items()]
+        if filtros:
+            filtros.sort(key=lambda alternativas: sum(len(a) for a in alternativas))
+            candidatos = _uniao(filtros[0])
+            for alternativas in filtros[1:]:
+                if not len(candidatos):
+                    break
+                mascara = np.zeros(len(candidatos), dtype=bool)
+                for ordenado in alternativas:
+                    mascara |= _contidos(candidatos, ordenado)
+                candidatos = candidatos[mascara]
+        else:
+            candidatos = np.arange(len(self.programa), dtype=np.uint32)
+        for coluna, condicao in (onde or {}).items():
+            if coluna not in COLUNAS:
+                raise ValueError(f'coluna desconhecida: {coluna!r} (use {", ".join(COLUNAS)})')
+            if not len(candidatos):
+                break
+            dados = getattr(self.programa, coluna)
+            valores = np.frombuffer(dados, dtype=np.dtype(dados.typecode))[candidatos]
+            candidatos = candidatos[np.asarray(condicao(valores), dtype=bool)]
+        return candidatos
+
+    def contagem(self, onde: dict = None, **filtros) -> int:
+        return len(self.consulta(onde, **filtros))
+
+    def valores(self, chave: str) -> dict:
+        # histograma da chave: valor -> quantidade de instruções
+        return {valor: len(lista) for valor, lista in sorted(self.listas[chave].items())}
@@ -1,4 +1,8 @@
+from collections import OrderedDict
 from enum import Enum
+from functools import cached_property
+from types import MappingProxyType
+from typing import Callable, Mapping
 
 
 class InstrType(Enum):
@@ -7,100 +11,136 @@ class InstrType(Enum):
     J = 3
 
 
+# tipo de cada um dos 64 opcodes possíveis, igual à regra antiga: 0 é R, 2 e 3 são J, o resto é I
+TIPO_POR_OPCODE = tuple(InstrType.R if op == 0 else InstrType.J if op == 2 or op == 3 else InstrType.I
+                        for op in range(64))
+
 class Instruction:
 
     def __init__(self, bits: str) -> None:
-        self.bits = bits
-        self.opcode = int(bits[:6], 2)
-        self.type = InstrType.R if self.opcode == 0 else \
-                    InstrType.J if self.opcode == 2 or self.opcode == 3 else InstrType.I
-        self.fields = self.get_fields(self.bits, self.type, self.opcode)
+        # caminho antigo (string de 32 bits): converte uma vez só pra inteiro e segue pelo caminho de inteiro
+        # decodificar não imprime nada; quem quiser mostrar usa o print_output ou um escritor do saida.py
+        self._decodifica(int(bits, 2))
+
+    @classmethod
+    def from_word(cls, word: int) -> 'Instruction':
+        # cria a instrução direto do inteiro de 32 bits, sem passar pela string e sem imprimir nada
+        instr = cls.__new__(cls)
+        instr._decodifica(word)
+        return instr
+
+    def _decodifica(self, word: int) -> None:
+        self.word = word & 0xFFFFFFFF
+        self.opcode = self.word >> 26 #os 6 bits mais altos
+        self.type = TIPO_POR_OPCODE[self.opcode]
+        self.fields = self.get_fields_word(self.word, self.type, self.opcode)
         if self.type == InstrType.R:
             self.name = MIPSDecoder.FUNCTIONS.get(self.fields.get('funct', 0), "Desconhecido")#se for R ele pega a parte dos 32bits referente a funct e atribui ao name qual tipo ela é
         else:
             self.name = MIPSDecoder.OPCODES.get(self.opcode, ("Desconhecido", ""))[0] #se for I ou J é mais simples, ele pega a primeira posição
 
-        self.mnemonic = self.get_mnemonic(self.fields, self.type)
-        print(f'Formato mnemônico: {self.mnemonic}')# pra imprimir o formato mnemonico da instrução
+    @cached_property
+    def mnemonic(self) -> str:
+        # o texto só é montado no primeiro acesso, com o renderizador já compilado pra esse opcode/funct
+        return RENDERIZADORES[(self.opcode << 6) | (self.word & 0x3F)](self.word)
+
+    @property
+    def bits(self) -> str:
+        # a string só é montada se alguém pedir
+        return f'{self.word:032b}'
 
     def __str__(self) -> str:
         return self.mnemonic
 
     @staticmethod
     def get_fields(bits: str, type: InstrType, opcode: int) -> dict:
-        #campo1 recebe o tipo de instrução:R, J ou I
-        campo1 = "R" if type == InstrType.R else "J" if type == InstrType.J else "I"
-
-        #Criação de um dicionário chamado campos
-        campos = {}
-        # esses comandos abaixo definem o intervalo dos 32 bits que devo "pegar"
-        # int(bits[<inicio>:<fim>], 2), "início" dita o índice do primeiro elemento,
-        # "fim" dita o último elemento, mas não o inclui. E 2 determina que isso vai ser convertido em binário.
-        # dessa forma separo cada parte que é equivalente a cada informação como rs rd rt e etc
-        if campo1 == "R":
-            campos = {
+        # mantido por compatibilidade: converte a string e usa a versão com inteiro
+        return Instruction.get_fields_word(int(bits, 2), type, opcode)
+
+    @staticmethod
+    def get_fields_word(word: int, type: InstrType, opcode: int) -> dict:
+        # mesma coisa que o get_fields, mas usando deslocamento e máscara em vez de fatiar string.
+        # bit 31 é o mais à esquerda da string, então bits[6:11] vira (word >> 21) & 0x1F e assim por diante
+        if type == InstrType.R:
+            return {
                 "opcode": opcode,#primeiros 6 bits
-                "rs": int(bits[6:11], 2),#do sétimo bit ao décimo bit
-                "rt": int(bits[11:16], 2),#do bit 11 ao 15
-                "rd": int(bits[16:21], 2),#do bit 16 ao 20
-                "shamt": int(bits[21:26], 2),#do bit 21 ao bit 25
-                "funct": int(bits[26:32], 2),#do bit 26 até o último
+                "rs": (word >> 21) & 0x1F,#bits 25..21
+                "rt": (word >> 16) & 0x1F,#bits 20..16
+                "rd": (word >> 11) & 0x1F,#bits 15..11
+                "shamt": (word >> 6) & 0x1F,#bits 10..6
+                "funct": word & 0x3F,#bits 5..0
             }
-        elif campo1 == "I":
-            campos = {
+        elif type == InstrType.I:
+            return {
                 "opcode": opcode,#primeiros 6 bits
-                "rs": int(bits[6:11], 2),#do bit 6 ao 10
-                "rt": int(bits[11:16], 2),#do bit 11 ao 15
-                "immediate": int(bits[16:32], 2),#do bit 16 ao bit 32
+                "rs": (word >> 21) & 0x1F,#bits 25..21
+                "rt": (word >> 16) & 0x1F,#bits 20..16
+                "immediate": word & 0xFFFF,#bits 15..0
             }
-        elif campo1 == "J":
-            campos = {
+        elif type == InstrType.J:
+            return {
                 "opcode": opcode,#primeiros 6 bits
-                "address": int(bits[6:32], 2),# nesse caso o endereço de 26 bits vai do sexto bit  até o final dos 32 bits.
+                "address": word & 0x3FFFFFF,# endereço de 26 bits, bits 25..0
             }
-        #Devolve as informação já mais ajeitada para cada tipo de caso:
-        return campos
+        return {}
 
     @staticmethod
     def get_mnemonic(fields: dict, type: InstrType) -> str:
-        if type == InstrType.R: # No caso de ser tipo R
-            funct = fields.get('funct')
-            nome_instrucao = MIPSDecoder.FUNCTIONS.get(funct, "Desconhecido")#acha qual a função e se não tiver retorna "desconhecido"
-            # Atribui valores as respectivas variáveis:
-            rd = MIPSDecoder.get_register_name(fields.get('rd'))
-            rs = MIPSDecoder.get_register_name(fields.get('rs'))
-            rt = MIPSDecoder.get_register_name(fields.get('rt'))
-            shamt = fields.get('shamt')
-
-            # Busca o formato correto de mnemônico e substitui os placeholders
-            formato = MIPSDecoder.MNEMONIC_FORMATS.get(nome_instrucao, "<instr> <rd>, <rs>, <rt>")#busca lá no dicionario que criei o jeitao da instrução
-
-            # aqui ele retorna já substituindo através do método find-replace
-            return formato.replace("<instr>", nome_instrucao) \
-                .replace("<rd>", rd) \
-                .replace("<rs>", rs) \
-                .replace("<rt>", rt) \
-                .replace("<shamt>", str(shamt))
-        #abaixo são as condicionais para os tipos J ou I, que são mais simples
+        # monta de volta a palavra a partir dos campos e usa o renderizador compilado (ver _compila_renderizador)
+        opcode = fields.get('opcode', 0)
+        if type == InstrType.R:
+            funct = fields.get('funct', 0)
+            word = (fields.get('rs', 0) << 21) | (fields.get('rt', 0) << 16) | (fields.get('rd', 0) << 11) \
+                | (fields.get('shamt', 0) << 6) | funct
         elif type == InstrType.I:
-            rs = MIPSDecoder.get_register_name(fields.get('rs'))
-            rt = MIPSDecoder.get_register_name(fields.get('rt'))
-            immediate = fields.get('immediate')
-            nome_instrucao, formato = MIPSDecoder.OPCODES.get(fields['opcode'], ("Desconhecido", ""))
-            return formato.replace("<instr>", nome_instrucao) \
-                .replace("<rs>", rs) \
-                .replace("<rt>", rt) \
-                .replace("<imm>", str(immediate))
-
+            funct = 0
+            word = (opcode << 26) | (fields.get('rs', 0) << 21) | (fields.get('rt', 0) << 16) \
+                | fields.get('immediate', 0)
         elif type == InstrType.J:
-            address = fields.get('address')
-            nome_instrucao, formato = MIPSDecoder.OPCODES.get(fields['opcode'], ("Desconhecido", ""))
-            #Retorna com o formato da instrução
-            return formato.replace("<instr>", nome_instrucao) \
-                .replace("<label>", str(address))
+            funct = 0
+            word = (opcode << 26) | fields.get('address', 0)
         #se não bater com nada até agora então ele retorna "desconhecido"
         else:
             return "Desconhecido"
+        return RENDERIZADORES[(opcode << 6) | funct](word)
+
+
+class DecodedInstruction:
+    # registro imutável de uma instrução já decodificada, com os sinais de controle junto.
+    # é o que fica guardado no cache do MIPSDecoder e é compartilhado entre todas as consultas da mesma palavra;
+    # o mnemônico só é montado no primeiro acesso
+    __slots__ = ('word', 'opcode', 'type', 'name', 'fields', 'control', 'signals', '_mnemonic')
+
+    def __init__(self, word: int, opcode: int, type: InstrType, name: str, fields: Mapping[str, int],
+                 control: int, signals: Mapping[str, int]) -> None:
+        for atributo, valor in (('word', word), ('opcode', opcode), ('type', type), ('name', name),
+                                ('fields', fields), ('control', control), ('signals', signals),
+                                ('_mnemonic', None)):
+            object.__setattr__(self, atributo, valor)
+
+    def __setattr__(self, atributo, valor) -> None:
+        raise AttributeError('DecodedInstruction é imutável')
+
+    def __eq__(self, outro) -> bool:
+        return isinstance(outro, DecodedInstruction) and outro.word == self.word
+
+    def __hash__(self) -> int:
+        return hash(self.word)
+
+    def __repr__(self) -> str:
+        return f'DecodedInstruction(word=0x{self.word:08x}, name={self.name!r})'
+
+    def __str__(self) -> str:
+        return self.mnemonic
+
+    @property
+    def mnemonic(self) -> str:
+        mnemonic = self._mnemonic
+        if mnemonic is None:
+            mnemonic = RENDERIZADORES[(self.opcode << 6) | (self.word & 0x3F)](self.word)
+            object.__setattr__(self, '_mnemonic', mnemonic)
+        return mnemonic
+
 
 class MIPSDecoder: #Dicionário ou mapa
     #Dicionário dos registradores
@@ -235,136 +275,206 @@ class MIPSDecoder: #Dicionário ou mapa
         'nor': '<instr> <rd>, <rs>, <rt>',
     }
 
+    #DICIONARIO DE SINAIS DE CONTROLE (por nome da instrução)
+    SINAIS_DE_CONTROLE = {
+        # tipo R
+        'add': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'addu': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'and': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'break': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                  'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'div': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'divu': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'jalr': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 1},
+        'jr': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+               'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 1},
+        'mfhi': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'mflo': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'mthi': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'mtlo': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'mult': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'multu': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                  'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'nor': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'or': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+               'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'sll': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'sllv': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'sra': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'srav': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'srl': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'srlv': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'slt': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'sltu': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'sub': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'subu': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'syscall': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'movn': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'movz': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'clo': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'seb': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'seh': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+
+        # Tipo I
+        'addi': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'addiu': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
+                  'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'andi': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'beq': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
+        'bne': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
+        'bgez': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
+        'bgtz': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
+        'blez': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
+        'lb': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
+               'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'lbu': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
+                'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'lh': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
+               'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'lhu': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
+                'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'lw': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
+               'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'lui': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'ori': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'sb': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 0,
+               'MemRead': 0, 'MemWrite': 1, 'Branch': 0, 'Jump': 0},
+        'sh': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 0,
+               'MemRead': 0, 'MemWrite': 1, 'Branch': 0, 'Jump': 0},
+        'slti': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
+                 'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'sltiu': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
+                  'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+        'sw': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 0,
+               'MemRead': 0, 'MemWrite': 1, 'Branch': 0, 'Jump': 0},
+
+        # tipo J
+        'j': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
+              'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 1},
+        'jal': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
+                'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 1},
+    }
+
+    def __init__(self, cache_size: int = 0, instrumentacao=None) -> None:
+        # cache opcional de decodificação (LRU), a chave é a palavra de 32 bits. cache_size=0 desliga.
+        # instrumentacao: um DecoderInstrumentation (instrumentacao.py) pra contar e medir; None desliga
+        if cache_size < 0:
+            raise ValueError(f'cache_size não pode ser negativo: {cache_size}')
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self.instrumentacao = instrumentacao
+
     def parse_instruction(self, bits: str) -> Instruction:
+        # compatibilidade com o caminho antigo por string
+        if self.instrumentacao is not None:
+            return self.instrumentacao.decodifica(int(bits, 2))
         return Instruction(bits)
 
-    @staticmethod
-    def get_sinais_de_controle(instr):
-    #DICIONARIO DE SINAIS DE CONTROLE
-        sinais_de_controle = {
-            # tipo R
-            'add': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'addu': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'and': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'break': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                      'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'div': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'divu': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'jalr': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 1},
-            'jr': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                   'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 1},
-            'mfhi': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'mflo': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'mthi': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'mtlo': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'mult': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'multu': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                      'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'nor': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'or': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                   'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'sll': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'sllv': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'sra': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'srav': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'srl': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'srlv': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'slt': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'sltu': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'sub': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'subu': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'syscall': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                        'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'movn': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'movz': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'clo': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'seb': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'seh': {'RegDst': 1, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
+    def decode_word(self, word: int) -> Instruction:
+        # caminho principal: decodifica direto o inteiro de 32 bits, sem montar string nenhuma
+        if self.instrumentacao is not None:
+            return self.instrumentacao.decodifica(word)
+        return Instruction.from_word(word)
+
+    def decode_cached(self, word: int) -> DecodedInstruction:
+        # igual ao decode_word, mas devolve o registro imutável e reaproveita se a palavra já foi vista
+        word &= 0xFFFFFFFF
+        cache = self._cache
+        registro = cache.get(word)
+        if registro is not None:
+            self.cache_hits += 1
+            cache.move_to_end(word)
+            if self.instrumentacao is not None:
+                self.instrumentacao.registra(word)# acerto no cache conta no histograma, mas não tem estágio pra medir
+            return registro
+        self.cache_misses += 1
+        if self.instrumentacao is not None:
+            registro = self.instrumentacao.decodifica_registro(word)
+        else:
+            registro = self.decode_record(word)
+        if self.cache_size:
+            cache[word] = registro
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)# tira o usado há mais tempo
+                self.cache_evictions += 1
+        return registro
 
-            # Tipo I
-            'addi': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'addiu': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
-                      'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'andi': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'beq': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
-            'bne': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
-            'bgez': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
-            'bgtz': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
-            'blez': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 1, 'Jump': 0},
-            'lb': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
-                   'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'lbu': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
-                    'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'lh': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
-                   'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'lhu': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
-                    'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'lw': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 1, 'RegWrite': 1,
-                   'MemRead': 1, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'lui': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'ori': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'sb': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 0,
-                   'MemRead': 0, 'MemWrite': 1, 'Branch': 0, 'Jump': 0},
-            'sh': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 0,
-                   'MemRead': 0, 'MemWrite': 1, 'Branch': 0, 'Jump': 0},
-            'slti': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
-                     'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'sltiu': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 1,
-                      'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0},
-            'sw': {'RegDst': 0, 'ALUSrc': 1, 'MemToReg': 0, 'RegWrite': 0,
-                   'MemRead': 0, 'MemWrite': 1, 'Branch': 0, 'Jump': 0},
-
-            # tipo J
-            'j': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-                  'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 1},
-            'jal': {'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 1,
-                    'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 1},
+    @staticmethod
+    def decode_record(word: int) -> DecodedInstruction:
+        # decodifica sem cache e já monta o registro imutável
+        instr = Instruction.from_word(word)
+        control = ROM_CONTROLE[(instr.opcode << 6) | instr.fields.get('funct', 0)]
+        return DecodedInstruction(instr.word, instr.opcode, instr.type, instr.name,
+                                  MappingProxyType(instr.fields), control, VISAO_POR_MASCARA[control])
+
+    def cache_info(self) -> dict:
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'size': len(self._cache),
+            'max_size': self.cache_size,
         }
 
-        # Obtém o mnemonic em lowercase para garantir correspondência
-        mnemonic = instr.mnemonic.strip().split()[0].lower()
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.cache_hits = self.cache_misses = self.cache_evictions = 0
+
+    @staticmethod
+    def get_sinais_de_controle(instr) -> Mapping[str, int]:
+        # consulta direto a ROM pelo opcode/funct, sem montar dicionário e sem mexer no texto do mnemônico.
+        # devolve uma visão somente leitura compartilhada (não dá pra alterar o dicionário)
+        return VISAO_POR_MASCARA[ROM_CONTROLE[(instr.opcode << 6) | instr.fields.get('funct', 0)]]
+
+    @staticmethod
+    def get_sinais_empacotados(word: int) -> int:
+        # versão mais crua: devolve os 8 sinais empacotados num inteiro (bit 0 = RegDst ... bit 7 = Jump, ver SINAIS)
+        return ROM_CONTROLE[((word >> 20) & 0xFC0) | (word & 0x3F)]
 
-        # Retorna os sinais de controle ou um padrão com zeros caso não encontrado
-        return sinais_de_controle.get(mnemonic, {
-            'RegDst': 0, 'ALUSrc': 0, 'MemToReg': 0, 'RegWrite': 0,
-            'MemRead': 0, 'MemWrite': 0, 'Branch': 0, 'Jump': 0
-        })
+    @staticmethod
+    def get_sinais_da_palavra(word: int) -> Mapping[str, int]:
+        # mesma coisa do get_sinais_de_controle, mas a partir do inteiro de 32 bits
+        return VISAO_POR_MASCARA[ROM_CONTROLE[((word >> 20) & 0xFC0) | (word & 0x3F)]]
 
     @staticmethod
     def get_register_name(register_index: int) -> str:
@@ -372,8 +482,135 @@ class MIPSDecoder: #Dicionário ou mapa
 
     @staticmethod
     def get_register_index(register_name: str) -> int:
-        inv_map = { v: k for k, v in MIPSDecoder.REGISTERS.items() }
-        return inv_map[register_name]
+        # o mapa inverso é montado uma vez só (INDICE_REGISTRADOR)
+        return INDICE_REGISTRADOR[register_name]
+
+
+# ordem dos sinais dentro da máscara empacotada: RegDst é o bit 0, Jump é o bit 7
+SINAIS = ('RegDst', 'ALUSrc', 'MemToReg', 'RegWrite', 'MemRead', 'MemWrite', 'Branch', 'Jump')
+
+
+def empacota_sinais(sinais: Mapping[str, int]) -> int:
+    mascara = 0
+    for bit, nome in enumerate(SINAIS):
+        if sinais.get(nome, 0):
+            mascara |= 1 << bit
+    return mascara
+
+
+def _monta_rom_controle() -> tuple:
+    # a ROM é montada uma vez só quando o módulo carrega. Índice = (opcode << 6) | funct,
+    # então são 64*64 posições: pro tipo R o funct escolhe a linha, pros outros tipos o funct é ignorado.
+    # Instrução que não está em SINAIS_DE_CONTROLE (ou desconhecida) fica com tudo zero, igual antes
+    rom = [0] * (64 * 64)
+    for opcode in range(64):
+        for funct in range(64):
+            if opcode == 0:
+                nome = MIPSDecoder.FUNCTIONS.get(funct, "Desconhecido")
+            else:
+                nome = MIPSDecoder.OPCODES.get(opcode, ("Desconhecido", ""))[0]
+            rom[(opcode << 6) | funct] = empacota_sinais(MIPSDecoder.SINAIS_DE_CONTROLE.get(nome, {}))
+    return tuple(rom)
+
+
+ROM_CONTROLE = _monta_rom_controle()
+# Tabela de nomes: posição 0 é o "Desconhecido", depois vem cada nome que aparece em OPCODES/FUNCTIONS.
+# serve pra guardar o nome como um número pequeno nos formatos compactos (lote, DecodedProgram)
+NOMES = ("Desconhecido",) + tuple(sorted(
+    {nome for nome, _ in MIPSDecoder.OPCODES.values() if nome != 'R'} | set(MIPSDecoder.FUNCTIONS.values())
+))
+ID_NOME = {nome: i for i, nome in enumerate(NOMES)}
+# índice do nome em NOMES para cada (opcode << 6) | funct, mesmo esquema da ROM de controle
+ID_NOME_ROM = tuple(ID_NOME[MIPSDecoder.FUNCTIONS.get(i & 0x3F, "Desconhecido")] if i >> 6 == 0 else
+                    ID_NOME.get(MIPSDecoder.OPCODES.get(i >> 6, ("Desconhecido", ""))[0], 0)
+                    for i in range(64 * 64))
+# uma visão somente leitura pronta para cada máscara possível, compartilhada entre todas as instruções
+VISAO_POR_MASCARA = tuple(MappingProxyType({nome: (mascara >> bit) & 1 for bit, nome in enumerate(SINAIS)})
+                          for mascara in range(256))
+
+# nomes dos 32 registradores em ordem, pra indexar direto pelo número, e o caminho contrário
+NOMES_REGISTRADORES = tuple(MIPSDecoder.REGISTERS[i] for i in range(32))
+INDICE_REGISTRADOR = {v: k for k, v in MIPSDecoder.REGISTERS.items()}
+
+# extratores dos placeholders: cada um recebe a palavra e devolve o valor pronto pro texto
+def _registrador(deslocamento: int) -> Callable[[int], str]:
+    return lambda w: NOMES_REGISTRADORES[(w >> deslocamento) & 31]
+
+
+def _campo(deslocamento: int, mascara: int) -> Callable[[int], int]:
+    return lambda w: (w >> deslocamento) & mascara
+
+
+# placeholders que cada tipo substitui no formato, e a função que tira o valor da palavra w.
+# é a mesma regra do get_mnemonic antigo (o que não é do tipo fica como está no texto), com uma diferença:
+# nos desvios do tipo I o <label> agora mostra o imediato cru, em vez de sair "<label>" literal
+_PLACEHOLDERS = {
+    InstrType.R: {'<rd>': _registrador(11), '<rs>': _registrador(21), '<rt>': _registrador(16),
+                  '<shamt>': _campo(6, 31)},
+    InstrType.I: {'<rs>': _registrador(21), '<rt>': _registrador(16), '<imm>': _campo(0, 0xFFFF),
+                  '<label>': _campo(0, 0xFFFF)},
+    InstrType.J: {'<label>': _campo(0, 0x3FFFFFF)},
+}
+_renderizadores_compilados = {}
+
+
+def _compila_renderizador(nome: str, formato: str, tipo: InstrType) -> Callable[[int], str]:
+    # transforma o formato com placeholders numa função que recebe a palavra e devolve o texto pronto.
+    # o nome da instrução já entra fixo no texto; cada placeholder vira um %s no molde e o extrator dele
+    # entra numa closure com a quantidade certa de campos (sem montar tupla com gerador a cada chamada)
+    chave = (nome, formato, tipo)
+    if chave in _renderizadores_compilados:
+        return _renderizadores_compilados[chave]
+    texto = formato.replace("<instr>", nome).replace('%', '%%')
+    extratores = []
+    posicoes = []
+    for placeholder, extrator in _PLACEHOLDERS[tipo].items():
+        inicio = texto.find(placeholder)
+        while inicio != -1:
+            posicoes.append((inicio, placeholder, extrator))
+            inicio = texto.find(placeholder, inicio + 1)
+    partes = []
+    anterior = 0
+    for inicio, placeholder, extrator in sorted(posicoes, key=lambda posicao: posicao[0]):
+        partes.append(texto[anterior:inicio])
+        partes.append('%s')
+        extratores.append(extrator)
+        anterior = inicio + len(placeholder)
+    partes.append(texto[anterior:])
+    molde = ''.join(partes)
+    if not extratores:
+        fixo = molde.replace('%%', '%')
+        renderizador = lambda w: fixo
+    elif len(extratores) == 1:
+        a, = extratores
+        renderizador = lambda w: molde % (a(w),)
+    elif len(extratores) == 2:
+        a, b = extratores
+        renderizador = lambda w: molde % (a(w), b(w))
+    elif len(extratores) == 3:
+        a, b, c = extratores
+        renderizador = lambda w: molde % (a(w), b(w), c(w))
+    else:
+        renderizador = lambda w: molde % tuple(extrator(w) for extrator in extratores)
+    _renderizadores_compilados[chave] = renderizador
+    return renderizador
+
+
+def _monta_renderizadores() -> tuple:
+    # um renderizador por (opcode << 6) | funct, igual à ROM de controle
+    tabela = []
+    for i in range(64 * 64):
+        opcode, funct = i >> 6, i & 0x3F
+        if opcode == 0:
+            nome = MIPSDecoder.FUNCTIONS.get(funct, "Desconhecido")
+            formato = MIPSDecoder.MNEMONIC_FORMATS.get(nome, "<instr> <rd>, <rs>, <rt>")
+        else:
+            nome, formato = MIPSDecoder.OPCODES.get(opcode, ("Desconhecido", ""))
+        tabela.append(_compila_renderizador(nome, formato, TIPO_POR_OPCODE[opcode]))
+    return tuple(tabela)
+
+
+RENDERIZADORES = _monta_renderizadores()
 
 
 def parse_int(num_str: str) -> int:# aqui ele pega a instrução digitada, compreende qual base é e retorna ela convertida
@@ -383,25 +620,86 @@ def parse_int(num_str: str) -> int:# aqui ele pega a instrução digitada, compr
     return int(num_str, base)
 
 
-def print_output(instr: Instruction, signals: dict) -> None:
+def format_output(instr: Instruction, signals: Mapping[str, int]) -> str:
+    # monta o mesmo texto que o print_output mostra, numa string só
+    linhas = []
     if instr.type == InstrType.R: #se for tipo R ele usa esse caminho pra imprimir o tipo da instrução no dict FUNCTIONS
-        print(f'Instrução: {MIPSDecoder.FUNCTIONS.get(instr.fields.get("funct", 0), "Desconhecido")}')
+        linhas.append(f'Instrução: {MIPSDecoder.FUNCTIONS.get(instr.fields.get("funct", 0), "Desconhecido")}')
     else:#Outros tipos ele consegue buscar direto o tipo da instrução pelo .name
-        print(f'Instrução: {instr.name}')
-    print(f'- Tipo: {instr.type.name}')
-    print(f'- Campos:')
+        linhas.append(f'Instrução: {instr.name}')
+    linhas.append(f'- Tipo: {instr.type.name}')
+    linhas.append(f'- Campos:')
     for field, value in instr.fields.items():
         if field == 'opcode' and instr.opcode != 0:
-            print(f'\t{field}: {value} ({MIPSDecoder.OPCODES[value][0]})')
+            linhas.append(f'\t{field}: {value} ({MIPSDecoder.OPCODES.get(value, ("Desconhecido", ""))[0]})')
         elif field == 'funct':
-            print(f'\t{field}: {value} ({MIPSDecoder.FUNCTIONS[value]})')
+            linhas.append(f'\t{field}: {value} ({MIPSDecoder.FUNCTIONS.get(value, "Desconhecido")})')
         elif field == 'rs' or field == 'rt' or field == 'rd':
-            print(f'\t{field}: {value} ({MIPSDecoder.REGISTERS[value]})')
+            linhas.append(f'\t{field}: {value} ({MIPSDecoder.REGISTERS[value]})')
         else:
-            print(f'\t{field}: {value}')
-    print(f'- Sinais de controle:')
+            linhas.append(f'\t{field}: {value}')
+    linhas.append(f'- Sinais de controle:')
     for signal, value in signals.items():
-        print(f'\t{signal}: {value}')
+        linhas.append(f'\t{signal}: {value}')
+    linhas.append('')
+    return '\n'.join(linhas)
+
+
+def print_output(instr: Instruction, signals: Mapping[str, int]) -> None:
+    print(format_output(instr, signals), end='')
+
+
+# corpus de teste (era o bloco comentado no main): uma palavra de cada instrução conhecida, com ela no
+# comentário do lado. Usado pelos testes e pelo benchmark.py
+TESTES = [
+    "00000000001000000000000000001000",  # jr $1              (funct=0x08)
+    "00000000001000110001100000001001",  # jalr $3, $1        (funct=0x09)
+    "00000000000000000001100000010000",  # mfhi $3            (funct=0x10)
+    "00000000000000000001100000010010",  # mflo $3            (funct=0x12)
+    "00000000001100000000000000010001",  # mthi $3            (funct=0x11)
+    "00000000001100000000000000010011",  # mtlo $3            (funct=0x13)
+    "00000000001100010000000000011000",  # mult $3, $1        (funct=0x18)
+    "00000000001100010000000000011001",  # multu $3, $1       (funct=0x19)
+    "00000000001100010000000000011010",  # div $3, $1         (funct=0x1A)
+    "00000000001100010000000000011011",  # divu $3, $1        (funct=0x1B)
+    "00000000000000100001100010000000",  # sll $3, $2, 4      (funct=0x00)
+    "00000000000000100001100010000011",  # sra $3, $2, 4      (funct=0x03)
+    "00000000000000100001100010000010",  # srl $3, $2, 4      (funct=0x02)
+    "00000000001100100001100000000100",  # sllv $3, $2, $1    (funct=0x04)
+    "00000000001100100001100000000110",  # srlv $3, $2, $1    (funct=0x06)
+    "00000000001100100001100000000111",  # srav $3, $2, $1    (funct=0x07)
+    "00000000000000000000000000001100",  # syscall            (funct=0x0C)
+    "00000000000000000000000000001101",  # break              (funct=0x0D)
+
+    # ==== Tipo I ====
+    "00100000001000100000000000001010",  # addi $2, $1, 10
+    "00100100001000100000000000001010",  # addiu $2, $1, 10
+    "00110000001000100000000000001111",  # andi $2, $1, 15
+    "00010000001000100000000000000100",  # beq $1, $2, 4
+    "00000100001000010000000000001000",  # bgez $1, 8
+    "00011100001000000000000000000100",  # bgtz $1, 4
+    "00011000001000000000000000000100",  # blez $1, 4
+    "00010100001000100000000000000100",  # bne $1, $2, 4
+    "10000000001000100000000000010100",  # lb $2, 20($1)
+    "10010000001000100000000000010100",  # lbu $2, 20($1)
+    "10000100001000100000000000010100",  # lh $2, 20($1)
+    "10010100001000100000000000010100",  # lhu $2, 20($1)
+    "00111100000000100000000001100100",  # lui $2, 100
+    "10001100001000100000000000010100",  # lw $2, 20($1)
+    "11000100001000100000000000010100",  # lwc1 $2, 20($1)
+    "00110100001000100000000000010101",  # ori $2, $1, 21
+    "10100000001000100000000000010100",  # sb $2, 20($1)
+    "00101000001000100000000000001100",  # slti $2, $1, 12
+    "00101100001000100000000000001100",  # sltiu $2, $1, 12
+    "10100100001000100000000000010100",  # sh $2, 20($1)
+    "10101100001000100000000000010000",  # sw $2, 16($1)
+    "11100100001000100000000000010100",  # swc1 $2, 20($1)
+    "00111000001000100000000000011001",  # xori $2, $1, 25
+
+    # ==== Tipo J ====
+    "00001000000000000000000000000100",  # j 4
+    "00001100000000000000000000001000",  # jal 8
+]
 
 
 def main():
@@ -414,68 +712,12 @@ def main():
         if not input_value:
             break
 
-        instr = decoder.parse_instruction(f'{parse_int(input_value):032b}')
+        instr = decoder.decode_word(parse_int(input_value))
+        print(f'Formato mnemônico: {instr.mnemonic}')
         signals = decoder.get_sinais_de_controle(instr)
         print_output(instr, signals)
 
 
- ## para fins de testes descomente esse bloco, rode o código inserindo qquer instrução que ele passará por esse trecho testando vários outras instruções:
-        # testes = [
-        #     "00000000001000000000000000001000",  # jr $1              (funct=0x08)
-        #     "00000000001000110001100000001001",  # jalr $3, $1        (funct=0x09)
-        #     "00000000000000000001100000010000",  # mfhi $3            (funct=0x10)
-        #     "00000000000000000001100000010010",  # mflo $3            (funct=0x12)
-        #     "00000000001100000000000000010001",  # mthi $3            (funct=0x11)
-        #     "00000000001100000000000000010011",  # mtlo $3            (funct=0x13)
-        #     "00000000001100010000000000011000",  # mult $3, $1        (funct=0x18)
-        #     "00000000001100010000000000011001",  # multu $3, $1       (funct=0x19)
-        #     "00000000001100010000000000011010",  # div $3, $1         (funct=0x1A)
-        #     "00000000001100010000000000011011",  # divu $3, $1        (funct=0x1B)
-        #     "00000000000000100001100010000000",  # sll $3, $2, 4      (funct=0x00)
-        #     "00000000000000100001100010000011",  # sra $3, $2, 4      (funct=0x03)
-        #     "00000000000000100001100010000010",  # srl $3, $2, 4      (funct=0x02)
-        #     "00000000001100100001100000000100",  # sllv $3, $2, $1    (funct=0x04)
-        #     "00000000001100100001100000000110",  # srlv $3, $2, $1    (funct=0x06)
-        #     "00000000001100100001100000000111",  # srav $3, $2, $1    (funct=0x07)
-        #     "00000000000000000000000000001100",  # syscall            (funct=0x0C)
-        #     "00000000000000000000000000001101",  # break              (funct=0x0D)
-        #
-        # # ==== Tipo I ====
-        #     "00100000001000100000000000001010",  # addi $2, $1, 10
-        #     "00100100001000100000000000001010",  # addiu $2, $1, 10
-        #     "00110000001000100000000000001111",  # andi $2, $1, 15
-        #     "00010000001000100000000000000100",  # beq $1, $2, 4
-        #     "00000100001000010000000000001000",  # bgez $1, 8
-        #     "00011100001000000000000000000100",  # bgtz $1, 4
-        #     "00011000001000000000000000000100",  # blez $1, 4
-        #     "00010100001000100000000000000100",  # bne $1, $2, 4
-        #     "10000000001000100000000000010100",  # lb $2, 20($1)
-        #     "10010000001000100000000000010100",  # lbu $2, 20($1)
-        #     "10000100001000100000000000010100",  # lh $2, 20($1)
-        #     "10010100001000100000000000010100",  # lhu $2, 20($1)
-        #     "00111100000000100000000001100100",  # lui $2, 100
-        #     "10001100001000100000000000010100",  # lw $2, 20($1)
-        #     "11000100001000100000000000010100",  # lwc1 $2, 20($1)
-        #     "00110100001000100000000000010101",  # ori $2, $1, 21
-        #     "10100000001000100000000000010100",  # sb $2, 20($1)
-        #     "00101000001000100000000000001100",  # slti $2, $1, 12
-        #     "00101100001000100000000000001100",  # sltiu $2, $1, 12
-        #     "10100100001000100000000000010100",  # sh $2, 20($1)
-        #     "10101100001000100000000000010000",  # sw $2, 16($1)
-        #     "11100100001000100000000000010100",  # swc1 $2, 20($1)
-        #     "00111000001000100000000000011001",  # xori $2, $1, 25
-        #
-        #     # ==== Tipo J ====
-        #     "00001000000000000000000000000100",  # j 4
-        #     "00001100000000000000000000001000",  # jal 8
-        # ]
-        #
-        # for bin_instr in testes:
-        #     instr = MIPSDecoder().parse_instruction(bin_instr)
-        #     signals = MIPSDecoder().get_sinais_de_controle(instr)
-        #     print_output(instr, signals)
-
-
 if __name__ == '__main__':
     main()
 
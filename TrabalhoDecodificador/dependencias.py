@@ -0,0 +1,189 @@
+import numpy as np
+
+from decodificador_bruno_c_t_elias import NOMES_REGISTRADORES
+from perfis import HI, LO, PERFIS
+from programa import DecodedProgram
+
+# Dependências de registrador (def-use) de um DecodedProgram, na ordem em que as instruções aparecem (um
+# trecho de código em linha reta ou um trace já decodificado). Quem lê e quem escreve vem dos PERFIS do
+# perfis.py, que já sai dos sinais RegDst/RegWrite da ROM e do rs/rt de cada instrução; HI e LO entram
+# como registradores 32 e 33. O $zero não cria dependência.
+#
+# Tudo fica em arrays de inteiros:
+#   produtor[i, k]   instrução que escreveu o k-ésimo registrador lido por i (-1 = valor de antes do programa)
+#   lido[i, k]       qual registrador foi (-1 = posição não usada); k = 0 rs, 1 rt, 2 HI/LO
+#   destino[i, k]    registradores escritos por i (até 2, por causa do mult/div que escrevem HI e LO)
+#   leitores         formato CSR: os leitores da escrita i são leitores[inicio_leitores[i]:inicio_leitores[i+1]]
+#   fim_vida[i, k]   última instrução que lê o valor de destino[i, k] (i mesmo se ninguém lê, -1 sem destino);
+#                    mult/div têm uma vida pro HI e outra pro LO
+#   profundidade[i]  ciclo em que o resultado de i fica pronto no caminho crítico (latência ALU 1, load 2)
+
+REGISTRADORES = 34
+NOMES = NOMES_REGISTRADORES + ('$hi', '$lo')
+LATENCIA_ALU = 1
+LATENCIA_LOAD = 2
+
+
+class DependencyIndex:
+
+    def __init__(self, programa: DecodedProgram, latencia_alu: int = LATENCIA_ALU,
+                 latencia_load: int = LATENCIA_LOAD) -> None:
+        self.programa = programa
+        self.n = n = len(programa)
+        self.lido = np.full((n, 3), -1, dtype=np.int8)
+        self.produtor = np.full((n, 3), -1, dtype=np.int32)
+        self.destino = np.full((n, 2), -1, dtype=np.int8)
+        self.profundidade = np.zeros(n, dtype=np.int32)
+        self.anterior = np.full(n, -1, dtype=np.int32)  # produtor que define a profundidade (pra refazer a cadeia)
+        self._constroi(latencia_alu, latencia_load)
+
+    def _constroi(self, latencia_alu: int, latencia_load: int) -> None:
+        # uma passada só, guardando quem escreveu cada registrador por último
+        ultimo = [-1] * REGISTRADORES
+        words = self.programa.word
+        lido, produtor, destino = self.lido.tolist(), self.produtor.tolist(), self.destino.tolist()
+        profundidade = [0] * self.n
+        anterior = [-1] * self.n
+        for i in range(self.n):
+            w = words[i]
+            le_rs, le_rt, dest, escreve_hi, escreve_lo, le_hilo, load, _ = \
+                PERFIS[((w >> 20) & 0xFC0) | (w & 0x3F)]
+            pronto = 0
+            origem = -1
+            lidos_i, produtores_i = lido[i], produtor[i]
+            for k, (usa, registrador) in enumerate(((le_rs, (w >> 21) & 31), (le_rt, (w >> 16) & 31),
+                                                    (le_hilo, le_hilo))):
+                if usa and registrador:
+                    p = ultimo[registrador]
+                    lidos_i[k] = registrador
+                    produtores_i[k] = p
+                    if p >= 0 and profundidade[p] > pronto:
+                        pronto = profundidade[p]
+                        origem = p
+            profundidade[i] = pronto + (latencia_load if load else latencia_alu)
+            anterior[i] = origem
+            if dest is not None:
+                registrador = (w >> 11) & 31 if dest == 'rd' else (w >> 16) & 31 if dest == 'rt' else dest
+                if registrador:
+                    destino[i][0] = registrador
+                    ultimo[registrador] = i
+            # mult/div escrevem HI e LO; mthi e mtlo só um deles (nenhuma delas escreve registrador comum)
+            k = 0
+            for escreve, registrador in ((escreve_hi, HI), (escreve_lo, LO)):
+                if escreve:
+                    destino[i][k] = registrador
+                    ultimo[registrador] = i
+                    k += 1
+        self.lido = np.array(lido, dtype=np.int8).reshape(self.n, 3)
+        self.produtor = np.array(produtor, dtype=np.int32).reshape(self.n, 3)
+        self.destino = np.array(destino, dtype=np.int8).reshape(self.n, 2)
+        self.profundidade = np.array(profundidade, dtype=np.int32)
+        self.anterior = np.array(anterior, dtype=np.int32)
+
+        # inverte produtor -> leitores (CSR), ordenado por produtor e depois por leitor
+        leitor = np.repeat(np.arange(self.n, dtype=np.int32), 3)
+        produtor = self.produtor.ravel()
+        valido = produtor >= 0
+        leitor, produtor = leitor[valido], produtor[valido]
+        ordem = np.argsort(produtor, kind='stable')
+        self.leitores = leitor[ordem]
+        self.inicio_leitores = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(produtor, minlength=self.n), out=self.inicio_leitores[1:])
+        # último leitor de cada destino: a escrita em k = 1 só pode ser o LO de um mult/div, o resto cai em k = 0
+        self.fim_vida = np.where(self.destino >= 0, np.arange(self.n, dtype=np.int32)[:, None], -1).astype(np.int32)
+        lido = self.lido.ravel()[valido]
+        slot = (self.destino[produtor, 1] == lido).astype(np.intp)
+        np.maximum.at(self.fim_vida, (produtor, slot), leitor)
+
+    # ------------------------------------------------------------ consultas
+
+    def leitores_de(self, i: int) -> np.ndarray:
+        # todas as instruções que leem o valor escrito por i (pode ter leitor repetido se lê o mesmo em rs e rt)
+        return self.leitores[self.inicio_leitores[i]:self.inicio_leitores[i + 1]]
+
+    def produtores_de(self, i: int) -> np.ndarray:
+        produtores = self.produtor[i]
+        return np.unique(produtores[produtores >= 0])
+
+    def _slot(self, escritas: np.ndarray, registrador: int) -> np.ndarray:
+        # em qual coluna de destino cada escrita guarda o registrador
+        return (self.destino[escritas, 1] == registrador).astype(np.intp)
+
+    def vida(self, i: int, registrador=None) -> tuple:
+        # intervalo [i, último leitor] do valor escrito por i (no registrador dado, pra separar HI de LO)
+        k = 0
+        if registrador is not None:
+            if isinstance(registrador, str):
+                registrador = NOMES.index(registrador)
+            k = int(self.destino[i, 1] == registrador)
+        return i, int(self.fim_vida[i, k])
+
+    def escritas_de(self, registrador) -> np.ndarray:
+        # índices das instruções que escrevem no registrador (número, nome ou 32/33 pra HI/LO)
+        if isinstance(registrador, str):
+            registrador = NOMES.index(registrador)
+        return np.flatnonzero((self.destino == registrador).any(axis=1))
+
+    def vidas_de(self, registrador) -> np.ndarray:
+        # intervalos de vida de cada escrita no registrador, como array (k, 2) de [início, fim]
+        if isinstance(registrador, str):
+            registrador = NOMES.index(registrador)
+        escritas = self.escritas_de(registrador)
+        return np.stack((escritas, self.fim_vida[escritas, self._slot(escritas, registrador)]), axis=1)
+
+    def caminho_critico(self) -> int:
+        # ciclos do caminho crítico: o menor tempo possível com recursos infinitos e só as dependências reais
+        return int(self.profundidade.max()) if self.n else 0
+
+    def cadeia_mais_longa(self) -> np.ndarray:
+        # índices da cadeia de dependência que forma o caminho crítico, do começo pro fim
+        if not self.n:
+            return np.zeros(0, dtype=np.int32)
+        cadeia = []
+        i = int(self.profundidade.argmax())
+        while i >= 0:
+            cadeia.append(i)
+            i = int(self.anterior[i])
+        return np.array(cadeia[::-1], dtype=np.int32)
+
+    def ilp(self) -> float:
+        # paralelismo no nível de instrução: instruções / ciclos do caminho crítico
+        caminho = self.caminho_critico()
+        return self.n / caminho if caminho else 0.0
+
+    def relatorio(self) -> dict:
+        vidas = self.fim_vida - np.arange(self.n, dtype=np.int32)[:, None]
+        escreve = self.destino[:, 0] >= 0
+        leitores = np.diff(self.inicio_leitores)
+        por_registrador = {}
+        for registrador in range(1, REGISTRADORES):
+            escritas = np.flatnonzero((self.destino == registrador).any(axis=1))
+            if len(escritas):
+                por_registrador[NOMES[registrador]] = {
+                    'escritas': len(escritas),
+                    'vida_media': float(vidas[escritas, self._slot(escritas, registrador)].mean()),
+                }
+        return {
+            'instrucoes': self.n,
+            'caminho_critico': self.caminho_critico(),
+            'ilp': self.ilp(),
+            'cadeia_mais_longa': len(self.cadeia_mais_longa()),
+            'escritas': int(escreve.sum()),
+            'escritas_sem_leitor': int((escreve & (leitores == 0)).sum()),
+            'leitores_por_escrita': float(leitores[escreve].mean()) if escreve.any() else 0.0,
+            'por_registrador': por_registrador,
+        }
+
+    def formata_relatorio(self) -> str:
+        r = self.relatorio()
+        linhas = [
+            f'Instruções: {r["instrucoes"]}',
+            f'Caminho crítico: {r["caminho_critico"]} ciclos (ILP {r["ilp"]:.2f})',
+            f'Cadeia mais longa: {r["cadeia_mais_longa"]} instruções',
+            f'Escritas: {r["escritas"]} ({r["escritas_sem_leitor"]} sem leitor, '
+            f'{r["leitores_por_escrita"]:.2f} leitores por escrita)',
+            '- Por registrador:',
+        ]
+        for nome, dados in r['por_registrador'].items():
+            linhas.append(f'\t{nome}: {dados["escritas"]} escritas, vida média {dados["vida_media"]:.1f}')
+        return '\n'.join(linhas) + '\n'
@@ -0,0 +1,183 @@
+import json
+from array import array
+from time import perf_counter_ns
+from types import MappingProxyType
+
+from decodificador_bruno_c_t_elias import (ID_NOME_ROM, NOMES_REGISTRADORES, ROM_CONTROLE, TIPO_POR_OPCODE,
+                                           VISAO_POR_MASCARA, DecodedInstruction, InstrType, Instruction,
+                                           MIPSDecoder)
+from perfis import PERFIS
+
+# Instrumentação opcional do MIPSDecoder. Fica desligada por padrão (MIPSDecoder.instrumentacao = None) e aí o
+# custo é só um "is None" por decodificação. Ligada, conta cada palavra decodificada por opcode, funct, tipo e
+# registrador e mede o tempo dos três estágios: extração dos campos, mnemônico e sinais de controle.
+# Todos os contadores são arrays pré-alocados; nada cresce durante a decodificação.
+#
+# Uso:
+#   decoder = MIPSDecoder(instrumentacao=DecoderInstrumentation())
+#   ...
+#   print(decoder.instrumentacao.formata())  # ou .to_json()
+
+ESTAGIOS = ('campos', 'mnemonico', 'sinais')
+
+# índice de cada tipo nos contadores (InstrType começa em 1)
+_TIPOS = tuple(InstrType)
+
+
+def _operandos(indice: int) -> tuple:
+    # registradores que a instrução usa de verdade, pelos PERFIS do perfis.py: (deslocamentos dos campos
+    # lidos, deslocamento do campo escrito) com 21 = rs, 16 = rt e 11 = rd. O $ra do jal não vem de campo
+    # nenhum e fica como -31. Instrução desconhecida não usa nada
+    if ID_NOME_ROM[indice] == 0:
+        return (), None
+    le_rs, le_rt, destino = PERFIS[indice][:3]
+    lidos = tuple(campo for usa, campo in ((le_rs, 21), (le_rt, 16)) if usa)
+    if destino == 'rd':
+        escrito = 11
+    elif destino == 'rt':
+        escrito = 16
+    else:
+        escrito = None if destino is None else -destino
+    return lidos, escrito
+
+
+# (opcode << 6) | funct -> (campos lidos, campo escrito)
+OPERANDOS = tuple(_operandos(i) for i in range(64 * 64))
+
+
+def _zeros(n: int) -> array:
+    return array('Q', bytes(8 * n))
+
+
+class DecoderInstrumentation:
+
+    def __init__(self, tempos: bool = True) -> None:
+        # tempos=False só conta (sem perf_counter e sem forçar o mnemônico, que normalmente é preguiçoso)
+        self.tempos = tempos
+        self.por_opcode = _zeros(64)
+        self.por_funct = _zeros(64)  # só das instruções R
+        self.por_tipo = _zeros(len(_TIPOS))
+        self.por_registrador = _zeros(32)  # quantas vezes cada registrador é lido ou escrito
+        self.tempo_ns = _zeros(len(ESTAGIOS))
+        self.chamadas = _zeros(len(ESTAGIOS))
+        self.desconhecidas = 0
+        self.total = 0
+
+    def reset(self) -> None:
+        for contadores in (self.por_opcode, self.por_funct, self.por_tipo, self.por_registrador,
+                           self.tempo_ns, self.chamadas):
+            for i in range(len(contadores)):
+                contadores[i] = 0
+        self.desconhecidas = 0
+        self.total = 0
+
+    def registra(self, word: int) -> None:
+        # conta uma palavra decodificada (direto dos bits, sem olhar o objeto da instrução). Registrador só
+        # conta quando a instrução lê ou escreve ele de verdade: jr não tem rt/rd, lui não lê rs, etc.
+        opcode = word >> 26
+        self.total += 1
+        self.por_opcode[opcode] += 1
+        tipo = TIPO_POR_OPCODE[opcode]
+        self.por_tipo[tipo.value - 1] += 1
+        if tipo is InstrType.R:
+            self.por_funct[word & 0x3F] += 1
+        indice = ((word >> 20) & 0xFC0) | (word & 0x3F)
+        if ID_NOME_ROM[indice] == 0:
+            self.desconhecidas += 1
+            return
+        lidos, escrito = OPERANDOS[indice]
+        registradores = self.por_registrador
+        for campo in lidos:
+            registradores[(word >> campo) & 31] += 1
+        if escrito is not None:
+            registrador = (word >> escrito) & 31 if escrito > 0 else -escrito
+            if registrador:  # escrita no $zero é descartada, não é uso
+                registradores[registrador] += 1
+
+    def _mede(self, word: int) -> tuple:
+        # decodifica passando pelos três estágios e soma o tempo de cada um
+        t0 = perf_counter_ns()
+        instr = Instruction.from_word(word)
+        t1 = perf_counter_ns()
+        instr.mnemonic
+        t2 = perf_counter_ns()
+        control = ROM_CONTROLE[(instr.opcode << 6) | instr.fields.get('funct', 0)]
+        t3 = perf_counter_ns()
+        tempo_ns = self.tempo_ns
+        tempo_ns[0] += t1 - t0
+        tempo_ns[1] += t2 - t1
+        tempo_ns[2] += t3 - t2
+        chamadas = self.chamadas
+        chamadas[0] += 1
+        chamadas[1] += 1
+        chamadas[2] += 1
+        return instr, control
+
+    def decodifica(self, word: int) -> Instruction:
+        # o que o MIPSDecoder.decode_word chama quando a instrumentação está ligada
+        word &= 0xFFFFFFFF
+        self.registra(word)
+        if not self.tempos:
+            return Instruction.from_word(word)
+        return self._mede(word)[0]
+
+    def decodifica_registro(self, word: int) -> DecodedInstruction:
+        # mesma coisa para o decode_cached quando a palavra não está no cache
+        word &= 0xFFFFFFFF
+        self.registra(word)
+        if not self.tempos:
+            return MIPSDecoder.decode_record(word)
+        instr, control = self._mede(word)
+        registro = DecodedInstruction(instr.word, instr.opcode, instr.type, instr.name,
+                                      MappingProxyType(instr.fields), control, VISAO_POR_MASCARA[control])
+        # o mnemônico já foi montado na medição, então aproveita
+        object.__setattr__(registro, '_mnemonic', instr.mnemonic)
+        return registro
+
+    def snapshot(self) -> dict:
+        # fotografia dos contadores naquele momento; só entra o que apareceu pelo menos uma vez
+        estagios = {}
+        for i, estagio in enumerate(ESTAGIOS):
+            chamadas = self.chamadas[i]
+            estagios[estagio] = {
+                'chamadas': chamadas,
+                'ns_total': self.tempo_ns[i],
+                'ns_medio': self.tempo_ns[i] / chamadas if chamadas else 0.0,
+            }
+        return {
+            'total': self.total,
+            'desconhecidas': self.desconhecidas,
+            'por_tipo': {tipo.name: self.por_tipo[i] for i, tipo in enumerate(_TIPOS)},
+            'por_opcode': {opcode: n for opcode, n in enumerate(self.por_opcode) if n},
+            'por_funct': {funct: n for funct, n in enumerate(self.por_funct) if n},
+            'por_registrador': {NOMES_REGISTRADORES[r]: n for r, n in enumerate(self.por_registrador) if n},
+            'estagios': estagios,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def formata(self, top: int = 10) -> str:
+        s = self.snapshot()
+        linhas = [
+            f'Decodificações: {s["total"]}',
+            f'Desconhecidas: {s["desconhecidas"]}',
+            '- Por tipo:',
+        ]
+        for tipo, n in s['por_tipo'].items():
+            linhas.append(f'\t{tipo}: {n}')
+        linhas.append('- Opcodes mais usados:')
+        for opcode, n in sorted(s['por_opcode'].items(), key=lambda item: item[1], reverse=True)[:top]:
+            nome = MIPSDecoder.OPCODES.get(opcode, ("Desconhecido", ""))[0]
+            linhas.append(f'\t{opcode:2d} ({nome}): {n}')
+        linhas.append('- Functs mais usados (tipo R):')
+        for funct, n in sorted(s['por_funct'].items(), key=lambda item: item[1], reverse=True)[:top]:
+            linhas.append(f'\t{funct:2d} ({MIPSDecoder.FUNCTIONS.get(funct, "Desconhecido")}): {n}')
+        linhas.append('- Registradores mais usados:')
+        for nome, n in sorted(s['por_registrador'].items(), key=lambda item: item[1], reverse=True)[:top]:
+            linhas.append(f'\t{nome}: {n}')
+        linhas.append('- Tempo por estágio:')
+        for estagio, dados in s['estagios'].items():
+            linhas.append(f'\t{estagio}: {dados["ns_total"]} ns em {dados["chamadas"]} chamadas '
+                          f'({dados["ns_medio"]:.1f} ns/chamada)')
+        return '\n'.join(linhas) + '\n'
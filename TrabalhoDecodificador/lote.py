@@ -0,0 +1,82 @@
+import numpy as np
+
+from decodificador_bruno_c_t_elias import ID_NOME, InstrType, MIPSDecoder, NOMES, ROM_CONTROLE, SINAIS, TIPO_POR_OPCODE
+
+# Decodificação em lote: em vez de criar um objeto Instruction por palavra, pega um array
+# uint32 inteiro e tira todos os campos de uma vez com operações vetorizadas do NumPy.
+
+# para cada opcode (tipo I/J) e cada funct (tipo R), o índice do nome dentro de NOMES
+ID_POR_OPCODE = np.array([ID_NOME.get(MIPSDecoder.OPCODES.get(op, ("Desconhecido", ""))[0], 0)
+                          for op in range(64)], dtype=np.uint8)
+ID_POR_FUNCT = np.array([ID_NOME[MIPSDecoder.FUNCTIONS.get(f, "Desconhecido")] for f in range(64)],
+                        dtype=np.uint8)
+# tipo (valor do InstrType) de cada opcode, mesma regra do Instruction
+TIPO_POR_OPCODE_NP = np.array([t.value for t in TIPO_POR_OPCODE], dtype=np.uint8)
+NOMES_NP = np.array(NOMES, dtype=object)
+# a mesma ROM de controle do decodificador, indexada por (opcode << 6) | funct
+ROM_CONTROLE_NP = np.array(ROM_CONTROLE, dtype=np.uint8)
+
+
+def _dtype(endian: str) -> np.dtype:
+    if endian in ('big', '>'):
+        return np.dtype('>u4')
+    if endian in ('little', '<'):
+        return np.dtype('<u4')
+    raise ValueError(f'endianness inválida: {endian!r} (use "big" ou "little")')
+
+
+def mapeia_arquivo(caminho: str, endian: str = 'big') -> np.ndarray:
+    # abre o arquivo binário cru como um array de palavras de 32 bits sem copiar nada pra memória.
+    # se o tamanho não for múltiplo de 4 os bytes que sobram no final são ignorados
+    dtype = _dtype(endian)
+    with open(caminho, 'rb') as f:
+        tamanho = f.seek(0, 2)
+    n = tamanho // 4
+    if n == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(caminho, dtype=dtype, mode='r', shape=(n,))
+
+
+def decodifica_lote(palavras) -> dict:
+    # recebe qualquer sequência/array de palavras e devolve um dicionário de arrays, um por campo.
+    # todos os campos são extraídos para todas as palavras; o 'type' diz quais fazem sentido (igual ao get_fields)
+    w = np.asarray(palavras).astype(np.uint32, copy=False)
+    opcode = (w >> 26).astype(np.uint8)
+    funct = (w & 0x3F).astype(np.uint8)
+    tipo = TIPO_POR_OPCODE_NP[opcode]
+    nome = np.where(tipo == InstrType.R.value, ID_POR_FUNCT[funct], ID_POR_OPCODE[opcode])
+    return {
+        "word": w,
+        "opcode": opcode,
+        "rs": ((w >> 21) & 0x1F).astype(np.uint8),
+        "rt": ((w >> 16) & 0x1F).astype(np.uint8),
+        "rd": ((w >> 11) & 0x1F).astype(np.uint8),
+        "shamt": ((w >> 6) & 0x1F).astype(np.uint8),
+        "funct": funct,
+        "immediate": (w & 0xFFFF).astype(np.uint16),
+        "address": w & 0x3FFFFFF,
+        "type": tipo,
+        "name": nome,
+        "control": ROM_CONTROLE_NP[(opcode.astype(np.uint16) << 6) | funct],
+    }
+
+
+def decodifica_arquivo(caminho: str, endian: str = 'big') -> dict:
+    # mapeia o arquivo e decodifica tudo numa passada só
+    return decodifica_lote(mapeia_arquivo(caminho, endian))
+
+
+def nomes(ids) -> np.ndarray:
+    # converte os índices da coluna 'name' nos nomes das instruções
+    return NOMES_NP[np.asarray(ids)]
+
+
+def sinais_de_controle_lote(palavras) -> np.ndarray:
+    # versão vetorizada do get_sinais_empacotados: um uint8 com os 8 sinais para cada palavra
+    w = np.asarray(palavras).astype(np.uint32, copy=False)
+    return ROM_CONTROLE_NP[((w >> 20) & 0xFC0) | (w & 0x3F)]
+
+
+def sinal(mascaras, nome: str) -> np.ndarray:
+    # tira um sinal só (ex.: 'MemRead') de um array de máscaras, como array de bool
+    return (np.asarray(mascaras) >> SINAIS.index(nome)) & 1 == 1
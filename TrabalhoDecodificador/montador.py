@@ -0,0 +1,195 @@
+import re
+from array import array
+
+from decodificador_bruno_c_t_elias import INDICE_REGISTRADOR, MIPSDecoder, parse_int
+
+# Montador: o caminho contrário do decodificador. As tabelas OPCODES, FUNCTIONS e MNEMONIC_FORMATS são
+# invertidas uma vez só quando o módulo carrega, e cada instrução ganha um "molde" com os bits fixos
+# (opcode/funct) e a lista de operandos na ordem em que aparecem no formato do mnemônico.
+# Assim o texto que o decodificador gera volta exatamente para a mesma palavra.
+
+
+class AssemblyError(ValueError):
+    pass
+
+
+# registradores: os nomes do MIPSDecoder.REGISTERS, os números ($0..$31) e o apelido $fp do $s8
+REGISTRADORES = dict(INDICE_REGISTRADOR)
+REGISTRADORES.update({f'${i}': i for i in range(32)})
+REGISTRADORES['$fp'] = 30
+
+# placeholder do formato -> (deslocamento do campo, quantidade de bits)
+_CAMPOS = {
+    'rs': (21, 5),
+    'rt': (16, 5),
+    'rd': (11, 5),
+    'shamt': (6, 5),
+    'imm': (0, 16),
+    'label': (0, 16),
+}
+
+
+def _molde(formato: str, opcode: int, funct: int, tipo: str) -> tuple:
+    # (bits fixos, [(placeholder, deslocamento, bits), ...] na ordem dos operandos no texto)
+    operandos = []
+    for placeholder in re.findall(r'<(\w+)>', formato):
+        if placeholder == 'instr':
+            continue
+        if tipo == 'J':
+            operandos.append(('address', 0, 26))
+        else:
+            deslocamento, bits = _CAMPOS[placeholder]
+            operandos.append((placeholder, deslocamento, bits))
+    return (opcode << 26) | funct, operandos
+
+
+# REGIMM (opcode 1): a variante do desvio vem no campo rt, que é fixo e não operando. O decodificador só
+# conhece o bgez, mas a tabela já deixa lugar pro bltz/bgezal/bltzal se entrarem no OPCODES
+_RT_REGIMM = {'bltz': 0, 'bgez': 1, 'bltzal': 16, 'bgezal': 17}
+
+
+def _monta_moldes() -> dict:
+    moldes = {}
+    for funct, nome in MIPSDecoder.FUNCTIONS.items():
+        formato = MIPSDecoder.MNEMONIC_FORMATS.get(nome, "<instr> <rd>, <rs>, <rt>")
+        moldes[nome] = _molde(formato, 0, funct, 'R')
+    for opcode, (nome, formato) in MIPSDecoder.OPCODES.items():
+        if opcode == 0:
+            continue
+        fixos, operandos = _molde(formato, opcode, 0, 'J' if opcode in (2, 3) else 'I')
+        if opcode == 1:
+            fixos |= _RT_REGIMM[nome] << 16
+        moldes[nome] = fixos, operandos
+    return moldes
+
+
+# nome da instrução -> molde
+MOLDES = _monta_moldes()
+
+
+def _numero(texto: str) -> int:
+    # aceita o que o parse_int aceita e também número negativo em hexa/binário/octal (-0x10)
+    try:
+        return int(texto, 0)
+    except ValueError:
+        pass
+    try:
+        return parse_int(texto)
+    except ValueError:
+        raise AssemblyError(f'número inválido: {texto!r}') from None
+
+
+# "rt, imm(rs)": tudo antes do último '(' mais o registrador entre parênteses, sem outro parêntese em volta
+_BASE = re.compile(r'([^()]*)\(([^()]*)\)\s*')
+
+
+def _separa(linha: str) -> tuple:
+    # tira comentário e rótulos; devolve ([rótulos], mnemônico, [operandos])
+    comentario = linha.find('#')
+    if comentario != -1:
+        linha = linha[:comentario]
+    linha = linha.strip()
+    rotulos = []
+    while True:
+        dois_pontos = linha.find(':')
+        if dois_pontos == -1:
+            break
+        rotulos.append(linha[:dois_pontos].strip())
+        linha = linha[dois_pontos + 1:].strip()
+    if not linha:
+        return rotulos, None, []
+    # separa o mnemônico do resto em qualquer espaço em branco (espaço ou tab, como no .s de verdade)
+    mnemonico, *resto = linha.split(None, 1)
+    resto = resto[0].strip() if resto else ''
+    if '(' in resto or ')' in resto:
+        # só o "imm(registrador)" no fim da linha, com os parênteses fechando certinho
+        base = _BASE.fullmatch(resto)
+        if base is None:
+            raise AssemblyError(f'parênteses inválidos: {resto!r}')
+        resto = f'{base.group(1)},{base.group(2)}'
+    operandos = [operando.strip() for operando in resto.split(',')] if resto else []
+    return rotulos, mnemonico.lower(), operandos
+
+
+def _codifica(mnemonico: str, operandos: list, pc: int, rotulos: dict) -> int:
+    if mnemonico == '.word':
+        if len(operandos) != 1:
+            raise AssemblyError('.word espera um valor')
+        return _numero(operandos[0]) & 0xFFFFFFFF
+    molde = MOLDES.get(mnemonico)
+    if molde is None:
+        raise AssemblyError(f'instrução desconhecida: {mnemonico!r}')
+    palavra, campos = molde
+    if len(operandos) != len(campos):
+        raise AssemblyError(f'{mnemonico} espera {len(campos)} operando(s), veio {len(operandos)}')
+    for operando, (campo, deslocamento, bits) in zip(operandos, campos):
+        if not operando and campo == 'imm':
+            operando = '0'  # "($sp)" sem deslocamento
+        if not operando:
+            raise AssemblyError(f'{mnemonico}: operando vazio')
+        if operando.startswith('$'):
+            if campo not in ('rs', 'rt', 'rd'):
+                raise AssemblyError(f'{mnemonico}: esperava número ou rótulo, veio {operando!r}')
+            try:
+                valor = REGISTRADORES[operando]
+            except KeyError:
+                raise AssemblyError(f'registrador desconhecido: {operando!r}') from None
+        elif campo in ('rs', 'rt', 'rd'):
+            raise AssemblyError(f'{mnemonico}: esperava registrador, veio {operando!r}')
+        elif operando[0].isdigit() or operando[0] in '+-':
+            # número é o valor cru do campo (é o que o decodificador mostra); negativo vira complemento de 2
+            valor = _numero(operando)
+            if not -(1 << (bits - 1)) <= valor < (1 << bits) or (campo == 'shamt' and valor < 0):
+                raise AssemblyError(f'{mnemonico}: {operando} não cabe em {bits} bits')
+            valor &= (1 << bits) - 1
+        else:
+            # rótulo: desvio é relativo ao pc + 4 em palavras, salto é o endereço absoluto / 4
+            try:
+                alvo = rotulos[operando]
+            except KeyError:
+                raise AssemblyError(f'rótulo não definido: {operando!r}') from None
+            if campo == 'address':
+                valor = (alvo >> 2) & 0x3FFFFFF
+            else:
+                deslocamento_desvio = (alvo - (pc + 4)) >> 2
+                if not -0x8000 <= deslocamento_desvio < 0x8000:
+                    raise AssemblyError(f'{mnemonico}: rótulo {operando!r} longe demais para um desvio')
+                valor = deslocamento_desvio & 0xFFFF
+        palavra |= valor << deslocamento
+    return palavra
+
+
+def assemble_line(linha: str, pc: int = 0, rotulos: dict = None) -> int:
+    # monta uma instrução só (sem rótulo no começo)
+    _, mnemonico, operandos = _separa(linha)
+    if mnemonico is None:
+        raise AssemblyError('linha sem instrução')
+    return _codifica(mnemonico, operandos, pc, rotulos or {})
+
+
+def assemble(linhas, base: int = 0) -> array:
+    # monta um programa inteiro em duas passadas (primeiro acha os rótulos, depois codifica).
+    # linhas pode ser um texto ou qualquer iterável de linhas. Diretivas começando com '.' são ignoradas,
+    # menos o .word. Devolve um array de palavras de 32 bits
+    if isinstance(linhas, str):
+        linhas = linhas.splitlines()
+    rotulos = {}
+    instrucoes = []
+    pc = base
+    for numero, linha in enumerate(linhas, 1):
+        nomes, mnemonico, operandos = _separa(linha)
+        for nome in nomes:
+            if nome in rotulos:
+                raise AssemblyError(f'linha {numero}: rótulo {nome!r} definido duas vezes')
+            rotulos[nome] = pc
+        if mnemonico is None or (mnemonico.startswith('.') and mnemonico != '.word'):
+            continue
+        instrucoes.append((numero, mnemonico, operandos, pc))
+        pc += 4
+    palavras = array('I')
+    for numero, mnemonico, operandos, pc in instrucoes:
+        try:
+            palavras.append(_codifica(mnemonico, operandos, pc, rotulos))
+        except AssemblyError as erro:
+            raise AssemblyError(f'linha {numero}: {erro}') from None
+    return palavras
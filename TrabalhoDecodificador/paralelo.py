@@ -0,0 +1,187 @@
+import io
+import os
+from array import array
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+import lote
+from decodificador_bruno_c_t_elias import parse_int
+from programa import COLUNAS, DecodedProgram
+from saida import TAMANHO_BUFFER, get_writer
+
+# Decodificação em vários processos. As palavras ficam num bloco de memória compartilhada e cada processo
+# decodifica um pedaço dele (com o mesmo lote.decodifica_lote do caminho serial) e escreve as colunas do
+# resultado em outro bloco compartilhado, no lugar certo. Assim nada de lista grande passa por pickle.
+
+TAMANHO_BLOCO = 1 << 20  # palavras por tarefa
+
+# estado de cada processo trabalhador, preenchido pelo _inicializa
+_entrada = None
+_saida = None
+_colunas_entrada = None
+_colunas_saida = None
+
+
+def _layout_saida(n: int) -> tuple:
+    # posição (offset) de cada coluna dentro do bloco de saída, alinhada em 4 bytes
+    offsets = {}
+    total = 0
+    for coluna, typecode in COLUNAS.items():
+        offsets[coluna] = total
+        total += (array(typecode).itemsize * n + 3) & ~3
+    return offsets, max(total, 1)
+
+
+def _views_saida(shm: SharedMemory, n: int) -> dict:
+    offsets, _ = _layout_saida(n)
+    return {coluna: np.ndarray((n,), dtype=np.dtype(typecode), buffer=shm.buf, offset=offsets[coluna])
+            for coluna, typecode in COLUNAS.items()}
+
+
+def _inicializa(nome_entrada: str, nome_saida: str, n: int) -> None:
+    global _entrada, _saida, _colunas_entrada, _colunas_saida
+    _entrada = SharedMemory(name=nome_entrada)
+    _saida = SharedMemory(name=nome_saida)
+    _colunas_entrada = np.ndarray((n,), dtype=np.uint32, buffer=_entrada.buf)
+    _colunas_saida = _views_saida(_saida, n)
+
+
+def _decodifica_bloco(intervalo: tuple) -> int:
+    inicio, fim = intervalo
+    colunas = lote.decodifica_lote(_colunas_entrada[inicio:fim])
+    for coluna, destino in _colunas_saida.items():
+        destino[inicio:fim] = colunas[coluna]
+    return fim - inicio
+
+
+def _programa_do_bloco(colunas: dict, inicio: int, fim: int, base: int) -> DecodedProgram:
+    programa = DecodedProgram(base + 4 * inicio)
+    for coluna in COLUNAS:
+        getattr(programa, coluna).frombytes(colunas[coluna][inicio:fim].tobytes())
+    return programa
+
+
+def _formata_bloco(tarefa: tuple) -> str:
+    # monta o texto de um bloco já decodificado usando o escritor do formato pedido, sem cabeçalho
+    inicio, fim, base, formato = tarefa
+    programa = _programa_do_bloco(_colunas_saida, inicio, fim, base)
+    destino = io.StringIO()
+    with get_writer(formato, destino, cabecalho=False) as writer:
+        writer.write_all(programa)
+    return destino.getvalue()
+
+
+def _le_texto_bloco(intervalo: tuple) -> bytes:
+    # lê um pedaço do arquivo texto (já alinhado em fim de linha) e converte cada número com o parse_int
+    caminho, inicio, fim = intervalo
+    with open(caminho, 'rb') as f:
+        f.seek(inicio)
+        dados = f.read(fim - inicio)
+    palavras = array('I', (parse_int(token) & 0xFFFFFFFF for token in dados.decode('ascii').split()))
+    return palavras.tobytes()
+
+
+def _intervalos_texto(caminho: str, partes: int) -> list:
+    # divide o arquivo em pedaços de tamanho parecido, empurrando cada corte até o próximo '\n'
+    tamanho = os.path.getsize(caminho)
+    cortes = [0]
+    with open(caminho, 'rb') as f:
+        for i in range(1, partes):
+            posicao = max(tamanho * i // partes, cortes[-1])
+            f.seek(posicao)
+            f.readline()
+            cortes.append(min(f.tell(), tamanho))
+    cortes.append(tamanho)
+    return [(caminho, inicio, fim) for inicio, fim in zip(cortes, cortes[1:]) if fim > inicio]
+
+
+class _Execucao:
+    # junta a criação dos blocos compartilhados, do pool e a limpeza no final
+
+    def __init__(self, entrada, formato_entrada: str, endian: str, processos: int, tamanho_bloco: int) -> None:
+        self.processos = processos or os.cpu_count() or 1
+        self.tamanho_bloco = tamanho_bloco
+        self.contexto = get_context()
+        self.entrada = None
+        self.saida = None
+        self.pool = None
+        try:
+            self._carrega_entrada(entrada, formato_entrada, endian)
+        except BaseException:
+            self.fecha()
+            raise
+
+    def _carrega_entrada(self, entrada, formato_entrada: str, endian: str) -> None:
+        if formato_entrada == 'texto':
+            with self.contexto.Pool(self.processos) as pool:
+                pedacos = pool.map(_le_texto_bloco, _intervalos_texto(entrada, self.processos * 4))
+            self.n = sum(len(pedaco) for pedaco in pedacos) // 4
+            self.entrada = SharedMemory(create=True, size=max(self.n * 4, 1))
+            posicao = 0
+            for pedaco in pedacos:
+                self.entrada.buf[posicao:posicao + len(pedaco)] = pedaco
+                posicao += len(pedaco)
+        else:
+            if formato_entrada == 'bin':
+                palavras = lote.mapeia_arquivo(entrada, endian)
+            elif formato_entrada == 'palavras':
+                palavras = np.asarray(entrada)
+            else:
+                raise ValueError(f'formato de entrada desconhecido: {formato_entrada!r} (use bin, texto ou palavras)')
+            self.n = len(palavras)
+            self.entrada = SharedMemory(create=True, size=max(self.n * 4, 1))
+            destino = np.ndarray((self.n,), dtype=np.uint32, buffer=self.entrada.buf)
+            destino[:] = palavras  # converte a ordem dos bytes se precisar
+            del destino
+        self.saida = SharedMemory(create=True, size=_layout_saida(self.n)[1])
+        self.pool = self.contexto.Pool(self.processos, initializer=_inicializa,
+                                       initargs=(self.entrada.name, self.saida.name, self.n))
+
+    def intervalos(self) -> list:
+        return [(inicio, min(inicio + self.tamanho_bloco, self.n)) for inicio in range(0, self.n, self.tamanho_bloco)]
+
+    def decodifica(self) -> None:
+        for _ in self.pool.imap_unordered(_decodifica_bloco, self.intervalos()):
+            pass
+
+    def fecha(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+        for shm in (self.entrada, self.saida):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+def decodifica_paralelo(entrada, formato_entrada: str = 'bin', endian: str = 'big', base: int = 0,
+                        processos: int = None, tamanho_bloco: int = TAMANHO_BLOCO) -> DecodedProgram:
+    # entrada é um caminho (formato 'bin' = binário cru, 'texto' = um número por linha em qualquer base do
+    # parse_int) ou uma sequência de palavras (formato 'palavras'). Devolve o programa na ordem original
+    execucao = _Execucao(entrada, formato_entrada, endian, processos, tamanho_bloco)
+    try:
+        execucao.decodifica()
+        colunas = _views_saida(execucao.saida, execucao.n)
+        programa = _programa_do_bloco(colunas, 0, execucao.n, base)
+        del colunas
+        return programa
+    finally:
+        execucao.fecha()
+
+
+def escreve_paralelo(entrada, formato_saida: str, destino=None, formato_entrada: str = 'bin', endian: str = 'big',
+                     base: int = 0, processos: int = None, tamanho_bloco: int = TAMANHO_BLOCO) -> int:
+    # decodifica em paralelo e também formata em paralelo; os blocos de texto chegam na ordem original
+    # e vão direto pro escritor. Devolve quantas instruções foram escritas
+    execucao = _Execucao(entrada, formato_entrada, endian, processos, tamanho_bloco)
+    try:
+        execucao.decodifica()
+        tarefas = [(inicio, fim, base, formato_saida) for inicio, fim in execucao.intervalos()]
+        with get_writer(formato_saida, destino, TAMANHO_BUFFER) as writer:
+            for texto in execucao.pool.imap(_formata_bloco, tarefas):
+                writer.write_text(texto)
+        return execucao.n
+    finally:
+        execucao.fecha()
@@ -0,0 +1,69 @@
+from decodificador_bruno_c_t_elias import NOMES, ID_NOME_ROM, ROM_CONTROLE, SINAIS, TIPO_POR_OPCODE, InstrType
+
+# Perfil de cada instrução: quais registradores ela lê e escreve, se é load e se mexe no fluxo de controle.
+# Sai dos sinais da ROM de controle (RegDst/RegWrite/MemRead/...) e do formato de cada tipo, e é usado pelo
+# modelo de tempo (pipeline.py), pelo índice de dependências (dependencias.py) e pela instrumentação do
+# decodificador (instrumentacao.py), sem que um dependa do outro.
+
+HI, LO = 32, 33  # HI e LO entram como registradores extras pra pegar a dependência mult -> mfhi
+
+_BIT = {nome: 1 << i for i, nome in enumerate(SINAIS)}
+
+
+def _perfil(indice: int) -> tuple:
+    # o que cada (opcode << 6) | funct lê e escreve:
+    # (lê rs, lê rt, destino: 'rd'/'rt'/31/None, escreve HI, escreve LO, lê HI ou LO ou None, é load,
+    #  tipo de controle). mult/div escrevem os dois, mthi só o HI e mtlo só o LO
+    opcode, funct = indice >> 6, indice & 0x3F
+    nome = NOMES[ID_NOME_ROM[indice]]
+    controle = ROM_CONTROLE[indice]
+    tipo = TIPO_POR_OPCODE[opcode]
+    le_rs = le_rt = False
+    destino = None
+    escreve_hi = escreve_lo = False
+    le_hilo = None
+    if tipo == InstrType.R:
+        le_rs = nome not in ('sll', 'srl', 'sra', 'mfhi', 'mflo', 'syscall', 'break')
+        le_rt = nome not in ('jr', 'jalr', 'mfhi', 'mflo', 'mthi', 'mtlo', 'syscall', 'break')
+        escreve_hi = nome in ('mult', 'multu', 'div', 'divu', 'mthi')
+        escreve_lo = nome in ('mult', 'multu', 'div', 'divu', 'mtlo')
+        le_hilo = HI if nome == 'mfhi' else LO if nome == 'mflo' else None
+    elif tipo == InstrType.I:
+        le_rs = nome != 'lui'
+        # stores e beq/bne também leem o rt
+        le_rt = bool(controle & _BIT['MemWrite']) or nome in ('beq', 'bne')
+    if controle & _BIT['RegWrite']:
+        destino = 31 if nome == 'jal' else 'rd' if controle & _BIT['RegDst'] else 'rt'
+    if nome in ('lwc1', 'swc1'):
+        # mexem no banco do coprocessador, não no rt dos inteiros
+        destino = None
+        le_rt = False
+    if controle & _BIT['Jump']:
+        controle_fluxo = 'jump'
+    elif controle & _BIT['Branch']:
+        controle_fluxo = 'branch'
+    else:
+        controle_fluxo = None
+    return (le_rs, le_rt, destino, escreve_hi, escreve_lo, le_hilo, bool(controle & _BIT['MemRead']),
+            controle_fluxo)
+
+
+PERFIS = tuple(_perfil(i) for i in range(64 * 64))
+
+
+# acesso à memória de cada (opcode << 6) | funct: pelo MemRead/MemWrite da ROM, mais lwc1/swc1, que não têm
+# sinais na tabela do decodificador (mexem no coprocessador) mas leem e escrevem memória do mesmo jeito
+LE_MEMORIA, ESCREVE_MEMORIA = 1, 2
+
+
+def _acesso_memoria(indice: int) -> int:
+    nome = NOMES[ID_NOME_ROM[indice]]
+    controle = ROM_CONTROLE[indice]
+    if controle & _BIT['MemWrite'] or nome == 'swc1':
+        return ESCREVE_MEMORIA
+    if controle & _BIT['MemRead'] or nome == 'lwc1':
+        return LE_MEMORIA
+    return 0
+
+
+ACESSO_MEMORIA = tuple(_acesso_memoria(i) for i in range(64 * 64))
@@ -0,0 +1,130 @@
+from perfis import HI, LO, PERFIS
+
+# Modelo de tempo do pipeline clássico de 5 estágios (IF/ID/EX/MEM/WB), em ordem, uma instrução por ciclo.
+# Ele anda pelo trace (pc, palavra, próximo pc, ...) uma instrução por vez e guarda só um estado fixo:
+# o ciclo em que cada registrador fica pronto e o ciclo de EX da instrução anterior. Com isso calcula
+# as bolhas de dependência (RAW, load-use) e os ciclos perdidos com desvio/salto tomado.
+#
+# Regra usada: a instrução k entra em EX no ciclo ex_k >= ex_(k-1) + 1 (+ penalidade de flush).
+# Um produtor que entra em EX no ciclo t deixa o valor pronto para o EX de quem consome em t + latência:
+#   com forwarding: ALU = 1, load = 2 (a famosa bolha de load-use)
+#   sem forwarding: 3 (espera o WB e lê o banco na segunda metade do ciclo)
+# Desvio resolvido em ID precisa dos operandos um ciclo antes do EX.
+
+CAUSAS = ('load_use', 'raw', 'branch', 'jump')
+
+
+class PipelineModel:
+
+    def __init__(self, forwarding: bool = True, desvio_em: str = 'EX') -> None:
+        # desvio_em: estágio onde beq/bne/bgez/... são resolvidos ('ID' ou 'EX'). Saltos (j, jal, jr, jalr)
+        # são resolvidos em ID. A previsão é sempre "não tomado": só o que desvia de verdade paga o flush
+        if desvio_em not in ('ID', 'EX'):
+            raise ValueError(f'desvio_em deve ser "ID" ou "EX", não {desvio_em!r}')
+        self.forwarding = forwarding
+        self.desvio_em = desvio_em
+        self.latencia_alu = 1 if forwarding else 3
+        self.latencia_load = 2 if forwarding else 3
+        self.penalidade_branch = 1 if desvio_em == 'ID' else 2
+        self.penalidade_jump = 1
+        # ciclo de EX a partir do qual o valor de cada registrador (0..31, HI, LO) pode ser usado
+        self.pronto = [0] * 34
+        # e se quem produziu foi uma load (pra separar load-use de RAW comum)
+        self.produtor_load = [False] * 34
+        self.ex_anterior = 2  # a primeira instrução entra em EX no ciclo 3
+        self.flush_pendente = 0
+        self.instrucoes = 0
+        self.stalls = dict.fromkeys(CAUSAS, 0)
+        self.por_pc = {}
+
+    def _conta(self, pc: int, causa: str, ciclos: int) -> None:
+        self.stalls[causa] += ciclos
+        contadores = self.por_pc.get(pc)
+        if contadores is None:
+            contadores = self.por_pc[pc] = dict.fromkeys(CAUSAS, 0)
+        contadores[causa] += ciclos
+
+    def consome(self, pc: int, word: int, proximo_pc: int) -> None:
+        le_rs, le_rt, destino, escreve_hi, escreve_lo, le_hilo, load, controle_fluxo = \
+            PERFIS[((word >> 20) & 0xFC0) | (word & 0x3F)]
+        pronto = self.pronto
+        ex = self.ex_anterior + 1 + self.flush_pendente
+        self.flush_pendente = 0
+
+        # operandos: desvio resolvido em ID (ou salto por registrador) precisa deles um ciclo antes
+        extra = 1 if controle_fluxo is not None and self.forwarding and \
+            (controle_fluxo == 'jump' or self.desvio_em == 'ID') else 0
+        necessario = ex
+        do_load = False
+        for usa, registrador in ((le_rs, (word >> 21) & 31), (le_rt, (word >> 16) & 31), (le_hilo, le_hilo)):
+            if usa and registrador:
+                precisa = pronto[registrador] + extra
+                if precisa > necessario:
+                    necessario = precisa
+                    do_load = self.produtor_load[registrador]
+        if necessario > ex:
+            self._conta(pc, 'load_use' if do_load else 'raw', necessario - ex)
+            ex = necessario
+
+        if destino is not None:
+            registrador = (word >> 11) & 31 if destino == 'rd' else (word >> 16) & 31 if destino == 'rt' else destino
+            if registrador:
+                pronto[registrador] = ex + (self.latencia_load if load else self.latencia_alu)
+                self.produtor_load[registrador] = load
+        if escreve_hi:
+            pronto[HI] = ex + self.latencia_alu
+            self.produtor_load[HI] = False
+        if escreve_lo:
+            pronto[LO] = ex + self.latencia_alu
+            self.produtor_load[LO] = False
+
+        # desvio tomado ou salto: as instruções buscadas atrás dele são descartadas
+        if controle_fluxo is not None and proximo_pc != pc + 4:
+            if controle_fluxo == 'branch':
+                self.flush_pendente = self.penalidade_branch
+            else:
+                self.flush_pendente = self.penalidade_jump
+            self._conta(pc, controle_fluxo, self.flush_pendente)
+
+        self.ex_anterior = ex
+        self.instrucoes += 1
+
+    def processa(self, trace) -> dict:
+        # trace: qualquer iterável de tuplas que comecem com (pc, palavra, próximo pc), ex.: MIPSSimulator.rastreia()
+        consome = self.consome
+        for evento in trace:
+            consome(evento[0], evento[1], evento[2])
+        return self.relatorio()
+
+    def ciclos(self) -> int:
+        # a última instrução ainda passa por MEM e WB depois do EX; o flush de um desvio no fim não conta
+        if self.instrucoes == 0:
+            return 0
+        return self.ex_anterior + 2
+
+    def relatorio(self) -> dict:
+        ciclos = self.ciclos()
+        return {
+            'instrucoes': self.instrucoes,
+            'ciclos': ciclos,
+            'cpi': ciclos / self.instrucoes if self.instrucoes else 0.0,
+            'stalls': dict(self.stalls),
+            'por_pc': {pc: dict(contadores) for pc, contadores in self.por_pc.items()},
+        }
+
+    def formata_relatorio(self, top: int = 10) -> str:
+        r = self.relatorio()
+        linhas = [
+            f'Instruções: {r["instrucoes"]}',
+            f'Ciclos: {r["ciclos"]}',
+            f'CPI: {r["cpi"]:.3f}',
+            '- Ciclos perdidos por causa:',
+        ]
+        for causa, ciclos in r['stalls'].items():
+            linhas.append(f'\t{causa}: {ciclos}')
+        linhas.append(f'- Endereços que mais perdem ciclos:')
+        piores = sorted(r['por_pc'].items(), key=lambda item: sum(item[1].values()), reverse=True)[:top]
+        for pc, contadores in piores:
+            detalhe = ', '.join(f'{causa}={ciclos}' for causa, ciclos in contadores.items() if ciclos)
+            linhas.append(f'\t0x{pc:08x}: {sum(contadores.values())} ({detalhe})')
+        return '\n'.join(linhas) + '\n'
@@ -0,0 +1,307 @@
+from array import array
+
+from decodificador_bruno_c_t_elias import ID_NOME_ROM, NOMES, ROM_CONTROLE, SINAIS
+
+# Avaliação de preditores de desvio guiada por trace. Os sinais Branch e Jump da ROM de controle dizem quais
+# instruções mudam o fluxo; o motor anda pelo trace (pc, palavra, próximo pc, ...) uma vez só e passa cada
+# desvio/salto por várias configurações ao mesmo tempo, cada uma com seu preditor de direção e, se quiser,
+# BTB e pilha de endereços de retorno (RAS).
+#
+# Custo em ciclos, com os mesmos números do pipeline.py (desvio resolvido em EX, salto em ID):
+#   - direção errada de um desvio condicional: penalidade_desvio (2)
+#   - desvio tomado ou salto sem o alvo certo já na busca (sem BTB/RAS ou errado): penalidade_alvo (1)
+# O preditor estático "não tomado" sem BTB dá exatamente as bolhas de desvio/salto do PipelineModel.
+
+DESVIO, SALTO, CHAMADA, INDIRETO, CHAMADA_INDIRETA = range(1, 6)
+
+_BRANCH = 1 << SINAIS.index('Branch')
+_JUMP = 1 << SINAIS.index('Jump')
+_SALTOS = {'j': SALTO, 'jal': CHAMADA, 'jr': INDIRETO, 'jalr': CHAMADA_INDIRETA}
+
+
+def _tipo(indice: int) -> int:
+    controle = ROM_CONTROLE[indice]
+    if controle & _BRANCH:
+        return DESVIO
+    if controle & _JUMP:
+        return _SALTOS[NOMES[ID_NOME_ROM[indice]]]
+    return 0
+
+
+# tipo de transferência de controle por (opcode << 6) | funct (0 = não mexe no fluxo)
+TIPO_CONTROLE = bytes(_tipo(i) for i in range(64 * 64))
+
+
+def _potencia_de_2(valor: int) -> int:
+    if valor <= 0 or valor & (valor - 1):
+        raise ValueError(f'quantidade de entradas precisa ser potência de 2, não {valor}')
+    return valor - 1
+
+
+# ---------------------------------------------------------------- preditores de direção
+
+
+class Predictor:
+    # interface: preve() diz se o desvio em pc (com destino alvo) vai ser tomado; atualiza() ensina o resultado
+
+    nome = 'preditor'
+
+    def preve(self, pc: int, alvo: int) -> bool:
+        raise NotImplementedError
+
+    def atualiza(self, pc: int, alvo: int, tomado: bool) -> None:
+        pass
+
+
+class StaticPredictor(Predictor):
+
+    MODOS = ('nao_tomado', 'tomado', 'btfn')
+
+    def __init__(self, modo: str = 'nao_tomado') -> None:
+        # btfn: para trás tomado, para frente não tomado (bom pra laço)
+        if modo not in self.MODOS:
+            raise ValueError(f'modo desconhecido: {modo!r} (use {", ".join(self.MODOS)})')
+        self.modo = modo
+        self.nome = f'estatico-{modo}'
+
+    def preve(self, pc: int, alvo: int) -> bool:
+        if self.modo == 'btfn':
+            return alvo <= pc
+        return self.modo == 'tomado'
+
+
+class BimodalPredictor(Predictor):
+
+    def __init__(self, entradas: int = 4096, bits: int = 2) -> None:
+        # tabela de contadores saturados indexada pelo pc; bits=1 é o "último resultado", bits=2 o clássico
+        if bits not in (1, 2):
+            raise ValueError(f'bits deve ser 1 ou 2, não {bits}')
+        self._mascara = _potencia_de_2(entradas)
+        self._maximo = (1 << bits) - 1
+        self._limiar = 1 << (bits - 1)
+        self.contadores = bytearray([self._limiar - 1]) * entradas  # começa em "fracamente não tomado"
+        self.nome = f'bimodal-{bits}bit-{entradas}'
+
+    def preve(self, pc: int, alvo: int) -> bool:
+        return self.contadores[(pc >> 2) & self._mascara] >= self._limiar
+
+    def atualiza(self, pc: int, alvo: int, tomado: bool) -> None:
+        i = (pc >> 2) & self._mascara
+        c = self.contadores[i]
+        if tomado:
+            if c < self._maximo:
+                self.contadores[i] = c + 1
+        elif c:
+            self.contadores[i] = c - 1
+
+
+class GSharePredictor(Predictor):
+
+    def __init__(self, entradas: int = 4096, historia: int = 12) -> None:
+        # contadores de 2 bits indexados pelo pc xor a história global dos últimos desvios
+        self._mascara = _potencia_de_2(entradas)
+        self._mascara_historia = (1 << historia) - 1
+        self.historia = 0
+        self.contadores = bytearray([1]) * entradas
+        self.nome = f'gshare-{entradas}-h{historia}'
+
+    def _indice(self, pc: int) -> int:
+        return ((pc >> 2) ^ self.historia) & self._mascara
+
+    def preve(self, pc: int, alvo: int) -> bool:
+        return self.contadores[self._indice(pc)] >= 2
+
+    def atualiza(self, pc: int, alvo: int, tomado: bool) -> None:
+        i = self._indice(pc)
+        c = self.contadores[i]
+        if tomado:
+            if c < 3:
+                self.contadores[i] = c + 1
+        elif c:
+            self.contadores[i] = c - 1
+        self.historia = ((self.historia << 1) | tomado) & self._mascara_historia
+
+
+class TournamentPredictor(Predictor):
+
+    def __init__(self, primeiro: Predictor = None, segundo: Predictor = None, entradas: int = 4096) -> None:
+        # escolhe por pc entre dois preditores (por padrão bimodal e gshare) com contadores de 2 bits:
+        # 0/1 confia no primeiro, 2/3 no segundo
+        self.primeiro = primeiro if primeiro is not None else BimodalPredictor(entradas)
+        self.segundo = segundo if segundo is not None else GSharePredictor(entradas)
+        self._mascara = _potencia_de_2(entradas)
+        self.escolha = bytearray([1]) * entradas
+        self.nome = f'torneio({self.primeiro.nome},{self.segundo.nome})'
+
+    def preve(self, pc: int, alvo: int) -> bool:
+        if self.escolha[(pc >> 2) & self._mascara] >= 2:
+            return self.segundo.preve(pc, alvo)
+        return self.primeiro.preve(pc, alvo)
+
+    def atualiza(self, pc: int, alvo: int, tomado: bool) -> None:
+        acertou_primeiro = self.primeiro.preve(pc, alvo) == tomado
+        acertou_segundo = self.segundo.preve(pc, alvo) == tomado
+        if acertou_primeiro != acertou_segundo:
+            i = (pc >> 2) & self._mascara
+            c = self.escolha[i]
+            if acertou_segundo:
+                if c < 3:
+                    self.escolha[i] = c + 1
+            elif c:
+                self.escolha[i] = c - 1
+        self.primeiro.atualiza(pc, alvo, tomado)
+        self.segundo.atualiza(pc, alvo, tomado)
+
+
+# ---------------------------------------------------------------- alvos
+
+
+class BranchTargetBuffer:
+
+    def __init__(self, entradas: int = 512) -> None:
+        # mapeado direto: guarda o pc inteiro como tag e o último alvo visto
+        self._mascara = _potencia_de_2(entradas)
+        self.tags = array('q', [-1]) * entradas
+        self.alvos = array('Q', bytes(8 * entradas))
+
+    def busca(self, pc: int):
+        i = (pc >> 2) & self._mascara
+        return self.alvos[i] if self.tags[i] == pc else None
+
+    def grava(self, pc: int, alvo: int) -> None:
+        i = (pc >> 2) & self._mascara
+        self.tags[i] = pc
+        self.alvos[i] = alvo
+
+
+class ReturnAddressStack:
+
+    def __init__(self, profundidade: int = 16) -> None:
+        # pilha circular: quando enche, a chamada mais antiga é perdida
+        self.profundidade = profundidade
+        self.enderecos = array('Q', bytes(8 * profundidade))
+        self.topo = 0
+        self.tamanho = 0
+
+    def empilha(self, endereco: int) -> None:
+        self.enderecos[self.topo] = endereco
+        self.topo = (self.topo + 1) % self.profundidade
+        self.tamanho = min(self.tamanho + 1, self.profundidade)
+
+    def desempilha(self):
+        if not self.tamanho:
+            return None
+        self.topo = (self.topo - 1) % self.profundidade
+        self.tamanho -= 1
+        return self.enderecos[self.topo]
+
+
+# ---------------------------------------------------------------- motor
+
+
+class PredictorConfig:
+
+    def __init__(self, direcao: Predictor, btb: BranchTargetBuffer = None, ras: ReturnAddressStack = None,
+                 nome: str = None) -> None:
+        self.direcao = direcao
+        self.btb = btb
+        self.ras = ras
+        partes = [direcao.nome] + (['btb'] if btb is not None else []) + (['ras'] if ras is not None else [])
+        self.nome = nome if nome is not None else '+'.join(partes)
+        self.desvios = 0
+        self.erros_direcao = 0
+        self.saltos = 0
+        self.erros_alvo = 0  # desvio tomado/salto sem o alvo certo na busca
+        self.ciclos = 0
+        self.erros_por_pc = {}
+
+
+class BranchPredictionEngine:
+
+    def __init__(self, configuracoes, penalidade_desvio: int = 2, penalidade_alvo: int = 1) -> None:
+        self.configuracoes = list(configuracoes)
+        nomes = [config.nome for config in self.configuracoes]
+        if len(set(nomes)) != len(nomes):
+            raise ValueError('as configurações precisam ter nomes diferentes')
+        self.penalidade_desvio = penalidade_desvio
+        self.penalidade_alvo = penalidade_alvo
+        self.instrucoes = 0
+
+    def _erro(self, config: PredictorConfig, pc: int, ciclos: int) -> None:
+        config.ciclos += ciclos
+        config.erros_por_pc[pc] = config.erros_por_pc.get(pc, 0) + 1
+
+    def consome(self, pc: int, word: int, proximo_pc: int, *resto) -> None:
+        self.instrucoes += 1
+        tipo = TIPO_CONTROLE[((word >> 20) & 0xFC0) | (word & 0x3F)]
+        if not tipo:
+            return
+        if tipo == DESVIO:
+            imm = word & 0xFFFF
+            alvo = (pc + 4 + ((imm - 0x10000 if imm & 0x8000 else imm) << 2)) & 0xFFFFFFFF
+            tomado = proximo_pc != pc + 4
+            for config in self.configuracoes:
+                config.desvios += 1
+                if config.direcao.preve(pc, alvo) != tomado:
+                    config.erros_direcao += 1
+                    self._erro(config, pc, self.penalidade_desvio)
+                elif tomado and (config.btb is None or config.btb.busca(pc) != alvo):
+                    # direção certa, mas o alvo só sai na decodificação
+                    config.erros_alvo += 1
+                    self._erro(config, pc, self.penalidade_alvo)
+                config.direcao.atualiza(pc, alvo, tomado)
+                if tomado and config.btb is not None:
+                    config.btb.grava(pc, alvo)
+            return
+
+        retorno = tipo == INDIRETO and (word >> 21) & 31 == 31  # jr $ra
+        for config in self.configuracoes:
+            config.saltos += 1
+            if retorno and config.ras is not None:
+                previsto = config.ras.desempilha()
+            elif config.btb is not None:
+                previsto = config.btb.busca(pc)
+            else:
+                previsto = None
+            if previsto != proximo_pc:
+                config.erros_alvo += 1
+                self._erro(config, pc, self.penalidade_alvo)
+            if config.btb is not None:
+                config.btb.grava(pc, proximo_pc)
+            if config.ras is not None and (tipo == CHAMADA or tipo == CHAMADA_INDIRETA):
+                config.ras.empilha((pc + 4) & 0xFFFFFFFF)
+
+    def processa(self, trace) -> dict:
+        # trace: tuplas que começam com (pc, palavra, próximo pc), ex.: MIPSSimulator.rastreia()
+        consome = self.consome
+        for evento in trace:
+            consome(evento[0], evento[1], evento[2])
+        return self.relatorio()
+
+    def relatorio(self) -> dict:
+        resultado = {}
+        for config in self.configuracoes:
+            resultado[config.nome] = {
+                'desvios': config.desvios,
+                'erros_direcao': config.erros_direcao,
+                'acuracia': 1 - config.erros_direcao / config.desvios if config.desvios else 0.0,
+                'saltos': config.saltos,
+                'erros_alvo': config.erros_alvo,
+                'ciclos_penalidade': config.ciclos,
+                'cpi_extra': config.ciclos / self.instrucoes if self.instrucoes else 0.0,
+                'erros_por_pc': dict(config.erros_por_pc),
+            }
+        return resultado
+
+    def formata_relatorio(self, top: int = 3) -> str:
+        linhas = [f'Instruções: {self.instrucoes}']
+        for nome, r in self.relatorio().items():
+            linhas.append(f'- {nome}:')
+            linhas.append(f'\tacurácia: {100 * r["acuracia"]:.2f}% ({r["erros_direcao"]} erros em '
+                          f'{r["desvios"]} desvios)')
+            linhas.append(f'\terros de alvo: {r["erros_alvo"]} ({r["saltos"]} saltos)')
+            linhas.append(f'\tciclos perdidos: {r["ciclos_penalidade"]} (+{r["cpi_extra"]:.3f} CPI)')
+            piores = sorted(r['erros_por_pc'].items(), key=lambda item: item[1], reverse=True)[:top]
+            if piores:
+                linhas.append('\tpiores: ' + ', '.join(f'0x{pc:08x}={n}' for pc, n in piores))
+        return '\n'.join(linhas) + '\n'
@@ -0,0 +1,242 @@
+import struct
+import sys
+from array import array
+
+from decodificador_bruno_c_t_elias import (ID_NOME_ROM, NOMES, RENDERIZADORES, ROM_CONTROLE, TIPO_POR_OPCODE,
+                                           VISAO_POR_MASCARA, Instruction)
+
+# Programa decodificado guardado em colunas (struct-of-arrays): um array tipado por campo em vez de um
+# objeto Instruction por palavra. Cada instrução ocupa uns 19 bytes no total.
+
+
+def _typecode(tamanho: int) -> str:
+    # typecode do array com exatamente esse tamanho em bytes: o C garante só o mínimo (o 'L' tem 8 bytes no
+    # Linux 64 bits e o 'I' poderia ter 2), e o arquivo salvo precisa ter o mesmo tamanho em toda máquina
+    for typecode in ('B', 'H', 'I', 'L'):
+        if array(typecode).itemsize == tamanho:
+            return typecode
+    raise ImportError(f'nenhum typecode de array tem {tamanho} bytes nesta plataforma')
+
+
+_U16, _U32 = _typecode(2), _typecode(4)
+
+# nome da coluna -> typecode do array (uint8, uint16 ou uint32)
+COLUNAS = {
+    'word': _U32,
+    'opcode': 'B',
+    'rs': 'B',
+    'rt': 'B',
+    'rd': 'B',
+    'shamt': 'B',
+    'funct': 'B',
+    'immediate': _U16,
+    'address': _U32,
+    'type': 'B',
+    'name': 'B',
+    'control': 'B',
+}
+# typecode do array -> dtype do NumPy equivalente na ordem de bytes da máquina (usado só no from_colunas)
+_DTYPES = {'B': 'u1', _U16: '=u2', _U32: '=u4'}
+
+# cabeçalho do arquivo colunar: assinatura, versão, quantidade de instruções e endereço base
+_MAGICO = b'MIPSPRG'
+_VERSAO = 1
+_CABECALHO = struct.Struct('<7sBQI')
+
+
+class InstructionView:
+    # visão leve de uma instrução dentro do DecodedProgram: só guarda o programa e o índice,
+    # os campos são lidos das colunas na hora que alguém pede
+    __slots__ = ('program', 'index')
+
+    def __init__(self, program: 'DecodedProgram', index: int) -> None:
+        self.program = program
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f'<InstructionView {self.index}: {self.mnemonic}>'
+
+    def __str__(self) -> str:
+        return self.mnemonic
+
+    @property
+    def pc(self) -> int:
+        return self.program.base + 4 * self.index
+
+    @property
+    def word(self) -> int:
+        return self.program.word[self.index]
+
+    @property
+    def opcode(self) -> int:
+        return self.program.opcode[self.index]
+
+    @property
+    def rs(self) -> int:
+        return self.program.rs[self.index]
+
+    @property
+    def rt(self) -> int:
+        return self.program.rt[self.index]
+
+    @property
+    def rd(self) -> int:
+        return self.program.rd[self.index]
+
+    @property
+    def shamt(self) -> int:
+        return self.program.shamt[self.index]
+
+    @property
+    def funct(self) -> int:
+        return self.program.funct[self.index]
+
+    @property
+    def immediate(self) -> int:
+        return self.program.immediate[self.index]
+
+    @property
+    def address(self) -> int:
+        return self.program.address[self.index]
+
+    @property
+    def type(self):
+        return TIPO_POR_OPCODE[self.program.opcode[self.index]]
+
+    @property
+    def name(self) -> str:
+        return NOMES[self.program.name[self.index]]
+
+    @property
+    def control(self) -> int:
+        return self.program.control[self.index]
+
+    @property
+    def signals(self):
+        return VISAO_POR_MASCARA[self.program.control[self.index]]
+
+    @property
+    def fields(self) -> dict:
+        # mesmo dicionário que o Instruction.get_fields monta, só com os campos do tipo da instrução
+        return Instruction.get_fields_word(self.word, self.type, self.opcode)
+
+    @property
+    def mnemonic(self) -> str:
+        programa, i = self.program, self.index
+        return RENDERIZADORES[(programa.opcode[i] << 6) | programa.funct[i]](programa.word[i])
+
+
+class DecodedProgram:
+
+    def __init__(self, base: int = 0) -> None:
+        # base é o endereço da primeira instrução; as outras vêm de 4 em 4 bytes
+        self.base = base
+        for coluna, typecode in COLUNAS.items():
+            setattr(self, coluna, array(typecode))
+
+    @classmethod
+    def from_words(cls, words, base: int = 0) -> 'DecodedProgram':
+        programa = cls(base)
+        programa.extend(words)
+        return programa
+
+    @classmethod
+    def from_colunas(cls, colunas: dict, base: int = 0) -> 'DecodedProgram':
+        # aproveita o resultado do lote.decodifica_lote (arrays NumPy) sem decodificar de novo
+        programa = cls(base)
+        programa.extend_colunas(colunas)
+        return programa
+
+    @classmethod
+    def from_arquivo(cls, caminho: str, endian: str = 'big', base: int = 0) -> 'DecodedProgram':
+        # decodifica um binário cru usando o caminho vetorizado (precisa do NumPy, por isso o import aqui dentro)
+        import lote
+        return cls.from_colunas(lote.decodifica_arquivo(caminho, endian), base)
+
+    def extend_colunas(self, colunas: dict) -> None:
+        # acrescenta no final um bloco já decodificado pelo lote.decodifica_lote
+        for coluna, typecode in COLUNAS.items():
+            getattr(self, coluna).frombytes(colunas[coluna].astype(_DTYPES[typecode]).tobytes())
+
+    def extend(self, words) -> None:
+        # decodifica e acrescenta palavras no final, campo por campo com deslocamento e máscara
+        word, opcode, rs, rt, rd = self.word, self.opcode, self.rs, self.rt, self.rd
+        shamt, funct, immediate, address = self.shamt, self.funct, self.immediate, self.address
+        tipo, nome, control = self.type, self.name, self.control
+        for w in words:
+            w &= 0xFFFFFFFF
+            op = w >> 26
+            f = w & 0x3F
+            i = (op << 6) | f
+            word.append(w)
+            opcode.append(op)
+            rs.append((w >> 21) & 0x1F)
+            rt.append((w >> 16) & 0x1F)
+            rd.append((w >> 11) & 0x1F)
+            shamt.append((w >> 6) & 0x1F)
+            funct.append(f)
+            immediate.append(w & 0xFFFF)
+            address.append(w & 0x3FFFFFF)
+            tipo.append(TIPO_POR_OPCODE[op].value)
+            nome.append(ID_NOME_ROM[i])
+            control.append(ROM_CONTROLE[i])
+
+    def patch(self, inicio: int, words) -> None:
+        # troca as palavras a partir do índice inicio (sem mudar o tamanho do programa)
+        # ninguém é avisado: um consulta.InvertedIndex em cima do programa fica velho até o reconstroi()
+        novo = DecodedProgram.from_words(words)
+        fim = inicio + len(novo)
+        if inicio < 0 or fim > len(self):
+            raise IndexError('patch fora do programa')
+        for coluna in COLUNAS:
+            getattr(self, coluna)[inicio:fim] = getattr(novo, coluna)
+
+    def __len__(self) -> int:
+        return len(self.word)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            inicio, fim, passo = item.indices(len(self))
+            if passo != 1:
+                raise ValueError('DecodedProgram só aceita fatias contínuas (passo 1)')
+            fatia = DecodedProgram(self.base + 4 * inicio)
+            for coluna in COLUNAS:
+                setattr(fatia, coluna, getattr(self, coluna)[inicio:fim])
+            return fatia
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('índice fora do programa')
+        return InstructionView(self, item)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield InstructionView(self, i)
+
+    def nbytes(self) -> int:
+        return sum(getattr(self, coluna).itemsize * len(self) for coluna in COLUNAS)
+
+    def save(self, caminho: str) -> None:
+        # arquivo colunar: cabeçalho e depois cada coluna inteira, em little endian
+        with open(caminho, 'wb') as f:
+            f.write(_CABECALHO.pack(_MAGICO, _VERSAO, len(self), self.base))
+            for coluna in COLUNAS:
+                dados = getattr(self, coluna)
+                if sys.byteorder == 'big' and dados.itemsize > 1:
+                    dados = array(dados.typecode, dados)
+                    dados.byteswap()
+                dados.tofile(f)
+
+    @classmethod
+    def load(cls, caminho: str) -> 'DecodedProgram':
+        with open(caminho, 'rb') as f:
+            magico, versao, n, base = _CABECALHO.unpack(f.read(_CABECALHO.size))
+            if magico != _MAGICO or versao != _VERSAO:
+                raise ValueError(f'{caminho} não é um arquivo de DecodedProgram válido')
+            programa = cls(base)
+            for coluna in COLUNAS:
+                dados = getattr(programa, coluna)
+                dados.fromfile(f, n)
+                if sys.byteorder == 'big' and dados.itemsize > 1:
+                    dados.byteswap()
+        return programa
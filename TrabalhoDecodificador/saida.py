@@ -0,0 +1,152 @@
+import csv
+import io
+import json
+import sys
+
+from decodificador_bruno_c_t_elias import SINAIS, MIPSDecoder, empacota_sinais, format_output
+
+# Camada de saída: a decodificação não imprime nada, e quem precisa mostrar o resultado escolhe um escritor.
+# Todos os escritores juntam o texto num buffer e só escrevem no destino em pedaços grandes.
+
+TAMANHO_BUFFER = 1 << 20  # 1 MiB por escrita
+
+CAMPOS = ('opcode', 'rs', 'rt', 'rd', 'shamt', 'funct', 'immediate', 'address')
+
+
+class OutputWriter:
+    # classe base: cuida do destino e do buffer, as filhas só sabem formatar uma instrução
+
+    def __init__(self, destino=None, buffer_size: int = TAMANHO_BUFFER, cabecalho: bool = True) -> None:
+        # destino pode ser um caminho, um arquivo já aberto ou None/'-' pra saída padrão.
+        # cabecalho=False serve pra quando o texto vai ser emendado em outro (ex.: blocos do paralelo.py)
+        if destino is None or destino == '-':
+            self._arquivo = sys.stdout
+            self._fechar = False
+        elif isinstance(destino, str):
+            self._arquivo = open(destino, 'w', encoding='utf-8', newline='')
+            self._fechar = True
+        else:
+            self._arquivo = destino
+            self._fechar = False
+        self.buffer_size = buffer_size
+        self._partes = []
+        self._tamanho = 0
+        self.prepara()
+        if cabecalho:
+            self.escreve_cabecalho()
+
+    def __enter__(self) -> 'OutputWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def prepara(self) -> None:
+        pass
+
+    def escreve_cabecalho(self) -> None:
+        pass
+
+    def formata(self, instr, signals) -> str:
+        raise NotImplementedError
+
+    def _adiciona(self, texto: str) -> None:
+        self._partes.append(texto)
+        self._tamanho += len(texto)
+        if self._tamanho >= self.buffer_size:
+            self.flush()
+
+    def write(self, instr, signals=None) -> None:
+        # aceita Instruction, DecodedInstruction ou InstructionView; se não vier sinais, busca na ROM
+        if signals is None:
+            signals = MIPSDecoder.get_sinais_de_controle(instr)
+        self._adiciona(self.formata(instr, signals))
+
+    def write_all(self, instrucoes) -> None:
+        for instr in instrucoes:
+            self.write(instr)
+
+    def write_text(self, texto: str) -> None:
+        # texto já formatado (por outro escritor do mesmo formato) entra direto no buffer
+        self._adiciona(texto)
+
+    def flush(self) -> None:
+        if self._partes:
+            self._arquivo.write(''.join(self._partes))
+            self._partes = []
+            self._tamanho = 0
+        self._arquivo.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._fechar:
+            self._arquivo.close()
+
+
+class HumanWriter(OutputWriter):
+    # o mesmo formato que o main mostra na tela
+
+    def formata(self, instr, signals) -> str:
+        return f'Formato mnemônico: {instr.mnemonic}\n' + format_output(instr, signals)
+
+
+class JSONLinesWriter(OutputWriter):
+    # um objeto JSON por linha
+
+    def formata(self, instr, signals) -> str:
+        return json.dumps({
+            'word': instr.word,
+            'type': instr.type.name,
+            'name': instr.name,
+            'mnemonic': instr.mnemonic,
+            'fields': dict(instr.fields),
+            'signals': dict(signals),
+        }, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+class CSVWriter(OutputWriter):
+    # uma coluna por campo e por sinal; campos que não existem no tipo da instrução ficam vazios
+
+    def prepara(self) -> None:
+        self._csv_buffer = io.StringIO()
+        self._csv = csv.writer(self._csv_buffer, lineterminator='\n')
+
+    def escreve_cabecalho(self) -> None:
+        self._adiciona(self._linha(('word', 'type', 'name', 'mnemonic') + CAMPOS + SINAIS))
+
+    def _linha(self, valores) -> str:
+        self._csv.writerow(valores)
+        texto = self._csv_buffer.getvalue()
+        self._csv_buffer.seek(0)
+        self._csv_buffer.truncate()
+        return texto
+
+    def formata(self, instr, signals) -> str:
+        fields = instr.fields
+        return self._linha((f'0x{instr.word:08x}', instr.type.name, instr.name, instr.mnemonic)
+                           + tuple(fields.get(campo, '') for campo in CAMPOS)
+                           + tuple(signals[sinal] for sinal in SINAIS))
+
+
+class TSVWriter(OutputWriter):
+    # formato compacto: palavra, nome, mnemônico e os sinais empacotados (bit 0 = RegDst ... bit 7 = Jump)
+
+    def formata(self, instr, signals) -> str:
+        return f'{instr.word:08x}\t{instr.name}\t{instr.mnemonic}\t{empacota_sinais(signals):02x}\n'
+
+
+ESCRITORES = {
+    'humano': HumanWriter,
+    'jsonl': JSONLinesWriter,
+    'csv': CSVWriter,
+    'tsv': TSVWriter,
+}
+
+
+def get_writer(formato: str, destino=None, buffer_size: int = TAMANHO_BUFFER,
+               cabecalho: bool = True) -> OutputWriter:
+    try:
+        classe = ESCRITORES[formato]
+    except KeyError:
+        raise ValueError(f'formato de saída desconhecido: {formato!r} (use {", ".join(ESCRITORES)})') from None
+    return classe(destino, buffer_size, cabecalho)
@@ -0,0 +1,206 @@
+import argparse
+import asyncio
+import os
+import socket
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from decodificador_bruno_c_t_elias import MIPSDecoder, parse_int
+
+# Serviço de decodificação de longa duração (asyncio), num socket Unix ou TCP. Evita pagar a subida do
+# processo a cada chamada: as tabelas são montadas uma vez e o cache do MIPSDecoder fica quente entre
+# requisições e entre clientes.
+#
+# Protocolo: cada requisição é um lote de números (qualquer base que o parse_int entende) separados por
+# espaço, vírgula ou quebra de linha. Dá pra mandar de dois jeitos, escolhidos pelo primeiro byte de cada
+# requisição, então o mesmo cliente pode misturar:
+#   - linha: o lote vai numa linha só, terminada em '\n'
+#   - com tamanho: 4 bytes big-endian com o tamanho + o lote. O primeiro byte do tamanho é sempre 0
+#     (lote < 16 MiB), e uma linha de texto nunca começa com 0, por isso a detecção funciona
+# Resposta: uma linha por número, no formato compacto do TSVWriter
+#   palavra(hex) \t nome \t mnemônico \t sinais empacotados(hex)
+# ou "!\t<token>\t<erro>" se o número não for válido. No modo linha o lote termina com uma linha vazia; no
+# modo com tamanho a resposta vem com o mesmo prefixo de 4 bytes. O cliente pode mandar várias
+# requisições sem esperar (pipelining): as respostas voltam na mesma ordem.
+#
+# Lotes grandes (>= limite_executor bytes) são decodificados numa thread à parte (run_in_executor), pra não
+# travar o laço de eventos e os outros clientes. O decoder continua um só: uma trava protege o cache LRU, e
+# um lote pequeno que chega com a trava ocupada também vai pra fila da thread em vez de esperar no laço.
+
+TAMANHO_MAXIMO = (1 << 24) - 1  # maior lote aceito, em bytes
+CACHE_PADRAO = 1 << 16
+LIMITE_EXECUTOR = 1 << 16  # lotes a partir daqui (em bytes) saem do laço de eventos
+
+_TAMANHO = struct.Struct('>I')
+_SEPARADORES = bytes.maketrans(b',;', b'  ')
+
+
+class DecodeServer:
+
+    def __init__(self, cache_size: int = CACHE_PADRAO, decoder: MIPSDecoder = None,
+                 limite_executor: int = LIMITE_EXECUTOR) -> None:
+        # um decoder só pra todos os clientes (o cache dele é o único estado que cresce, e é limitado)
+        self.decoder = decoder if decoder is not None else MIPSDecoder(cache_size)
+        self.limite_executor = limite_executor
+        self._trava = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='decodifica')
+        self.requisicoes = 0
+        self.palavras = 0
+        self.clientes = 0
+        self._servidor = None
+
+    def decodifica_lote(self, dados: bytes) -> bytes:
+        # recebe o texto cru do lote e devolve a resposta já codificada (pode ser chamada de qualquer thread)
+        with self._trava:
+            return self._decodifica_lote(dados)
+
+    def _decodifica_lote(self, dados: bytes) -> bytes:
+        # só com a trava na mão
+        partes = []
+        decode = self.decoder.decode_cached
+        for token in dados.translate(_SEPARADORES).split():
+            texto = token.decode('ascii', 'replace')
+            try:
+                word = parse_int(texto) & 0xFFFFFFFF
+            except ValueError as erro:
+                partes.append(f'!\t{texto}\t{erro}\n')
+                continue
+            registro = decode(word)
+            partes.append(f'{word:08x}\t{registro.name}\t{registro.mnemonic}\t{registro.control:02x}\n')
+        self.requisicoes += 1
+        self.palavras += len(partes)
+        return ''.join(partes).encode('utf-8')
+
+    async def _responde(self, dados: bytes) -> bytes:
+        # lote pequeno com a trava livre roda aqui mesmo; o resto vai pra thread, na ordem de chegada
+        if len(dados) < self.limite_executor and self._trava.acquire(blocking=False):
+            try:
+                return self._decodifica_lote(dados)
+            finally:
+                self._trava.release()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.decodifica_lote, dados)
+
+    async def atende(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.clientes += 1
+        try:
+            while True:
+                primeiro = await reader.read(1)
+                if not primeiro:
+                    break
+                if primeiro == b'\x00':
+                    cabecalho = primeiro + await reader.readexactly(3)
+                    tamanho, = _TAMANHO.unpack(cabecalho)
+                    resposta = await self._responde(await reader.readexactly(tamanho))
+                    writer.write(_TAMANHO.pack(len(resposta)))
+                    writer.write(resposta)
+                elif primeiro == b'\n':
+                    # linha vazia é um lote vazio: responde só o terminador, sem ler a próxima requisição
+                    writer.write(await self._responde(b'') + b'\n')
+                else:
+                    dados = primeiro + await reader.readline()
+                    writer.write(await self._responde(dados) + b'\n')
+                # só espera o cliente ler quando o buffer de saída encheu
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ValueError, ConnectionError):
+            # cliente fechou no meio de um lote ou mandou uma linha maior que o limite
+            pass
+        finally:
+            self.clientes -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def inicia(self, unix: str = None, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        # socket Unix se vier o caminho, senão TCP. port=0 escolhe uma porta livre (ver self.endereco)
+        if unix is not None:
+            if os.path.exists(unix):
+                os.unlink(unix)
+            self._servidor = await asyncio.start_unix_server(self.atende, path=unix, limit=TAMANHO_MAXIMO)
+        else:
+            self._servidor = await asyncio.start_server(self.atende, host, port, limit=TAMANHO_MAXIMO)
+        return self._servidor
+
+    @property
+    def endereco(self):
+        return self._servidor.sockets[0].getsockname()
+
+    async def serve(self, unix: str = None, host: str = '127.0.0.1', port: int = 0) -> None:
+        servidor = await self.inicia(unix, host, port)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def estatisticas(self) -> dict:
+        return {
+            'requisicoes': self.requisicoes,
+            'palavras': self.palavras,
+            'clientes': self.clientes,
+            'cache': self.decoder.cache_info(),
+        }
+
+
+class DecodeClient:
+    # cliente síncrono simples (modo com tamanho), pra ferramentas que não usam asyncio
+
+    def __init__(self, unix: str = None, host: str = '127.0.0.1', port: int = None) -> None:
+        if unix is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(unix)
+        else:
+            self._socket = socket.create_connection((host, port))
+        self._arquivo = self._socket.makefile('rb')
+
+    def __enter__(self) -> 'DecodeClient':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def envia(self, palavras) -> None:
+        # palavras: inteiros ou textos em qualquer base do parse_int. Não espera a resposta (pipelining)
+        dados = ' '.join(p if isinstance(p, str) else str(p) for p in palavras).encode('ascii')
+        if len(dados) > TAMANHO_MAXIMO:
+            raise ValueError(f'lote grande demais: {len(dados)} bytes (máximo {TAMANHO_MAXIMO})')
+        self._socket.sendall(_TAMANHO.pack(len(dados)) + dados)
+
+    def recebe(self) -> list:
+        # devolve as linhas da próxima resposta, na ordem dos envios
+        cabecalho = self._arquivo.read(4)
+        if len(cabecalho) < 4:
+            raise ConnectionError('servidor fechou a conexão')
+        tamanho, = _TAMANHO.unpack(cabecalho)
+        return self._arquivo.read(tamanho).decode('utf-8').splitlines()
+
+    def decodifica(self, palavras) -> list:
+        self.envia(palavras)
+        return self.recebe()
+
+    def close(self) -> None:
+        self._arquivo.close()
+        self._socket.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serviço de decodificação MIPS em socket Unix ou TCP')
+    parser.add_argument('--unix', help='caminho do socket Unix (se não vier, usa TCP)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5300)
+    parser.add_argument('--cache', type=int, default=CACHE_PADRAO, help='tamanho do cache de decodificação')
+    parser.add_argument('--limite-executor', type=int, default=LIMITE_EXECUTOR,
+                        help='lotes a partir desse tamanho (bytes) são decodificados fora do laço de eventos')
+    args = parser.parse_args()
+
+    servidor = DecodeServer(args.cache, limite_executor=args.limite_executor)
+    try:
+        asyncio.run(servidor.serve(args.unix, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,592 @@
+import sys
+import time
+
+from decodificador_bruno_c_t_elias import ID_NOME_ROM, NOMES, MIPSDecoder
+from perfis import ACESSO_MEMORIA
+
+# Simulador funcional: executa as instruções que o decodificador conhece. Cada palavra do programa é
+# decodificada uma vez só no load() e vira uma função (handler) já com os operandos amarrados; o laço do
+# run() só pega o handler pelo PC e chama, sem decodificar nada de novo a cada passo.
+# Não tem delay slot (igual ao MARS/SPIM com delayed branching desligado).
+# Código que se modifica: um sb/sh/sw/swc1 que cai dentro do programa carregado refaz o handler daquela
+# posição. Escrita direta com memoria.escreve()/carrega() não passa por aí: depois do load(), mexer no texto
+# por fora não muda o que o run() executa.
+
+M = 0xFFFFFFFF
+# índice "lixo" do banco de registradores: escrita em $zero vai pra cá, então o $zero continua 0
+_DESCARTE = 32
+# PC que o handler devolve pra parar a execução (syscall de saída, break); ele mesmo guarda o PC seguinte no sim.pc
+_PARA = -1
+
+TEXTO_BASE = 0x00400000
+GP_INICIAL = 0x10008000
+SP_INICIAL = 0x7FFFEFFC
+
+
+class SimulationError(Exception):
+    pass
+
+
+def _com_sinal(x: int) -> int:
+    return x - 0x100000000 if x & 0x80000000 else x
+
+
+def _sext16(x: int) -> int:
+    return x - 0x10000 if x & 0x8000 else x
+
+
+class Memoria:
+    # memória esparsa endereçada por byte: só as páginas que foram escritas existem de verdade.
+    # palavras e meias palavras em big endian (padrão do MIPS) ou little endian
+
+    TAMANHO_PAGINA = 4096
+
+    def __init__(self, endian: str = 'big') -> None:
+        if endian not in ('big', 'little'):
+            raise ValueError(f'endianness inválida: {endian!r} (use "big" ou "little")')
+        self.endian = endian
+        self.paginas = {}
+
+    def _pagina(self, endereco: int) -> bytearray:
+        numero = endereco >> 12
+        pagina = self.paginas.get(numero)
+        if pagina is None:
+            pagina = self.paginas[numero] = bytearray(self.TAMANHO_PAGINA)
+        return pagina
+
+    def le(self, endereco: int, tamanho: int) -> int:
+        # leitura alinhada de 1, 2 ou 4 bytes (sem sinal)
+        if endereco & (tamanho - 1):
+            raise SimulationError(f'acesso desalinhado de {tamanho} bytes em 0x{endereco:08x}')
+        pagina = self.paginas.get(endereco >> 12)
+        if pagina is None:
+            return 0
+        inicio = endereco & 0xFFF
+        return int.from_bytes(pagina[inicio:inicio + tamanho], self.endian)
+
+    def escreve(self, endereco: int, tamanho: int, valor: int) -> None:
+        if endereco & (tamanho - 1):
+            raise SimulationError(f'acesso desalinhado de {tamanho} bytes em 0x{endereco:08x}')
+        inicio = endereco & 0xFFF
+        self._pagina(endereco)[inicio:inicio + tamanho] = (valor & ((1 << (8 * tamanho)) - 1)).to_bytes(
+            tamanho, self.endian)
+
+    def carrega(self, endereco: int, dados: bytes) -> None:
+        # copia bytes crus pra memória (dados do programa, por exemplo)
+        for i, byte in enumerate(dados):
+            self._pagina(endereco + i)[(endereco + i) & 0xFFF] = byte
+
+    def le_string(self, endereco: int, limite: int = 1 << 20) -> bytes:
+        # lê até o '\0' (usado pelo syscall de imprimir string)
+        saida = bytearray()
+        while len(saida) < limite:
+            byte = self.le(endereco + len(saida), 1)
+            if byte == 0:
+                break
+            saida.append(byte)
+        return bytes(saida)
+
+
+def syscall_padrao(sim: 'MIPSSimulator') -> bool:
+    # alguns serviços do SPIM/MARS pelo $v0; devolve True quando é pra parar a execução
+    r = sim.regs
+    servico = r[2]
+    if servico == 1:  # print_int
+        sim.saida.write(str(_com_sinal(r[4])))
+    elif servico == 4:  # print_string
+        sim.saida.write(sim.memoria.le_string(r[4]).decode('latin-1'))
+    elif servico == 11:  # print_char
+        sim.saida.write(chr(r[4] & 0xFF))
+    elif servico == 10:  # exit
+        sim.codigo_saida = 0
+        return True
+    elif servico == 17:  # exit2
+        sim.codigo_saida = _com_sinal(r[4])
+        return True
+    else:
+        raise SimulationError(f'syscall {servico} não suportado')
+    return False
+
+
+# ---- fábricas de handlers ----
+# cada uma recebe o simulador e os campos da instrução e devolve uma função pc -> próximo pc.
+# d é o registrador de destino já trocado por _DESCARTE quando é $zero
+
+def _overflow(pc: int):
+    raise SimulationError(f'overflow aritmético em 0x{pc:08x}')
+
+
+def _add(sim, rs, rt, rd, shamt, imm):
+    r, d = sim.regs, rd or _DESCARTE
+
+    def add(pc):
+        a, b = r[rs], r[rt]
+        s = (a + b) & M
+        if ~(a ^ b) & (a ^ s) & 0x80000000:
+            _overflow(pc)
+        r[d] = s
+        return pc + 4
+    return add
+
+
+def _sub(sim, rs, rt, rd, shamt, imm):
+    r, d = sim.regs, rd or _DESCARTE
+
+    def sub(pc):
+        a, b = r[rs], r[rt]
+        s = (a - b) & M
+        if (a ^ b) & (a ^ s) & 0x80000000:
+            _overflow(pc)
+        r[d] = s
+        return pc + 4
+    return sub
+
+
+def _alu_r(operacao):
+    # fábrica pros R simples: rd = operacao(rs, rt)
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, d = sim.regs, rd or _DESCARTE
+
+        def handler(pc):
+            r[d] = operacao(r[rs], r[rt])
+            return pc + 4
+        return handler
+    return fabrica
+
+
+def _shift(operacao, variavel: bool):
+    # sll/srl/sra (shamt fixo) e sllv/srlv/srav (quantidade vem de rs)
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, d = sim.regs, rd or _DESCARTE
+        if variavel:
+            def handler(pc):
+                r[d] = operacao(r[rt], r[rs] & 31)
+                return pc + 4
+        else:
+            def handler(pc):
+                r[d] = operacao(r[rt], shamt)
+                return pc + 4
+        return handler
+    return fabrica
+
+
+def _mult(sinal: bool):
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, hilo = sim.regs, sim.hilo
+
+        def handler(pc):
+            a, b = r[rs], r[rt]
+            if sinal:
+                a, b = _com_sinal(a), _com_sinal(b)
+            produto = (a * b) & 0xFFFFFFFFFFFFFFFF
+            hilo[0] = produto >> 32
+            hilo[1] = produto & M
+            return pc + 4
+        return handler
+    return fabrica
+
+
+def _div(sinal: bool):
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, hilo = sim.regs, sim.hilo
+
+        def handler(pc):
+            a, b = r[rs], r[rt]
+            if b == 0:
+                return pc + 4  # resultado indefinido no MIPS: HI/LO ficam como estão
+            if sinal:
+                a, b = _com_sinal(a), _com_sinal(b)
+                q = abs(a) // abs(b)
+                if (a < 0) != (b < 0):
+                    q = -q
+                resto = a - q * b  # resto com o sinal do dividendo
+            else:
+                q, resto = divmod(a, b)
+            hilo[0] = resto & M
+            hilo[1] = q & M
+            return pc + 4
+        return handler
+    return fabrica
+
+
+def _mfhilo(qual: int):
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, hilo, d = sim.regs, sim.hilo, rd or _DESCARTE
+
+        def handler(pc):
+            r[d] = hilo[qual]
+            return pc + 4
+        return handler
+    return fabrica
+
+
+def _mthilo(qual: int):
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, hilo = sim.regs, sim.hilo
+
+        def handler(pc):
+            hilo[qual] = r[rs]
+            return pc + 4
+        return handler
+    return fabrica
+
+
+def _jr(sim, rs, rt, rd, shamt, imm):
+    r = sim.regs
+
+    def jr(pc):
+        destino = r[rs]
+        if destino & 3:
+            raise SimulationError(f'jr para endereço desalinhado 0x{destino:08x} em 0x{pc:08x}')
+        return destino
+    return jr
+
+
+def _jalr(sim, rs, rt, rd, shamt, imm):
+    r, d = sim.regs, rd or _DESCARTE
+
+    def jalr(pc):
+        destino = r[rs]
+        if destino & 3:
+            raise SimulationError(f'jalr para endereço desalinhado 0x{destino:08x} em 0x{pc:08x}')
+        r[d] = (pc + 4) & M
+        return destino
+    return jalr
+
+
+def _syscall(sim, rs, rt, rd, shamt, imm):
+    def syscall(pc):
+        if sim.syscall_hook(sim):
+            sim.motivo = 'exit'
+            sim.pc = pc + 4
+            return _PARA
+        return pc + 4
+    return syscall
+
+
+def _break(sim, rs, rt, rd, shamt, imm):
+    def brk(pc):
+        sim.motivo = 'break'
+        sim.pc = pc + 4
+        return _PARA
+    return brk
+
+
+def _addi(sim, rs, rt, rd, shamt, imm):
+    r, d, k = sim.regs, rt or _DESCARTE, _sext16(imm) & M
+
+    def addi(pc):
+        a = r[rs]
+        s = (a + k) & M
+        if ~(a ^ k) & (a ^ s) & 0x80000000:
+            _overflow(pc)
+        r[d] = s
+        return pc + 4
+    return addi
+
+
+def _alu_i(operacao, estende_sinal: bool):
+    # fábrica pros I simples: rt = operacao(rs, imediato)
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, d = sim.regs, rt or _DESCARTE
+        k = _sext16(imm) & M if estende_sinal else imm
+
+        def handler(pc):
+            r[d] = operacao(r[rs], k)
+            return pc + 4
+        return handler
+    return fabrica
+
+
+def _lui(sim, rs, rt, rd, shamt, imm):
+    r, d, k = sim.regs, rt or _DESCARTE, imm << 16
+
+    def lui(pc):
+        r[d] = k
+        return pc + 4
+    return lui
+
+
+def _desvio(condicao, usa_rt: bool):
+    # beq/bne comparam rs com rt; bgez/bgtz/blez olham só o rs (com sinal)
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, deslocamento = sim.regs, _sext16(imm) << 2
+        if usa_rt:
+            def handler(pc):
+                if condicao(r[rs], r[rt]):
+                    return (pc + 4 + deslocamento) & M
+                return pc + 4
+        else:
+            def handler(pc):
+                if condicao(_com_sinal(r[rs])):
+                    return (pc + 4 + deslocamento) & M
+                return pc + 4
+        return handler
+    return fabrica
+
+
+def _load(tamanho: int, sinal: bool, banco: str = 'regs'):
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, destino, k, le = sim.regs, getattr(sim, banco), _sext16(imm), sim.memoria.le
+        d = rt if banco == 'fpr' else rt or _DESCARTE
+        bit_sinal = 1 << (8 * tamanho - 1)
+
+        def handler(pc):
+            valor = le((r[rs] + k) & M, tamanho)
+            if sinal and valor & bit_sinal:
+                valor = (valor - (bit_sinal << 1)) & M
+            destino[d] = valor
+            return pc + 4
+        return handler
+    return fabrica
+
+
+def _store(tamanho: int, banco: str = 'regs'):
+    def fabrica(sim, rs, rt, rd, shamt, imm):
+        r, origem, k, escreve = sim.regs, getattr(sim, banco), _sext16(imm), sim.memoria.escreve
+
+        def handler(pc):
+            endereco = (r[rs] + k) & M
+            escreve(endereco, tamanho, origem[rt])
+            if sim.base <= endereco < sim.fim_texto:
+                sim._reescreve((endereco - sim.base) >> 2)
+            return pc + 4
+        return handler
+    return fabrica
+
+
+def _jump(liga: bool):
+    def fabrica(sim, rs, rt, rd, shamt, imm, address=0):
+        r, alvo = sim.regs, address << 2
+        if liga:
+            def handler(pc):
+                r[31] = (pc + 4) & M
+                return ((pc + 4) & 0xF0000000) | alvo
+        else:
+            def handler(pc):
+                return ((pc + 4) & 0xF0000000) | alvo
+        return handler
+    return fabrica
+
+
+# nome da instrução -> fábrica do handler. Cobre tudo que está em OPCODES e FUNCTIONS
+FABRICAS = {
+    # tipo R
+    'add': _add,
+    'addu': _alu_r(lambda a, b: (a + b) & M),
+    'and': _alu_r(lambda a, b: a & b),
+    'break': _break,
+    'div': _div(True),
+    'divu': _div(False),
+    'jalr': _jalr,
+    'jr': _jr,
+    'mfhi': _mfhilo(0),
+    'mflo': _mfhilo(1),
+    'mthi': _mthilo(0),
+    'mtlo': _mthilo(1),
+    'mult': _mult(True),
+    'multu': _mult(False),
+    'nor': _alu_r(lambda a, b: ~(a | b) & M),
+    'or': _alu_r(lambda a, b: a | b),
+    'sll': _shift(lambda x, n: (x << n) & M, False),
+    'sllv': _shift(lambda x, n: (x << n) & M, True),
+    'slt': _alu_r(lambda a, b: int(_com_sinal(a) < _com_sinal(b))),
+    'sltu': _alu_r(lambda a, b: int(a < b)),
+    'sra': _shift(lambda x, n: (_com_sinal(x) >> n) & M, False),
+    'srav': _shift(lambda x, n: (_com_sinal(x) >> n) & M, True),
+    'srl': _shift(lambda x, n: x >> n, False),
+    'srlv': _shift(lambda x, n: x >> n, True),
+    'sub': _sub,
+    'subu': _alu_r(lambda a, b: (a - b) & M),
+    'syscall': _syscall,
+    'xor': _alu_r(lambda a, b: a ^ b),
+    # tipo I
+    'addi': _addi,
+    'addiu': _alu_i(lambda a, k: (a + k) & M, True),
+    'andi': _alu_i(lambda a, k: a & k, False),
+    'beq': _desvio(lambda a, b: a == b, True),
+    'bne': _desvio(lambda a, b: a != b, True),
+    # o decodificador chama todo opcode 1 de bgez, então aqui também
+    'bgez': _desvio(lambda a: a >= 0, False),
+    'bgtz': _desvio(lambda a: a > 0, False),
+    'blez': _desvio(lambda a: a <= 0, False),
+    'lb': _load(1, True),
+    'lbu': _load(1, False),
+    'lh': _load(2, True),
+    'lhu': _load(2, False),
+    'lw': _load(4, False),
+    'lwc1': _load(4, False, 'fpr'),
+    'lui': _lui,
+    'ori': _alu_i(lambda a, k: a | k, False),
+    'sb': _store(1),
+    'sh': _store(2),
+    'sw': _store(4),
+    'swc1': _store(4, 'fpr'),
+    'slti': _alu_i(lambda a, k: int(_com_sinal(a) < _com_sinal(k)), True),
+    'sltiu': _alu_i(lambda a, k: int(a < k), True),
+    'xori': _alu_i(lambda a, k: a ^ k, False),
+    # tipo J
+    'j': _jump(False),
+    'jal': _jump(True),
+}
+
+
+def _desconhecida(word: int):
+    def handler(pc):
+        raise SimulationError(f'instrução desconhecida 0x{word:08x} em 0x{pc:08x}')
+    return handler
+
+
+class MIPSSimulator:
+
+    def __init__(self, endian: str = 'big', syscall_hook=syscall_padrao, saida=None) -> None:
+        # 32 registradores + a posição de descarte das escritas em $zero
+        self.regs = [0] * 33
+        self.hilo = [0, 0]  # [HI, LO]
+        self.fpr = [0] * 32  # registradores do coprocessador 1 (só pra lwc1/swc1), valores crus de 32 bits
+        self.memoria = Memoria(endian)
+        self.syscall_hook = syscall_hook
+        self.saida = saida if saida is not None else sys.stdout
+        self.pc = TEXTO_BASE
+        self.base = TEXTO_BASE
+        self.fim_texto = TEXTO_BASE  # endereço logo depois da última palavra carregada
+        self._tabela = []
+        self._palavras = []
+        self._acessos = []
+        self.codigo_saida = None
+        self.motivo = None
+        self.instrucoes = 0
+        self.segundos = 0.0
+        self.regs[28] = GP_INICIAL
+        self.regs[29] = SP_INICIAL
+
+    @property
+    def hi(self) -> int:
+        return self.hilo[0]
+
+    @property
+    def lo(self) -> int:
+        return self.hilo[1]
+
+    def load(self, palavras, base: int = TEXTO_BASE) -> None:
+        # coloca o programa na memória e pré-decodifica cada palavra num handler. Aceita uma lista de
+        # palavras ou um DecodedProgram (aí usa o base dele)
+        if hasattr(palavras, 'word') and hasattr(palavras, 'base'):
+            base = palavras.base
+            palavras = palavras.word
+        self.base = self.pc = base
+        palavras = list(palavras)
+        self.fim_texto = base + 4 * len(palavras)
+        # as listas são trocadas no lugar pelo _reescreve, então o run() já em andamento vê o handler novo
+        self._tabela = [None] * len(palavras)
+        self._palavras = [0] * len(palavras)
+        self._acessos = [None] * len(palavras)
+        for i, w in enumerate(palavras):
+            self.memoria.escreve(base + 4 * i, 4, w)
+            self._prepara(i, w)
+
+    def _prepara(self, i: int, w: int) -> None:
+        self._tabela[i] = self.predecodifica(w)
+        self._palavras[i] = w
+        # pro rastreia(): de onde sai o endereço de memória das loads/stores (rs + imediato com sinal),
+        # contando lwc1/swc1, que não têm MemRead/MemWrite na ROM
+        if ACESSO_MEMORIA[((w >> 20) & 0xFC0) | (w & 0x3F)]:
+            self._acessos[i] = ((w >> 21) & 31, _sext16(w & 0xFFFF))
+        else:
+            self._acessos[i] = None
+
+    def _reescreve(self, i: int) -> None:
+        # uma store caiu na palavra i do programa: decodifica de novo o que ficou na memória
+        self._prepara(i, self.memoria.le(self.base + 4 * i, 4))
+
+    def predecodifica(self, w: int):
+        # usa a mesma tabela de nomes do decodificador pra escolher a fábrica do handler
+        nome = NOMES[ID_NOME_ROM[((w >> 20) & 0xFC0) | (w & 0x3F)]]
+        fabrica = FABRICAS.get(nome)
+        if fabrica is None:
+            return _desconhecida(w)
+        rs, rt, rd, shamt, imm = (w >> 21) & 31, (w >> 16) & 31, (w >> 11) & 31, (w >> 6) & 31, w & 0xFFFF
+        if nome in ('j', 'jal'):
+            return fabrica(self, rs, rt, rd, shamt, imm, w & 0x3FFFFFF)
+        return fabrica(self, rs, rt, rd, shamt, imm)
+
+    def run(self, max_instrucoes: int = None) -> dict:
+        # roda até sair do programa, chegar num syscall de saída/break ou bater no limite de instruções
+        tabela, base, n = self._tabela, self.base, len(self._tabela)
+        limite = max_instrucoes if max_instrucoes is not None else 1 << 62
+        pc = self.pc
+        executadas = 0
+        self.motivo = None
+        inicio = time.perf_counter()
+        try:
+            while executadas < limite:
+                i = (pc - base) >> 2
+                if not 0 <= i < n:
+                    break
+                pc = tabela[i](pc)
+                executadas += 1
+        finally:
+            self.segundos += time.perf_counter() - inicio
+            self.instrucoes += executadas
+            if pc != _PARA:
+                self.pc = pc
+        if self.motivo is None:
+            self.motivo = 'limite' if executadas >= limite else 'fim'
+        return self.estatisticas()
+
+    def rastreia(self, max_instrucoes: int = None):
+        # igual ao run, mas é um gerador que devolve um evento por instrução executada:
+        # (pc, palavra, próximo pc, endereço de memória acessado ou None). É o trace que o pipeline.py consome
+        tabela, palavras, acessos = self._tabela, self._palavras, self._acessos
+        base, n, r = self.base, len(tabela), self.regs
+        limite = max_instrucoes if max_instrucoes is not None else 1 << 62
+        pc = self.pc
+        executadas = 0
+        self.motivo = None
+        inicio = time.perf_counter()
+        try:
+            while executadas < limite:
+                i = (pc - base) >> 2
+                if not 0 <= i < n:
+                    break
+                acesso = acessos[i]
+                endereco = (r[acesso[0]] + acesso[1]) & M if acesso is not None else None
+                proximo = tabela[i](pc)
+                executadas += 1
+                evento = (pc, palavras[i], self.pc if proximo == _PARA else proximo, endereco)
+                pc = proximo
+                yield evento
+        finally:
+            self.segundos += time.perf_counter() - inicio
+            self.instrucoes += executadas
+            if pc != _PARA:
+                self.pc = pc
+            if self.motivo is None:
+                self.motivo = 'limite' if executadas >= limite else 'fim'
+
+    def step(self) -> dict:
+        return self.run(1)
+
+    def estatisticas(self) -> dict:
+        return {
+            'instrucoes': self.instrucoes,
+            'segundos': self.segundos,
+            'ips': self.instrucoes / self.segundos if self.segundos else 0.0,
+            'motivo': self.motivo,
+        }
+
+    def get_register(self, registrador) -> int:
+        # aceita o número ou o nome ('$t0')
+        if isinstance(registrador, str):
+            registrador = MIPSDecoder.get_register_index(registrador)
+        return self.regs[registrador]
+
+    def set_register(self, registrador, valor: int) -> None:
+        if isinstance(registrador, str):
+            registrador = MIPSDecoder.get_register_index(registrador)
+        if registrador:
+            self.regs[registrador] = valor & M
+
+    def registers(self) -> dict:
+        # banco de registradores com os nomes do MIPSDecoder.REGISTERS
+        return {MIPSDecoder.REGISTERS[i]: self.regs[i] for i in range(32)}
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# os módulos do decodificador se importam pelo nome (import lote, from programa import ...), então a pasta
+# TrabalhoDecodificador precisa estar no caminho de import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,31 @@
+import benchmark
+from decodificador_bruno_c_t_elias import MIPSDecoder
+
+
+def test_cada_rodada_comeca_com_cache_frio():
+    decoders = []
+
+    def fabrica():
+        decoders.append(MIPSDecoder(cache_size=64))
+        return decoders[-1].decode_cached
+
+    palavras = list(range(0, 4 * 100, 4))
+    resultado = benchmark._mede(fabrica, palavras)
+    # uma decodificação nova pra rodada de tempo e outra pra de memória, as duas sem acerto no cache
+    assert len(decoders) == 2
+    assert [d.cache_hits for d in decoders] == [0, 0]
+    assert [d.cache_misses for d in decoders] == [100, 100]
+    assert resultado['pico_memoria_bytes'] > 0
+
+
+def test_roda_pequeno():
+    resultado = benchmark.roda(n=200, seed=1)
+    assert resultado['resultados']['realista/decode_cached']['chamadas'] == 200
+    assert resultado['resultados']['aleatorio/decode_cached']['pico_memoria_bytes'] > 0
+    assert 'cenário' in benchmark.formata(resultado, resultado)
+
+
+def test_percentis_sao_de_media_por_lote():
+    resultado = benchmark._mede(lambda: abs, list(range(benchmark.TAMANHO_LOTE * 3)))
+    assert set(resultado['latencia_media_lote_ns']) == {'p50', 'p90', 'p99'}
+    assert 'latencia_ns' not in resultado
@@ -0,0 +1,95 @@
+import pytest
+
+from cache import Cache, CacheHierarchy
+from montador import assemble_line
+
+
+def _acessos(cache, enderecos, escrita=False):
+    return [cache.acessa(endereco, escrita) for endereco in enderecos]
+
+
+def test_mapeamento_direto():
+    # 64 bytes, linhas de 16: 4 conjuntos de 1 via. 0x40 cai no mesmo conjunto do 0x00
+    cache = Cache('D', tamanho=64, associatividade=1, linha=16)
+    assert _acessos(cache, [0x00, 0x04, 0x40, 0x00, 0x10, 0x1C]) == [False, True, False, False, False, True]
+    e = cache.estatisticas()
+    assert (e['acessos'], e['falhas'], e['falhas_leitura']) == (6, 4, 4)
+    assert e['acessos_memoria'] == 4 and e['writebacks'] == 0
+
+
+@pytest.mark.parametrize('substituicao, esperado', [
+    # blocos 0, 2, 0, 4, 2, 4, 0 no conjunto 0 de uma cache de 2 conjuntos com 2 vias
+    ('LRU', [False, False, True, False, False, True, False]),  # o 4 expulsa o 2; o 2 expulsa o 0
+    ('FIFO', [False, False, True, False, True, True, False]),  # o 4 expulsa o 0 (mais antigo)
+])
+def test_associativa(substituicao, esperado):
+    cache = Cache('A', tamanho=64, associatividade=2, linha=16, substituicao=substituicao)
+    assert _acessos(cache, [b * 16 for b in (0, 2, 0, 4, 2, 4, 0)]) == esperado
+    assert cache.estatisticas()['falhas'] == esperado.count(False)
+
+
+def test_write_back_suja_e_expulsa():
+    cache = Cache('D', tamanho=64, associatividade=1, linha=16)
+    assert cache.acessa(0x00, True) is False  # aloca e fica suja
+    assert cache.acessa(0x08, True) is True
+    assert cache.acessa(0x40) is False  # expulsa a linha suja
+    e = cache.estatisticas()
+    assert (e['falhas_escrita'], e['falhas_leitura'], e['writebacks']) == (1, 1, 1)
+    # 2 buscas de linha + 1 writeback
+    assert e['acessos_memoria'] == 3
+    cache.acessa(0x40, True)
+    cache.esvazia()
+    assert cache.estatisticas()['writebacks'] == 2
+
+
+def test_write_through_sem_alocacao():
+    cache = Cache('D', tamanho=64, associatividade=1, linha=16, escrita='write-through')
+    assert cache.acessa(0x00, True) is False  # não aloca
+    assert cache.acessa(0x00) is False
+    assert cache.acessa(0x00, True) is True
+    e = cache.estatisticas()
+    assert (e['escritas_diretas'], e['writebacks'], e['acessos_memoria']) == (2, 0, 3)
+
+
+def test_l1_busca_na_l2():
+    l2 = Cache('L2', tamanho=256, associatividade=2, linha=32)
+    l1 = Cache('L1', tamanho=64, associatividade=1, linha=16, proximo=l2)
+    _acessos(l1, [0x00, 0x10, 0x00, 0x40, 0x00])
+    # L1: 0x00 falha, 0x10 falha, 0x00 acerta, 0x40 falha (expulsa o 0x00), 0x00 falha
+    assert l1.estatisticas()['falhas'] == 4 and l1.estatisticas()['acessos_memoria'] == 0
+    # L2 recebe as 4 buscas: 0x00 falha, 0x10 acerta (mesma linha de 32), 0x40 falha, 0x00 acerta
+    e = l2.estatisticas()
+    assert (e['leituras'], e['falhas'], e['acessos_memoria']) == (4, 2, 2)
+
+
+def test_writeback_da_l1_vira_escrita_na_l2():
+    l2 = Cache('L2', tamanho=256, associatividade=2, linha=32)
+    l1 = Cache('L1', tamanho=64, associatividade=1, linha=16, proximo=l2)
+    l1.acessa(0x00, True)
+    l1.acessa(0x40)
+    e = l2.estatisticas()
+    assert (e['leituras'], e['escritas'], e['falhas_escrita']) == (2, 1, 0)
+
+
+def test_hierarquia_por_pc_e_regiao():
+    lw, sw, add = assemble_line('lw $t0, 0($sp)'), assemble_line('sw $t0, 0($sp)'), assemble_line('add $t0, $t0, $t0')
+    trace = [
+        (0x400000, lw, 0x400004, 0x7FFF0000),
+        (0x400004, add, 0x400008, None),
+        (0x400008, sw, 0x40000C, 0x7FFF0000),
+        (0x40000C, lw, 0x400010, 0x10010000),
+    ]
+    r = CacheHierarchy().processa(trace)
+    assert r['instrucoes'] == 4
+    assert r['niveis']['L1I']['falhas'] == 1  # as 4 buscas na mesma linha de 32 bytes
+    l1d = r['niveis']['L1D']
+    assert (l1d['leituras'], l1d['escritas'], l1d['falhas']) == (2, 1, 2)
+    assert r['por_pc'][0x400008] == {'buscas': 1, 'falhas_busca': 0, 'acessos_dados': 1, 'falhas_dados': 0}
+    assert r['por_regiao'][0x7FFF0000] == {'acessos': 2, 'falhas': 1}
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        Cache('X', linha=24)
+    with pytest.raises(ValueError):
+        Cache('X', substituicao='MRU')
@@ -0,0 +1,174 @@
+import struct
+
+import numpy as np
+import pytest
+
+import carregadores
+from carregadores import LoaderError, blocos, blocos_elf, blocos_ihex, blocos_objdump, blocos_texto, carrega_programa
+
+PALAVRAS = [0x3C1C0042, 0x279C8000, 0x8F998010, 0x03200008, 0x00000000, 0xAFBF001C] * 50
+
+
+def _elf(caminho, palavras, endereco=0x00400000):
+    # ELF32 big-endian MIPS mínimo: seção nula, .text e .shstrtab
+    texto = np.array(palavras, dtype='>u4').tobytes()
+    nomes = b'\x00.text\x00.shstrtab\x00'
+    offset_texto = 52
+    offset_nomes = offset_texto + len(texto)
+    shoff = offset_nomes + len(nomes)
+    cabecalho = b'\x7fELF' + bytes([1, 2, 1]) + bytes(9) + \
+        struct.pack('>HHIIIIIHHHHHH', 2, 8, 1, endereco, 0, shoff, 0, 52, 0, 0, 40, 3, 2)
+    secoes = bytes(40) + \
+        struct.pack('>IIIIIIIIII', 1, 1, 6, endereco, offset_texto, len(texto), 0, 0, 4, 0) + \
+        struct.pack('>IIIIIIIIII', 7, 3, 0, 0, offset_nomes, len(nomes), 0, 0, 1, 0)
+    caminho.write_bytes(cabecalho + texto + nomes + secoes)
+    return str(caminho)
+
+
+def _junta(fonte):
+    enderecos, palavras = zip(*fonte)
+    return np.concatenate(enderecos).tolist(), np.concatenate(palavras).tolist()
+
+
+def test_texto_sem_quebra_de_linha_vem_em_pedacos(tmp_path, monkeypatch):
+    caminho = tmp_path / 'dump.txt'
+    caminho.write_text(' '.join(f'{w:08x}' for w in PALAVRAS))
+    tamanhos = []
+    original = carregadores._pedacos_texto
+
+    def espiona(*args):
+        for pedaco in original(*args):
+            tamanhos.append(len(pedaco))
+            yield pedaco
+
+    monkeypatch.setattr(carregadores, '_pedacos_texto', espiona)
+    enderecos, palavras = _junta(blocos_texto(str(caminho), tamanho_bloco=16, endereco=0x1000))
+    assert palavras == PALAVRAS
+    assert enderecos == [0x1000 + 4 * i for i in range(len(PALAVRAS))]
+    assert len(tamanhos) > 1 and max(tamanhos) <= 16 * 9
+
+
+@pytest.mark.parametrize('formato', ['0x{:08x}', '{:032b}', '0b{:032b}'])
+def test_texto_cortado_no_meio_do_token(tmp_path, formato):
+    caminho = tmp_path / 'dump.txt'
+    caminho.write_text('\t'.join(formato.format(w) for w in PALAVRAS))
+    base = 2 if formato.startswith('{:032b') else 0 if formato.startswith('0b') else 16
+    assert _junta(blocos_texto(str(caminho), base=base, tamanho_bloco=5))[1] == PALAVRAS
+
+
+def test_objdump_em_pedacos(tmp_path):
+    linhas = ['', 'Disassembly of section .text:', '', '00400000 <main>:']
+    linhas += [f'  {0x400000 + 4 * i:x}:\t{w:08x} \tinstr' for i, w in enumerate(PALAVRAS)]
+    caminho = tmp_path / 'dump.objdump'
+    caminho.write_text('\n'.join(linhas))
+    enderecos, palavras = _junta(blocos_objdump(str(caminho), tamanho_bloco=2))
+    assert palavras == PALAVRAS
+    assert enderecos[0] == 0x400000 and enderecos[-1] == 0x400000 + 4 * (len(PALAVRAS) - 1)
+
+
+def test_detecta_elf_ignorando_opcoes_de_outro_formato(tmp_path):
+    caminho = _elf(tmp_path / 'programa.elf', PALAVRAS)
+    programa = carrega_programa(caminho, endian='little', base=2)
+    assert programa.base == 0x00400000
+    assert list(programa.word) == PALAVRAS
+
+
+def test_opcao_desconhecida(tmp_path):
+    caminho = _elf(tmp_path / 'programa.elf', PALAVRAS)
+    with pytest.raises(TypeError):
+        blocos(caminho, endianess='little')
+
+
+@pytest.mark.parametrize('texto, base', [
+    ('00000000 100x5 00000001', 16),
+    ('0x0x10', 16),
+    ('0x', 16),
+    ('-5 10', 16),
+    ('1_0', 16),
+    ('0b101 10b1', 2),
+    ('0b2', 2),
+])
+def test_token_malformado(tmp_path, texto, base):
+    caminho = tmp_path / 'dump.txt'
+    caminho.write_text(texto)
+    with pytest.raises(ValueError):
+        list(blocos_texto(str(caminho), base=base))
+
+
+def test_prefixo_so_no_comeco_do_token(tmp_path):
+    caminho = tmp_path / 'dump.txt'
+    caminho.write_text('0x10 0X1f\n20')
+    assert _junta(blocos_texto(str(caminho)))[1] == [0x10, 0x1F, 0x20]
+
+
+# ---------------------------------------------------------------- Intel HEX
+
+
+def _registro(tipo, endereco, dados=b''):
+    corpo = bytes([len(dados), endereco >> 8, endereco & 0xFF, tipo]) + dados
+    return ':' + (corpo + bytes([-sum(corpo) & 0xFF])).hex().upper()
+
+
+def _ihex(caminho, registros):
+    caminho.write_text('\n'.join(registros) + '\n')
+    return str(caminho)
+
+
+def test_ihex_dados_e_enderecos_estendidos(tmp_path):
+    texto = np.array(PALAVRAS[:8], dtype='>u4').tobytes()
+    caminho = _ihex(tmp_path / 'programa.hex', [
+        _registro(4, 0, b'\x00\x40'),  # endereço linear estendido: 0x0040xxxx
+        _registro(0, 0x0000, texto[:16]),
+        _registro(0, 0x0010, texto[16:]),  # continua o mesmo trecho
+        _registro(2, 0, b'\x10\x00'),  # segmento estendido: 0x1000 << 4 = 0x10000
+        _registro(0, 0x0100, texto[:4]),
+        _registro(5, 0, b'\x00\x40\x00\x00'),  # endereço de início, ignorado
+        _registro(1, 0),
+        _registro(0, 0x0200, texto[:4]),  # depois do fim: ignorado
+    ])
+    trechos = list(blocos_ihex(caminho))
+    assert [(t[0].tolist(), t[1].tolist()) for t in trechos] == [
+        ([0x400000 + 4 * i for i in range(8)], PALAVRAS[:8]),
+        ([0x10100], PALAVRAS[:1]),
+    ]
+
+
+def test_ihex_little_endian_em_blocos(tmp_path):
+    texto = np.array(PALAVRAS[:8], dtype='<u4').tobytes()
+    caminho = _ihex(tmp_path / 'programa.hex', [_registro(0, 0x1000, texto), _registro(1, 0)])
+    enderecos, palavras = _junta(blocos_ihex(caminho, endian='little', tamanho_bloco=3))
+    assert palavras == PALAVRAS[:8]
+    assert enderecos == [0x1000 + 4 * i for i in range(8)]
+
+
+def test_ihex_detectado_pelo_conteudo(tmp_path):
+    texto = np.array(PALAVRAS[:4], dtype='>u4').tobytes()
+    caminho = _ihex(tmp_path / 'programa.hex', [_registro(0, 0x40, texto), _registro(1, 0)])
+    programa = carrega_programa(caminho, base=2)
+    assert programa.base == 0x40 and list(programa.word) == PALAVRAS[:4]
+
+
+@pytest.mark.parametrize('linha', [
+    _registro(0, 0, b'\x00\x00\x00\x00')[:-2] + '00',  # checksum errado
+    _registro(0, 0, b'\x00\x00\x00\x00')[1:],  # sem ':'
+    ':050000000000000000FB',  # tamanho declarado não confere
+    ':0G000001FF',  # caractere inválido
+    _registro(6, 0),  # tipo desconhecido
+])
+def test_ihex_registro_invalido(tmp_path, linha):
+    caminho = _ihex(tmp_path / 'programa.hex', [linha, _registro(1, 0)])
+    with pytest.raises(LoaderError):
+        list(blocos_ihex(caminho))
+
+
+def test_ihex_trecho_sem_palavra_inteira(tmp_path):
+    caminho = _ihex(tmp_path / 'programa.hex', [_registro(0, 0, b'\x01\x02\x03'), _registro(1, 0)])
+    with pytest.raises(LoaderError):
+        list(blocos_ihex(caminho))
+
+
+def test_elf_vazio(tmp_path):
+    caminho = tmp_path / 'vazio.elf'
+    caminho.write_bytes(b'')
+    with pytest.raises(LoaderError):
+        list(blocos_elf(str(caminho)))
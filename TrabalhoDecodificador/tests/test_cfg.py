@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+import pytest
+
+from cfg import ControlFlowGraph
+from programa import DecodedProgram
+
+BASE = 0x00400000
+
+
+def _palavra(aleatorio, n):
+    # mistura de desvios/saltos com alvo dentro (e às vezes fora) do programa e instruções comuns
+    i = aleatorio.randrange(n)
+    alvo = aleatorio.randrange(-2, n + 2)
+    escolha = aleatorio.randrange(8)
+    if escolha == 0:  # beq/bne relativo ao pc + 4
+        return (aleatorio.choice((0b000100, 0b000101)) << 26) | (8 << 21) | (9 << 16) | ((alvo - i - 1) & 0xFFFF)
+    if escolha == 1:  # j/jal absoluto
+        return (aleatorio.choice((0b000010, 0b000011)) << 26) | (((BASE >> 2) + alvo) & 0x3FFFFFF)
+    if escolha == 2:
+        return (31 << 21) | 0b001000  # jr $ra
+    return (8 << 21) | (9 << 16) | (10 << 11) | 0b100000  # add $t2, $t0, $t1
+
+
+def _programa(aleatorio, n):
+    return [_palavra(aleatorio, n) for _ in range(n)]
+
+
+def _estado(grafo):
+    # tudo que o patch precisa manter igual a uma construção do zero
+    return (
+        grafo.lideres,
+        grafo.sucessores,
+        {lider: sorted(preds) for lider, preds in grafo.predecessores.items() if preds},
+        grafo.lider.tolist(),
+        grafo.fluxo.tolist(),
+        grafo.alvo.tolist(),
+        grafo.entradas.tolist(),
+        grafo.chamadas.tolist(),
+    )
+
+
+@pytest.mark.parametrize('semente', range(20))
+def test_patch_igual_a_reconstruir(semente):
+    aleatorio = random.Random(semente)
+    n = aleatorio.randrange(1, 80)
+    grafo = ControlFlowGraph(DecodedProgram.from_words(_programa(aleatorio, n), BASE))
+    for _ in range(30):
+        inicio = aleatorio.randrange(n)
+        tamanho = aleatorio.randrange(1, min(4, n - inicio) + 1)
+        grafo.patch(inicio, [_palavra(aleatorio, n) for _ in range(tamanho)])
+        do_zero = ControlFlowGraph(DecodedProgram.from_words(list(grafo.programa.word), BASE))
+        assert _estado(grafo) == _estado(do_zero)
+
+
+def test_blocos_cobrem_o_programa():
+    aleatorio = random.Random(1)
+    grafo = ControlFlowGraph(DecodedProgram.from_words(_programa(aleatorio, 100), BASE))
+    blocos = list(grafo.blocos())
+    assert blocos[0][0] == 0 and blocos[-1][1] == 100
+    assert all(fim == proximo for (_, fim), (proximo, _) in zip(blocos, blocos[1:]))
+    assert np.array_equal(np.flatnonzero(grafo.lider), [inicio for inicio, _ in blocos])
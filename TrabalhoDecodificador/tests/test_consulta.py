@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+import pytest
+
+from consulta import InvertedIndex
+from decodificador_bruno_c_t_elias import ID_NOME
+from montador import assemble_line
+from programa import DecodedProgram
+
+TEXTOS = ['sw $t0, 4($sp)', 'lw $t1, 8($sp)', 'addi $sp, $sp, -16', 'add $t2, $t0, $t1', 'jr $t9',
+          'jalr $ra, $t9', 'beq $t0, $zero, 3', 'lui $at, 0x1000', 'lw $t0, 0x2000($gp)', 'j 0x00400000']
+
+
+def _programa(n, semente=0):
+    aleatorio = random.Random(semente)
+    return DecodedProgram.from_words([assemble_line(aleatorio.choice(TEXTOS)) for _ in range(n)])
+
+
+def _forca_bruta(programa, condicao):
+    return [i for i, instr in enumerate(programa) if condicao(instr)]
+
+
+@pytest.mark.parametrize('filtros, condicao', [
+    ({'nome': 'sw', 'rs': '$sp'}, lambda x: x.name == 'sw' and x.rs == 29),
+    ({'nome': ('jr', 'jalr'), 'rs': '$t9'}, lambda x: x.name in ('jr', 'jalr') and x.rs == 25),
+    ({'registrador': '$t0', 'tipo': 'I'}, lambda x: x.type.name == 'I' and x.name != 'lui' and 8 in (x.rs, x.rt)),
+    ({'registrador': '$zero'}, lambda x: x.name == 'beq'),  # só o beq usa o $zero; jr/j/lui não contam
+    ({'rd': '$zero'}, lambda x: False),
+    ({'nome': 'lw', 'rt': ('$t0', '$t1'), 'rs': '$sp'}, lambda x: x.name == 'lw' and x.rt in (8, 9) and x.rs == 29),
+    ({'nome': 'add', 'opcode': 0b100011}, lambda x: False),
+])
+def test_consulta_igual_a_forca_bruta(filtros, condicao):
+    programa = _programa(500)
+    indice = InvertedIndex(programa)
+    assert indice.consulta(**filtros).tolist() == _forca_bruta(programa, condicao)
+
+
+def test_consulta_com_onde_e_crescimento():
+    programa = _programa(200)
+    indice = InvertedIndex(programa)
+    indice.consulta(nome='lw')  # guarda as cópias das listas antes do programa crescer
+    programa.extend(list(_programa(300, semente=1).word))
+    resultado = indice.consulta(nome='lw', onde={'immediate': lambda v: v > 4096})
+    assert resultado.tolist() == _forca_bruta(programa, lambda x: x.name == 'lw' and x.immediate > 4096)
+
+
+def test_resultado_pode_ser_alterado_sem_estragar_o_indice():
+    indice = InvertedIndex(_programa(100))
+    esperado = indice.consulta(nome='sw').tolist()
+    indice.consulta(nome='sw')[:] = 0
+    indice.lista('nome', 'sw')[:] = 0
+    assert indice.consulta(nome='sw').tolist() == esperado
+
+
+def test_reconstroi_depois_do_patch():
+    programa = _programa(100)
+    indice = InvertedIndex(programa)
+    programa.patch(0, [assemble_line('sw $t0, 4($sp)')] * 10)
+    indice.reconstroi()
+    assert indice.consulta(nome='sw').tolist() == _forca_bruta(programa, lambda x: x.name == 'sw')
+    assert np.all(np.diff(indice.lista('registrador', '$sp').astype(np.int64)) > 0)
+
+
+def test_lista_cresce_sem_copiar_o_que_ja_saiu():
+    programa = _programa(10)
+    indice = InvertedIndex(programa)
+    antes = indice.lista('nome', 'sw')
+    visao = indice._array('nome', ID_NOME['sw'])
+    programa.extend([assemble_line('sw $t0, 4($sp)')] * 1000)
+    depois = indice.consulta(nome='sw')
+    assert visao.tolist() == antes.tolist()  # a visão antiga não enxerga os novos
+    assert depois.tolist() == _forca_bruta(programa, lambda x: x.name == 'sw')
+    lista = indice.listas['nome'][ID_NOME['sw']]
+    assert len(lista) == len(depois) and len(lista.dados) < 2 * len(depois) + 8
+
+
+def test_valores_invalidos_sao_value_error():
+    indice = InvertedIndex(_programa(10))
+    for filtros in ({'tipo': 'X'}, {'nome': 'nada'}, {'rs': '$xx'}, {'cor': 1}):
+        with pytest.raises(ValueError):
+            indice.consulta(**filtros)
@@ -0,0 +1,70 @@
+from dependencias import HI, LO, DependencyIndex
+from montador import assemble
+from pipeline import PipelineModel
+from programa import DecodedProgram
+
+
+def _indice(texto: str) -> DependencyIndex:
+    return DependencyIndex(DecodedProgram.from_words(assemble(texto)))
+
+
+def test_cadeia_e_leitores():
+    d = _indice('''
+        lw $t0, 0($a0)
+        lw $t1, 4($a0)
+        add $t2, $t0, $t1
+        mult $t2, $t0
+        mflo $t3
+        sw $t3, 8($a0)
+    ''')
+    assert d.leitores_de(0).tolist() == [2, 3]
+    assert d.produtores_de(4).tolist() == [3]
+    assert d.destino[3].tolist() == [HI, LO]
+    assert d.cadeia_mais_longa().tolist() == [0, 2, 3, 4, 5]
+    assert d.caminho_critico() == 6  # load 2 + add + mult + mflo + sw
+
+
+def test_mthi_nao_escreve_lo():
+    d = _indice('''
+        mult $a0, $a1
+        mthi $t1
+        mflo $t2
+        mfhi $t3
+    ''')
+    assert d.destino[1].tolist() == [HI, -1]
+    assert d.produtores_de(2).tolist() == [0]
+    assert d.produtores_de(3).tolist() == [1]
+
+
+def test_pipeline_mthi_nao_atrasa_mflo():
+    # sem forwarding o valor leva 3 ciclos; mflo logo depois do mthi não deve esperar por ele
+    palavras = assemble('mthi $t1\nmflo $t2')
+    modelo = PipelineModel(forwarding=False)
+    modelo.processa((4 * i, w, 4 * i + 4) for i, w in enumerate(palavras))
+    assert modelo.stalls['raw'] == 0
+    palavras = assemble('mtlo $t1\nmflo $t2')
+    modelo = PipelineModel(forwarding=False)
+    modelo.processa((4 * i, w, 4 * i + 4) for i, w in enumerate(palavras))
+    assert modelo.stalls['raw'] == 2
+
+
+def test_hi_e_lo_tem_vidas_separadas():
+    d = _indice('''
+        mult $a0, $a1
+        mflo $t0
+        add $t1, $t0, $t0
+        sll $zero, $zero, 0
+        mfhi $t2
+        mtlo $t3
+        mflo $t4
+    ''')
+    assert d.vida(0, '$lo') == (0, 1)
+    assert d.vida(0, '$hi') == (0, 4)
+    assert d.vidas_de(LO).tolist() == [[0, 1], [5, 6]]
+    assert d.vidas_de(HI).tolist() == [[0, 4]]
+    assert d.vida(1) == (1, 2)
+    assert d.vida(2) == (2, 2)  # ninguém lê o $t1
+    assert d.fim_vida[3].tolist() == [-1, -1]
+    por_registrador = d.relatorio()['por_registrador']
+    assert por_registrador['$hi']['vida_media'] == 4.0
+    assert por_registrador['$lo']['vida_media'] == 1.0
@@ -0,0 +1,110 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+import decodificador_original as original
+from decodificador_bruno_c_t_elias import RENDERIZADORES, MIPSDecoder, empacota_sinais, format_output
+
+# Diferença contra o decodificador original (tests/decodificador_original.py): campos, tipo, nome, sinais de
+# controle, texto do print_output e mnemônico, em ~24 mil palavras (aleatórias, aleatórias com opcode/funct
+# conhecido e todo opcode/funct).
+# A única diferença de propósito: nos desvios o original deixava "<label>" no mnemônico, e agora sai o
+# immediate cru.
+
+DESVIOS = {'beq', 'bne', 'bgez', 'bgtz', 'blez'}
+
+
+def _palavras():
+    aleatorio = random.Random(2024)
+    palavras = [aleatorio.getrandbits(32) for _ in range(10000)]
+    conhecidos = [op << 26 for op in original.MIPSDecoder.OPCODES] + list(original.MIPSDecoder.FUNCTIONS)
+    for _ in range(10000):
+        base = aleatorio.choice(conhecidos)
+        meio = aleatorio.getrandbits(26) if base >> 26 else aleatorio.getrandbits(20) << 6
+        palavras.append(base | meio)
+    for indice in range(4096):
+        palavras.append(((indice >> 6) << 26) | aleatorio.getrandbits(20) << 6 | (indice & 0x3F))
+    return palavras
+
+
+def _original(w: int):
+    # decodifica e imprime com o original; devolve (instrução, sinais, texto) ou None se ele quebra
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        instr = original.MIPSDecoder().parse_instruction(f'{w:032b}')
+        inicio = len(saida.getvalue())
+        try:
+            sinais = original.MIPSDecoder.get_sinais_de_controle(instr)
+            original.print_output(instr, sinais)
+        except (KeyError, IndexError):
+            # opcode/funct desconhecido: o original não tinha texto pra eles
+            return None
+    return instr, sinais, saida.getvalue()[inicio:]
+
+
+@pytest.fixture(scope='module')
+def referencia():
+    return [(w, _original(w)) for w in _palavras()]
+
+
+def test_igual_ao_original(referencia):
+    decoder = MIPSDecoder(cache_size=64)
+    desconhecidas = 0
+    for w, esperado in referencia:
+        instr = decoder.decode_word(w)
+        registro = decoder.decode_cached(w)
+        if esperado is None:
+            desconhecidas += 1
+            assert instr.name == registro.name == 'Desconhecido', hex(w)
+            assert MIPSDecoder.get_sinais_empacotados(w) == registro.control == 0
+            continue
+        antigo, sinais, texto = esperado
+        assert instr.fields == antigo.fields == dict(registro.fields), hex(w)
+        assert instr.type.name == registro.type.name == antigo.type.name
+        assert instr.name == registro.name == antigo.name
+        assert dict(decoder.get_sinais_de_controle(instr)) == sinais == dict(MIPSDecoder.get_sinais_da_palavra(w))
+        assert dict(registro.signals) == sinais
+        assert MIPSDecoder.get_sinais_empacotados(w) == registro.control == empacota_sinais(sinais)
+        assert format_output(instr, decoder.get_sinais_de_controle(instr)) == texto
+        mnemonico = antigo.mnemonic
+        if antigo.name in DESVIOS:
+            mnemonico = mnemonico.replace('<label>', str(antigo.fields['immediate']))
+        assert instr.mnemonic == registro.mnemonic == RENDERIZADORES[(w >> 20) & 0xFC0 | w & 0x3F](w) == mnemonico
+    # o corpus tem que cobrir os dois lados
+    assert 0 < desconhecidas < len(referencia) // 2
+
+
+def test_diferenca_fixada_nos_desvios(referencia):
+    diferentes = set()
+    for w, esperado in referencia:
+        if esperado is not None and MIPSDecoder().decode_word(w).mnemonic != esperado[0].mnemonic:
+            diferentes.add(esperado[0].name)
+    assert diferentes == DESVIOS
+    # beq $1, $2, 4: o original mostrava o rótulo sem valor
+    antigo, _, _ = _original(0x10220004)
+    assert antigo.mnemonic == 'beq $at, $v0, <label>'
+    assert MIPSDecoder().decode_word(0x10220004).mnemonic == 'beq $at, $v0, 4'
+
+
+def test_contadores_do_cache():
+    decoder = MIPSDecoder(cache_size=2)
+    a, b, c = 0x012A4020, 0x8C220014, 0x0C000008
+    primeiro = decoder.decode_cached(a)
+    decoder.decode_cached(b)
+    assert decoder.decode_cached(a) is primeiro  # acerto devolve o mesmo registro
+    decoder.decode_cached(c)  # expulsa o b (usado há mais tempo)
+    decoder.decode_cached(b)  # falha de novo e expulsa o a
+    assert decoder.cache_info() == {'hits': 1, 'misses': 4, 'evictions': 2, 'size': 2, 'max_size': 2}
+    decoder.decode_cached(c)
+    assert decoder.cache_info()['hits'] == 2
+    decoder.clear_cache()
+    assert decoder.cache_info() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'max_size': 2}
+
+
+def test_sem_cache_nao_guarda_nada():
+    decoder = MIPSDecoder()
+    for _ in range(3):
+        decoder.decode_cached(0x012A4020)
+    assert decoder.cache_info() == {'hits': 0, 'misses': 3, 'evictions': 0, 'size': 0, 'max_size': 0}
@@ -0,0 +1,35 @@
+import pytest
+
+from instrumentacao import DecoderInstrumentation
+from montador import assemble_line
+
+
+def _usados(texto):
+    instrumentacao = DecoderInstrumentation(tempos=False)
+    instrumentacao.registra(assemble_line(texto))
+    return {r: n for r, n in enumerate(instrumentacao.por_registrador) if n}
+
+
+@pytest.mark.parametrize('texto, esperado', [
+    ('sll $zero, $zero, 0', {0: 1}),  # nop: lê rt, a escrita no $zero não conta
+    ('syscall', {}),
+    ('break', {}),
+    ('jr $ra', {31: 1}),
+    ('jal 0x00400000', {31: 1}),
+    ('lui $t0, 0x1234', {8: 1}),
+    ('bgez $t1, 4', {9: 1}),
+    ('add $t0, $t1, $t2', {8: 1, 9: 1, 10: 1}),
+    ('sw $t0, 4($sp)', {8: 1, 29: 1}),
+    ('addi $t0, $t0, 1', {8: 2}),
+    ('mflo $t3', {11: 1}),
+    ('mult $t0, $t1', {8: 1, 9: 1}),
+])
+def test_conta_so_registradores_usados(texto, esperado):
+    assert _usados(texto) == esperado
+
+
+def test_desconhecida_nao_conta_registrador():
+    instrumentacao = DecoderInstrumentation(tempos=False)
+    instrumentacao.registra(0xFFFFFFFF)
+    assert instrumentacao.desconhecidas == 1
+    assert not any(instrumentacao.por_registrador)
@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+
+import lote
+from decodificador_bruno_c_t_elias import NOMES, MIPSDecoder
+from programa import COLUNAS, DecodedProgram
+
+
+def _palavras(n, semente=0):
+    # aleatórias mais todo opcode/funct com o resto zerado e com o resto cheio de uns
+    aleatorio = random.Random(semente)
+    palavras = [aleatorio.getrandbits(32) for _ in range(n)]
+    for indice in range(4096):
+        base = ((indice >> 6) << 26) | (indice & 0x3F)
+        palavras += [base, base | 0x03FFFFC0]
+    return palavras
+
+
+def test_lote_igual_ao_serial():
+    palavras = _palavras(2000)
+    colunas = lote.decodifica_lote(np.array(palavras, dtype=np.uint32))
+    decoder = MIPSDecoder()
+    for i, w in enumerate(palavras):
+        instr = decoder.decode_cached(w)
+        assert colunas['word'][i] == w
+        assert NOMES[colunas['name'][i]] == instr.name
+        assert colunas['type'][i] == instr.type.value
+        assert colunas['control'][i] == instr.control
+        for campo, valor in instr.fields.items():
+            assert colunas[campo][i] == valor, (hex(w), campo)
+
+
+def test_lote_igual_ao_decodedprogram():
+    palavras = _palavras(500, semente=1)
+    serial = DecodedProgram.from_words(palavras)
+    vetorizado = DecodedProgram.from_colunas(lote.decodifica_lote(palavras))
+    for coluna in COLUNAS:
+        assert getattr(vetorizado, coluna) == getattr(serial, coluna), coluna
+
+
+def test_lote_little_endian(tmp_path):
+    palavras = _palavras(100, semente=2)
+    caminho = tmp_path / 'programa.bin'
+    caminho.write_bytes(np.array(palavras, dtype='<u4').tobytes())
+    colunas = lote.decodifica_arquivo(str(caminho), 'little')
+    assert colunas['word'].tolist() == palavras
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from decodificador_bruno_c_t_elias import ID_NOME_ROM, TESTES, MIPSDecoder
+from montador import AssemblyError, assemble, assemble_line
+
+decoder = MIPSDecoder()
+
+# cada combinação (opcode << 6) | funct que o decodificador conhece
+INDICES_CONHECIDOS = [i for i in range(64 * 64) if ID_NOME_ROM[i] != 0 and (i >> 6 == 0 or i & 0x3F == 0)]
+
+
+@pytest.mark.parametrize('indice', INDICES_CONHECIDOS)
+def test_decodifica_monta_decodifica(indice):
+    # decode(assemble(x)) == x para o texto de qualquer instrução conhecida, com campos aleatórios
+    rng = random.Random(indice)
+    opcode, funct = indice >> 6, indice & 0x3F
+    for _ in range(50):
+        word = (opcode << 26) | (rng.getrandbits(20) << 6) | funct if opcode == 0 else \
+               (opcode << 26) | rng.getrandbits(26)
+        texto = decoder.decode_word(word).mnemonic
+        assert decoder.decode_word(assemble_line(texto)).mnemonic == texto
+
+
+# palavras do corpus com bits num campo que o mnemônico não mostra (rt do jalr/mthi/mtlo): o texto não
+# carrega esses bits, então a montagem devolve a codificação canônica, com o campo zerado
+CANONICAS = {0x00231809: 0x00201809, 0x00300011: 0x00200011, 0x00300013: 0x00200013}
+
+
+@pytest.mark.parametrize('bits', TESTES)
+def test_monta_palavra_do_corpus(bits):
+    word = int(bits, 2)
+    assert assemble_line(decoder.decode_word(word).mnemonic) == CANONICAS.get(word, word)
+
+
+def test_bgez_tem_rt_fixo():
+    # REGIMM: rt = 1 é bgez; rt = 0 seria bltz
+    assert assemble_line('bgez $at, 8') == 0x04210008
+    assert assemble_line('bgez $zero, 0') == 0x04010000
+
+
+def test_aceita_tab_entre_mnemonico_e_operandos():
+    assert assemble_line('add\t$t0, $t1, $t2') == assemble_line('add $t0, $t1, $t2')
+    assert assemble_line('  jr\t$ra  ') == assemble_line('jr $ra')
+
+
+def test_rotulos_em_duas_passadas():
+    palavras = assemble('inicio: addi $t0, $zero, 1\n\tbne $t0, $zero, inicio\n\tj inicio', base=0x400000)
+    assert decoder.decode_word(palavras[1]).fields['immediate'] == 0xFFFE
+    assert decoder.decode_word(palavras[2]).fields['address'] == 0x400000 >> 2
+
+
+def test_erros():
+    with pytest.raises(AssemblyError):
+        assemble_line('foo $t0')
+    with pytest.raises(AssemblyError):
+        assemble('beq $t0, $t1, nao_existe')
+
+
+@pytest.mark.parametrize('linha', ['lw $t0, 4($sp', 'lw $t0, 4$sp)', 'lw $t0, 4)$sp(', 'lw $t0, 4(($sp))',
+                                   'sw $t0, 4($sp) $t1', 'add $t0, ($t1), $t2'])
+def test_parenteses_desbalanceados(linha):
+    with pytest.raises(ValueError):
+        assemble_line(linha)
+
+
+def test_base_sem_deslocamento():
+    assert assemble_line('lw $t0, ($sp)') == assemble_line('lw $t0, 0($sp)')
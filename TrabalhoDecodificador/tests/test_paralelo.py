@@ -0,0 +1,38 @@
+import random
+
+import numpy as np
+import pytest
+
+from paralelo import decodifica_paralelo
+from programa import COLUNAS, DecodedProgram
+
+
+def _palavras(n, semente=0):
+    aleatorio = random.Random(semente)
+    return [aleatorio.getrandbits(32) for _ in range(n)]
+
+
+def _iguais(programa, serial):
+    assert len(programa) == len(serial)
+    assert programa.base == serial.base
+    for coluna in COLUNAS:
+        assert getattr(programa, coluna) == getattr(serial, coluna), coluna
+
+
+@pytest.mark.parametrize('n', [0, 1, 1000, 4099])
+def test_paralelo_igual_ao_serial(n):
+    # blocos pequenos pra forçar vários pedaços (e um último incompleto) espalhados entre os processos
+    palavras = _palavras(n)
+    programa = decodifica_paralelo(palavras, 'palavras', base=0x400000, processos=2, tamanho_bloco=256)
+    _iguais(programa, DecodedProgram.from_words(palavras, 0x400000))
+
+
+def test_paralelo_binario_e_texto(tmp_path):
+    palavras = _palavras(3000, semente=1)
+    serial = DecodedProgram.from_words(palavras)
+    binario = tmp_path / 'programa.bin'
+    binario.write_bytes(np.array(palavras, dtype='<u4').tobytes())
+    _iguais(decodifica_paralelo(str(binario), 'bin', endian='little', processos=2, tamanho_bloco=500), serial)
+    texto = tmp_path / 'programa.txt'
+    texto.write_text(''.join(f'0x{w:08x}\n' if i % 2 else f'0b{w:032b}\n' for i, w in enumerate(palavras)))
+    _iguais(decodifica_paralelo(str(texto), 'texto', processos=3, tamanho_bloco=500), serial)
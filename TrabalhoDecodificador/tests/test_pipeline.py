@@ -0,0 +1,89 @@
+import pytest
+
+from montador import assemble_line
+from perfis import HI, LO, PERFIS
+from pipeline import PipelineModel
+
+BASE = 0x00400000
+
+
+def _trace(*linhas, saltos=None):
+    # instruções em sequência; saltos = {posição: posição seguinte} pra desvio tomado / salto
+    saltos = saltos or {}
+    trace = []
+    for i, linha in enumerate(linhas):
+        pc = BASE + 4 * i
+        trace.append((pc, assemble_line(linha), BASE + 4 * saltos.get(i, i + 1)))
+    return trace
+
+
+def _roda(trace, **opcoes):
+    return PipelineModel(**opcoes).processa(trace)
+
+
+def test_sem_dependencia_cinco_estagios():
+    r = _roda(_trace('add $t0, $t1, $t2', 'add $t3, $t4, $t5', 'add $t6, $t7, $s0'))
+    assert r['ciclos'] == 5 + 2 and sum(r['stalls'].values()) == 0
+
+
+def test_load_use_uma_bolha():
+    r = _roda(_trace('lw $t0, 0($sp)', 'add $t1, $t0, $t0'))
+    assert r['stalls'] == {'load_use': 1, 'raw': 0, 'branch': 0, 'jump': 0}
+    assert r['ciclos'] == 7
+    assert r['por_pc'] == {BASE + 4: {'load_use': 1, 'raw': 0, 'branch': 0, 'jump': 0}}
+
+
+def test_load_com_uma_instrucao_no_meio_nao_para():
+    r = _roda(_trace('lw $t0, 0($sp)', 'add $t2, $t3, $t4', 'add $t1, $t0, $t0'))
+    assert sum(r['stalls'].values()) == 0
+
+
+def test_raw_com_e_sem_forwarding():
+    trace = _trace('add $t0, $t1, $t2', 'sub $t3, $t0, $t1')
+    assert _roda(trace)['stalls']['raw'] == 0
+    assert _roda(trace, forwarding=False)['stalls']['raw'] == 2
+
+
+def test_zero_nao_cria_dependencia():
+    r = _roda(_trace('lw $zero, 0($sp)', 'add $t1, $zero, $zero'))
+    assert sum(r['stalls'].values()) == 0
+
+
+@pytest.mark.parametrize('desvio_em, penalidade', [('EX', 2), ('ID', 1)])
+def test_desvio_tomado_e_nao_tomado(desvio_em, penalidade):
+    tomado = _roda(_trace('beq $t0, $t1, 2', 'add $t2, $t2, $t2', 'add $t3, $t3, $t3', 'add $t4, $t4, $t4'),
+                   desvio_em=desvio_em)
+    assert tomado['stalls']['branch'] == 0  # o trace segue pc + 4: não tomado não paga nada
+    trace = _trace('beq $t0, $t1, 1', 'add $t2, $t2, $t2', 'add $t3, $t3, $t3', saltos={0: 2})
+    r = _roda(trace[:1] + trace[2:], desvio_em=desvio_em)
+    assert r['stalls']['branch'] == penalidade
+    assert r['ciclos'] == 2 + 5 - 1 + penalidade
+
+
+def test_desvio_em_id_espera_operando():
+    # resolvido em ID, o beq precisa do $t0 um ciclo antes do EX: uma bolha mesmo com forwarding
+    trace = _trace('add $t0, $t1, $t2', 'beq $t0, $t1, 4')
+    assert _roda(trace, desvio_em='ID')['stalls']['raw'] == 1
+    assert _roda(trace, desvio_em='EX')['stalls']['raw'] == 0
+
+
+def test_salto_custa_um_ciclo():
+    r = _roda(_trace('j 0x00400008', 'add $t0, $t0, $t0', 'add $t1, $t1, $t1', saltos={0: 2})[::2])
+    assert r['stalls'] == {'load_use': 0, 'raw': 0, 'branch': 0, 'jump': 1}
+
+
+def test_mult_mflo():
+    trace = _trace('mult $t0, $t1', 'mflo $t2', 'mfhi $t3')
+    assert sum(_roda(trace)['stalls'].values()) == 0
+    sem = _roda(trace, forwarding=False)
+    assert sem['stalls']['raw'] == 2
+
+
+def test_perfis_hilo():
+    def perfil(linha):
+        w = assemble_line(linha)
+        return PERFIS[((w >> 20) & 0xFC0) | (w & 0x3F)]
+    assert perfil('mult $t0, $t1')[3:5] == (True, True)
+    assert perfil('mthi $t0')[3:5] == (True, False)
+    assert perfil('mflo $t0')[5] == LO and perfil('mfhi $t0')[5] == HI
+    assert perfil('lw $t0, 0($sp)')[6] is True
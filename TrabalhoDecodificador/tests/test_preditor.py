@@ -0,0 +1,93 @@
+import pytest
+
+from preditor import (BimodalPredictor, BranchPredictionEngine, BranchTargetBuffer, GSharePredictor, PredictorConfig,
+                      ReturnAddressStack, StaticPredictor)
+
+PC_LACO = 0x0040000C
+BNE = (5 << 26) | (8 << 21) | 0xFFFC  # bne $t0, $zero, -4 -> volta pra 0x00400000
+ADD = 0x01084020  # add $t0, $t0, $t0
+
+
+def _laco(vezes: int, iteracoes: int = 5):
+    # laço de 5 voltas executado várias vezes: o desvio sai T T T T N
+    trace = []
+    for _ in range(vezes):
+        for i in range(iteracoes):
+            trace.append((PC_LACO - 4, ADD, PC_LACO))
+            tomado = i < iteracoes - 1
+            trace.append((PC_LACO, BNE, 0x00400000 if tomado else PC_LACO + 4))
+    return trace
+
+
+def _roda(*preditores, trace=None):
+    motor = BranchPredictionEngine([PredictorConfig(p) for p in preditores])
+    return motor.processa(_laco(3) if trace is None else trace)
+
+
+def test_acuracia_no_laco():
+    # 15 desvios (3 x T T T T N), contadas à mão:
+    #   sempre tomado: erra as 3 saídas
+    #   1 bit: erra a primeira volta, cada saída e a volta seguinte a cada saída
+    #   2 bits: erra a primeira volta e as 3 saídas (histerese segura a entrada seguinte)
+    #   gshare com 4 bits de história: erra a volta 1-4 e 6-8 aquecendo, depois acerta tudo
+    r = _roda(StaticPredictor('tomado'), StaticPredictor('nao_tomado'), BimodalPredictor(16, bits=1),
+              BimodalPredictor(16, bits=2), GSharePredictor(16, historia=4))
+    erros = {nome: valores['erros_direcao'] for nome, valores in r.items()}
+    assert erros == {
+        'estatico-tomado': 3,
+        'estatico-nao_tomado': 12,
+        'bimodal-1bit-16': 6,
+        'bimodal-2bit-16': 4,
+        'gshare-16-h4': 7,
+    }
+    assert r['bimodal-2bit-16']['acuracia'] == pytest.approx(11 / 15)
+    assert all(valores['desvios'] == 15 for valores in r.values())
+
+
+def test_histerese_do_contador_de_2_bits():
+    dois, um = BimodalPredictor(16, bits=2), BimodalPredictor(16, bits=1)
+    for preditor in (dois, um):
+        for tomado in (True, True, True, True, False):
+            preditor.atualiza(PC_LACO, 0x00400000, tomado)
+    # depois da saída do laço o de 2 bits ainda prevê tomado na reentrada; o de 1 bit já virou
+    assert dois.preve(PC_LACO, 0x00400000) is True
+    assert um.preve(PC_LACO, 0x00400000) is False
+
+
+def test_gshare_acerta_tudo_depois_de_aquecer():
+    motor = BranchPredictionEngine([PredictorConfig(GSharePredictor(16, historia=4))])
+    motor.processa(_laco(3))
+    antes = motor.relatorio()['gshare-16-h4']['erros_direcao']
+    motor.processa(_laco(10))
+    assert motor.relatorio()['gshare-16-h4']['erros_direcao'] == antes
+
+
+def test_ciclos_e_btb():
+    # sem BTB todo desvio tomado previsto certo ainda perde 1 ciclo buscando o alvo
+    motor = BranchPredictionEngine([PredictorConfig(StaticPredictor('tomado'), nome='sem'),
+                                    PredictorConfig(StaticPredictor('tomado'), btb=BranchTargetBuffer(16), nome='com')])
+    r = motor.processa(_laco(3))
+    assert r['sem']['erros_alvo'] == 12 and r['sem']['ciclos_penalidade'] == 3 * 2 + 12
+    # com BTB só a primeira volta fica sem alvo
+    assert r['com']['erros_alvo'] == 1 and r['com']['ciclos_penalidade'] == 3 * 2 + 1
+    assert motor.instrucoes == 30
+
+
+def test_ras_preve_retorno():
+    jal = (3 << 26) | (0x00400100 >> 2)
+    jr_ra = (31 << 21) | 8
+    trace = [(0x00400000, jal, 0x00400100), (0x00400100, jr_ra, 0x00400004)]
+    motor = BranchPredictionEngine([PredictorConfig(StaticPredictor(), nome='sem'),
+                                    PredictorConfig(StaticPredictor(), ras=ReturnAddressStack(4), nome='ras')])
+    r = motor.processa(trace)
+    assert r['sem']['erros_alvo'] == 2
+    assert r['ras']['erros_alvo'] == 1  # só o jal, o jr $ra sai da pilha
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        BimodalPredictor(12)
+    with pytest.raises(ValueError):
+        StaticPredictor('talvez')
+    with pytest.raises(ValueError):
+        BranchPredictionEngine([PredictorConfig(StaticPredictor()), PredictorConfig(StaticPredictor())])
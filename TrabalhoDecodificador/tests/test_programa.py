@@ -0,0 +1,72 @@
+import struct
+
+import pytest
+
+from decodificador_bruno_c_t_elias import TESTES, MIPSDecoder
+from programa import COLUNAS, DecodedProgram, _CABECALHO
+
+PALAVRAS = [int(bits, 2) for bits in TESTES]
+
+
+def test_colunas_com_tamanho_fixo():
+    programa = DecodedProgram.from_words(PALAVRAS)
+    tamanhos = {coluna: getattr(programa, coluna).itemsize for coluna in COLUNAS}
+    assert tamanhos['word'] == tamanhos['address'] == 4 and tamanhos['immediate'] == 2
+    assert programa.nbytes() == 19 * len(PALAVRAS)
+
+
+def test_visao_igual_ao_decoder():
+    decoder = MIPSDecoder()
+    programa = DecodedProgram.from_words(PALAVRAS, base=0x00400000)
+    for i, instr in enumerate(programa):
+        esperado = decoder.decode_cached(PALAVRAS[i])
+        assert instr.pc == 0x00400000 + 4 * i
+        assert (instr.word, instr.name, instr.type, instr.control) == \
+            (esperado.word, esperado.name, esperado.type, esperado.control)
+        assert instr.fields == dict(esperado.fields)
+        assert instr.mnemonic == esperado.mnemonic
+    assert programa[-1].word == PALAVRAS[-1]
+    with pytest.raises(IndexError):
+        programa[len(PALAVRAS)]
+
+
+def test_fatia():
+    programa = DecodedProgram.from_words(PALAVRAS, base=0x1000)
+    fatia = programa[10:20]
+    assert len(fatia) == 10 and fatia.base == 0x1000 + 40
+    assert list(fatia.word) == PALAVRAS[10:20]
+    assert [instr.mnemonic for instr in fatia] == [instr.mnemonic for instr in programa][10:20]
+    assert len(programa[-3:]) == 3 and len(programa[50:]) == 0
+    with pytest.raises(ValueError):
+        programa[::2]
+
+
+def test_save_load_ida_e_volta(tmp_path):
+    programa = DecodedProgram.from_words(PALAVRAS, base=0x00400000)
+    caminho = tmp_path / 'programa.bin'
+    programa.save(str(caminho))
+    lido = DecodedProgram.load(str(caminho))
+    assert len(lido) == len(programa) and lido.base == programa.base
+    for coluna in COLUNAS:
+        assert getattr(lido, coluna) == getattr(programa, coluna), coluna
+    # formato fixo: cabeçalho + cada coluna em little endian, independente da máquina
+    dados = caminho.read_bytes()
+    assert len(dados) == _CABECALHO.size + 19 * len(PALAVRAS)
+    n = len(PALAVRAS)
+    assert list(struct.unpack_from(f'<{n}I', dados, _CABECALHO.size)) == PALAVRAS
+
+
+def test_load_rejeita_arquivo_estranho(tmp_path):
+    caminho = tmp_path / 'outro.bin'
+    caminho.write_bytes(b'\x7fELF' + bytes(40))
+    with pytest.raises(ValueError):
+        DecodedProgram.load(str(caminho))
+
+
+def test_patch():
+    programa = DecodedProgram.from_words(PALAVRAS)
+    programa.patch(2, PALAVRAS[:2])
+    assert list(programa.word[:4]) == PALAVRAS[:2] * 2
+    assert programa[3].name == DecodedProgram.from_words(PALAVRAS)[1].name
+    with pytest.raises(IndexError):
+        programa.patch(len(PALAVRAS) - 1, PALAVRAS[:2])
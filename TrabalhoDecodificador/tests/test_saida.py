@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+
+import pytest
+
+from decodificador_bruno_c_t_elias import SINAIS, MIPSDecoder
+from programa import DecodedProgram
+from saida import CAMPOS, get_writer
+
+# texto que o decodificador original imprimia (Formato mnemônico no __init__ + print_output), copiado dele
+BASELINE = {
+    0x012A4020: 'Formato mnemônico: add $t0, $t1, $t2\nInstrução: add\n- Tipo: R\n- Campos:\n\topcode: 0\n'
+                '\trs: 9 ($t1)\n\trt: 10 ($t2)\n\trd: 8 ($t0)\n\tshamt: 0\n\tfunct: 32 (add)\n'
+                '- Sinais de controle:\n\tRegDst: 1\n\tALUSrc: 0\n\tMemToReg: 0\n\tRegWrite: 1\n\tMemRead: 0\n'
+                '\tMemWrite: 0\n\tBranch: 0\n\tJump: 0\n',
+    0x00021900: 'Formato mnemônico: sll $v1, $v0, 4\nInstrução: sll\n- Tipo: R\n- Campos:\n\topcode: 0\n'
+                '\trs: 0 ($zero)\n\trt: 2 ($v0)\n\trd: 3 ($v1)\n\tshamt: 4\n\tfunct: 0 (sll)\n'
+                '- Sinais de controle:\n\tRegDst: 1\n\tALUSrc: 0\n\tMemToReg: 0\n\tRegWrite: 1\n\tMemRead: 0\n'
+                '\tMemWrite: 0\n\tBranch: 0\n\tJump: 0\n',
+    0x03E00008: 'Formato mnemônico: jr $ra\nInstrução: jr\n- Tipo: R\n- Campos:\n\topcode: 0\n\trs: 31 ($ra)\n'
+                '\trt: 0 ($zero)\n\trd: 0 ($zero)\n\tshamt: 0\n\tfunct: 8 (jr)\n- Sinais de controle:\n'
+                '\tRegDst: 0\n\tALUSrc: 0\n\tMemToReg: 0\n\tRegWrite: 0\n\tMemRead: 0\n\tMemWrite: 0\n'
+                '\tBranch: 0\n\tJump: 1\n',
+    0x8C220014: 'Formato mnemônico: lw $v0, 20($at)\nInstrução: lw\n- Tipo: I\n- Campos:\n\topcode: 35 (lw)\n'
+                '\trs: 1 ($at)\n\trt: 2 ($v0)\n\timmediate: 20\n- Sinais de controle:\n\tRegDst: 0\n'
+                '\tALUSrc: 1\n\tMemToReg: 1\n\tRegWrite: 1\n\tMemRead: 1\n\tMemWrite: 0\n\tBranch: 0\n\tJump: 0\n',
+    0xAC220010: 'Formato mnemônico: sw $v0, 16($at)\nInstrução: sw\n- Tipo: I\n- Campos:\n\topcode: 43 (sw)\n'
+                '\trs: 1 ($at)\n\trt: 2 ($v0)\n\timmediate: 16\n- Sinais de controle:\n\tRegDst: 0\n'
+                '\tALUSrc: 1\n\tMemToReg: 0\n\tRegWrite: 0\n\tMemRead: 0\n\tMemWrite: 1\n\tBranch: 0\n\tJump: 0\n',
+    0x3C020064: 'Formato mnemônico: lui $v0, 100\nInstrução: lui\n- Tipo: I\n- Campos:\n\topcode: 15 (lui)\n'
+                '\trs: 0 ($zero)\n\trt: 2 ($v0)\n\timmediate: 100\n- Sinais de controle:\n\tRegDst: 0\n'
+                '\tALUSrc: 1\n\tMemToReg: 0\n\tRegWrite: 1\n\tMemRead: 0\n\tMemWrite: 0\n\tBranch: 0\n\tJump: 0\n',
+    0x0C000008: 'Formato mnemônico: jal 8\nInstrução: jal\n- Tipo: J\n- Campos:\n\topcode: 3 (jal)\n'
+                '\taddress: 8\n- Sinais de controle:\n\tRegDst: 0\n\tALUSrc: 0\n\tMemToReg: 0\n\tRegWrite: 1\n'
+                '\tMemRead: 0\n\tMemWrite: 0\n\tBranch: 0\n\tJump: 1\n',
+}
+PALAVRAS = list(BASELINE)
+
+
+def _interpreta(texto: str) -> dict:
+    # tira do texto do baseline o que os outros formatos mostram
+    linhas = texto.splitlines()
+    campos, sinais, secao = {}, {}, None
+    for linha in linhas[3:]:
+        if not linha.startswith('\t'):
+            secao = sinais if 'Sinais' in linha else campos
+            continue
+        chave, valor = linha.strip().split(': ')
+        secao[chave] = int(valor.split()[0])
+    return {
+        'mnemonic': linhas[0].split(': ', 1)[1],
+        'name': linhas[1].split(': ', 1)[1],
+        'type': linhas[2].split(': ', 1)[1],
+        'fields': campos,
+        'signals': sinais,
+    }
+
+
+def _escreve(formato: str, instrucoes) -> str:
+    destino = io.StringIO()
+    with get_writer(formato, destino) as escritor:
+        escritor.write_all(instrucoes)
+    return destino.getvalue()
+
+
+def _formas():
+    # os escritores aceitam Instruction, DecodedInstruction e InstructionView
+    decoder = MIPSDecoder()
+    return [
+        [decoder.decode_word(w) for w in PALAVRAS],
+        [decoder.decode_cached(w) for w in PALAVRAS],
+        list(DecodedProgram.from_words(PALAVRAS)),
+    ]
+
+
+@pytest.mark.parametrize('forma', range(3))
+def test_humano_igual_ao_baseline(forma):
+    assert _escreve('humano', _formas()[forma]) == ''.join(BASELINE.values())
+
+
+@pytest.mark.parametrize('forma', range(3))
+def test_jsonl(forma):
+    objetos = [json.loads(linha) for linha in _escreve('jsonl', _formas()[forma]).splitlines()]
+    for w, objeto in zip(PALAVRAS, objetos):
+        esperado = _interpreta(BASELINE[w])
+        assert objeto['word'] == w
+        assert {chave: objeto[chave] for chave in esperado} == esperado
+
+
+def test_csv():
+    linhas = list(csv.reader(io.StringIO(_escreve('csv', _formas()[0]))))
+    assert linhas[0] == ['word', 'type', 'name', 'mnemonic', *CAMPOS, *SINAIS]
+    for w, linha in zip(PALAVRAS, linhas[1:]):
+        esperado = _interpreta(BASELINE[w])
+        assert linha[:4] == [f'0x{w:08x}', esperado['type'], esperado['name'], esperado['mnemonic']]
+        assert linha[4:12] == [str(esperado['fields'].get(campo, '')) for campo in CAMPOS]
+        assert linha[12:] == [str(esperado['signals'][sinal]) for sinal in SINAIS]
+
+
+def test_tsv():
+    linhas = _escreve('tsv', _formas()[2]).splitlines()
+    for w, linha in zip(PALAVRAS, linhas):
+        esperado = _interpreta(BASELINE[w])
+        empacotado = sum(valor << i for i, valor in enumerate(esperado['signals'][s] for s in SINAIS))
+        assert linha.split('\t') == [f'{w:08x}', esperado['name'], esperado['mnemonic'], f'{empacotado:02x}']
+
+
+def test_buffer_pequeno_e_sem_cabecalho():
+    destino = io.StringIO()
+    escritor = get_writer('csv', destino, buffer_size=1, cabecalho=False)
+    escritor.write(MIPSDecoder().decode_word(PALAVRAS[0]))
+    assert destino.getvalue().startswith('0x012a4020,R,add,')  # já foi escrito, sem esperar o close
+    escritor.close()
+    with pytest.raises(ValueError):
+        get_writer('xml', io.StringIO())
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+from servidor import DecodeServer, _TAMANHO
+
+
+async def _conversa(envio: bytes, respostas_esperadas: int) -> list:
+    servidor = DecodeServer(cache_size=16)
+    await servidor.inicia(port=0)
+    host, port = servidor.endereco[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(envio)
+    await writer.drain()
+    respostas = []
+    for _ in range(respostas_esperadas):
+        linhas = []
+        while True:
+            linha = await asyncio.wait_for(reader.readline(), 5)
+            if linha == b'\n':
+                break
+            linhas.append(linha.decode().rstrip('\n'))
+        respostas.append(linhas)
+    writer.close()
+    servidor._servidor.close()
+    await servidor._servidor.wait_closed()
+    return respostas
+
+
+def test_pipelining_com_linha_vazia():
+    respostas = asyncio.run(_conversa(b'0x2002000a, 12\n\n0b100011\n', 3))
+    assert [len(r) for r in respostas] == [2, 0, 1]
+    assert respostas[0][0].startswith('2002000a\taddi\t')
+    assert respostas[2][0].startswith('00000023\t')
+
+
+def test_modo_com_tamanho():
+    async def conversa():
+        servidor = DecodeServer()
+        await servidor.inicia(port=0)
+        reader, writer = await asyncio.open_connection(*servidor.endereco[:2])
+        for lote in (b'0x2002000a xyz', b'12'):
+            writer.write(_TAMANHO.pack(len(lote)) + lote)
+        respostas = []
+        for _ in range(2):
+            tamanho, = _TAMANHO.unpack(await reader.readexactly(4))
+            respostas.append((await reader.readexactly(tamanho)).decode().splitlines())
+        writer.close()
+        servidor._servidor.close()
+        await servidor._servidor.wait_closed()
+        return respostas
+
+    primeira, segunda = asyncio.run(conversa())
+    assert primeira[0].startswith('2002000a\taddi\t') and primeira[1].startswith('!\txyz\t')
+    assert segunda == ['0000000c\tsyscall\tsyscall\t00']
+
+
+def test_memoria_fica_no_limite_do_cache():
+    servidor = DecodeServer(cache_size=16)
+    resposta = servidor.decodifica_lote(' '.join(str(0x20000000 + i) for i in range(100)).encode())
+    assert len(resposta.splitlines()) == 100
+    assert servidor.decoder.cache_info()['size'] == 16
+
+
+def test_lote_grande_roda_fora_do_laco():
+    threads = {}
+
+    class Servidor(DecodeServer):
+        def _decodifica_lote(self, dados):
+            threads[len(dados)] = threading.get_ident()
+            return super()._decodifica_lote(dados)
+
+    async def conversa():
+        servidor = Servidor(limite_executor=32)
+        await servidor.inicia(port=0)
+        reader, writer = await asyncio.open_connection(*servidor.endereco[:2])
+        grande = b' '.join([b'0x2002000a'] * 10)
+        for lote in (grande, b'12'):
+            writer.write(_TAMANHO.pack(len(lote)) + lote)
+        respostas = []
+        for _ in range(2):
+            tamanho, = _TAMANHO.unpack(await reader.readexactly(4))
+            respostas.append((await reader.readexactly(tamanho)).decode().splitlines())
+        writer.close()
+        servidor._servidor.close()
+        await servidor._servidor.wait_closed()
+        servidor._executor.shutdown()
+        return respostas, len(grande)
+
+    (primeira, segunda), grande = asyncio.run(conversa())
+    assert len(primeira) == 10 and all(linha.startswith('2002000a\taddi\t') for linha in primeira)
+    assert segunda == ['0000000c\tsyscall\tsyscall\t00']
+    assert threads[grande] != threading.get_ident()
+    assert threads[2] == threading.get_ident()
@@ -0,0 +1,168 @@
+import io
+
+import pytest
+
+from cache import CacheHierarchy
+from montador import assemble
+from simulador import TEXTO_BASE, MIPSSimulator, SimulationError
+
+SAI = 'addi $v0, $zero, 10\nsyscall'
+
+
+def _roda(texto, **registradores):
+    sim = MIPSSimulator(saida=io.StringIO())
+    sim.load(assemble(texto, TEXTO_BASE))
+    for nome, valor in registradores.items():
+        sim.set_register('$' + nome, valor)
+    sim.run(max_instrucoes=10000)
+    return sim
+
+
+def _com_sinal(x):
+    return x - (1 << 32) if x & 0x80000000 else x
+
+
+@pytest.mark.parametrize('texto, registradores', [
+    ('add $t2, $t0, $t1', {'t0': 0x7FFFFFFF, 't1': 1}),
+    ('add $t2, $t0, $t1', {'t0': 0x80000000, 't1': 0xFFFFFFFF}),
+    ('sub $t2, $t0, $t1', {'t0': 0x80000000, 't1': 1}),
+    ('addi $t2, $t0, 1', {'t0': 0x7FFFFFFF}),
+    ('addi $t2, $t0, -1', {'t0': 0x80000000}),
+])
+def test_overflow_dispara(texto, registradores):
+    with pytest.raises(SimulationError, match='overflow'):
+        _roda(texto, **registradores)
+
+
+def test_sem_overflow_nas_versoes_u():
+    sim = _roda('addu $t2, $t0, $t1\naddiu $t3, $t0, 1\nsubu $t4, $t1, $t0', t0=0x7FFFFFFF, t1=1)
+    assert sim.get_register('$t2') == 0x80000000
+    assert sim.get_register('$t3') == 0x80000000
+    assert sim.get_register('$t4') == 0x80000002
+    assert _roda('add $t2, $t0, $t1', t0=0xFFFFFFFF, t1=0xFFFFFFFF).get_register('$t2') == 0xFFFFFFFE
+
+
+@pytest.mark.parametrize('a, b', [(7, 2), (-7, 2), (7, -2), (-7, -2), (0, 5)])
+def test_div_com_sinal_trunca_pra_zero(a, b):
+    sim = _roda('div $t0, $t1\nmflo $t2\nmfhi $t3', t0=a & 0xFFFFFFFF, t1=b & 0xFFFFFFFF)
+    quociente = int(a / b)
+    assert _com_sinal(sim.get_register('$t2')) == quociente
+    assert _com_sinal(sim.get_register('$t3')) == a - quociente * b  # resto com o sinal do dividendo
+
+
+def test_divu_e_div_por_zero():
+    sim = _roda('divu $t0, $t1\nmflo $t2\nmfhi $t3', t0=0xFFFFFFFF, t1=2)
+    assert (sim.get_register('$t2'), sim.get_register('$t3')) == (0x7FFFFFFF, 1)
+    sim = _roda('mthi $t0\nmtlo $t0\ndiv $t1, $zero', t0=5, t1=9)
+    assert (sim.hi, sim.lo) == (5, 5)  # indefinido: HI/LO ficam como estavam
+
+
+def test_mult_multu_mfhi_mflo():
+    sim = _roda('mult $t0, $t1\nmfhi $t2\nmflo $t3', t0=(-3) & 0xFFFFFFFF, t1=0x40000000)
+    assert (sim.get_register('$t2'), sim.get_register('$t3')) == (0xFFFFFFFF, 0x40000000)
+    sim = _roda('multu $t0, $t1\nmfhi $t2\nmflo $t3', t0=0xFFFFFFFF, t1=2)
+    assert (sim.get_register('$t2'), sim.get_register('$t3')) == (1, 0xFFFFFFFE)
+
+
+def test_mthi_mtlo():
+    sim = _roda('mthi $t0\nmtlo $t1\nmfhi $t2\nmflo $t3', t0=11, t1=22)
+    assert (sim.hi, sim.lo, sim.get_register('$t2'), sim.get_register('$t3')) == (11, 22, 11, 22)
+
+
+def test_loads_com_e_sem_sinal():
+    sim = _roda('lui $t0, 0x1001\nlui $t1, 0x80FF\nori $t1, $t1, 0xFF80\nsw $t1, 0($t0)\n'
+                'lb $s0, 0($t0)\nlbu $s1, 0($t0)\nlb $s2, 3($t0)\nlbu $s3, 3($t0)\n'
+                'lh $s4, 0($t0)\nlhu $s5, 0($t0)\nlh $s6, 2($t0)\nlhu $s7, 2($t0)\nlw $t2, 0($t0)')
+    # big endian: bytes 80 ff ff 80
+    assert [sim.get_register(f'$s{i}') for i in range(8)] == [
+        0xFFFFFF80, 0x80, 0xFFFFFF80, 0x80, 0xFFFF80FF, 0x80FF, 0xFFFFFF80, 0xFF80]
+    assert sim.get_register('$t2') == 0x80FFFF80
+
+
+def test_sb_sh_e_acesso_desalinhado():
+    sim = _roda('lui $t0, 0x1001\naddi $t1, $zero, 0x1234\nsh $t1, 2($t0)\nsb $t1, 0($t0)\nlw $t2, 0($t0)')
+    assert sim.get_register('$t2') == 0x34001234
+    with pytest.raises(SimulationError, match='desalinhado'):
+        _roda('lui $t0, 0x1001\nlw $t1, 2($t0)')
+
+
+def test_desvios_tomado_e_nao_tomado():
+    sim = _roda('''
+        addi $t0, $zero, 3
+        beq $t0, $zero, fora
+        addi $t1, $zero, 1        # executa: beq não tomado
+        bne $t0, $zero, pula
+        addi $t1, $zero, 99       # pulado: bne tomado
+    pula:
+        addi $t2, $zero, -1
+        bgez $t2, fora
+        blez $t2, menos
+        addi $t3, $zero, 99
+    menos:
+        bgtz $t0, fim
+    fora:
+        addi $t4, $zero, 99
+    fim:
+        ''' + SAI)
+    assert [sim.get_register(f'$t{i}') for i in range(1, 5)] == [1, 0xFFFFFFFF, 0, 0]
+    assert sim.motivo == 'exit'
+
+
+def test_jal_jr_e_loop():
+    sim = _roda('''
+        addi $a0, $zero, 5
+        jal soma
+        add $s0, $v0, $zero
+        ''' + SAI + '''
+    soma:
+        add $v0, $zero, $zero
+    laco:
+        add $v0, $v0, $a0
+        addi $a0, $a0, -1
+        bne $a0, $zero, laco
+        jr $ra''')
+    assert sim.get_register('$s0') == 15
+    assert sim.get_register('$ra') == TEXTO_BASE + 8
+
+
+def test_syscall_saida_e_impressao():
+    sim = _roda('addi $a0, $zero, -42\naddi $v0, $zero, 1\nsyscall\n'
+                'addi $a0, $zero, 7\naddi $v0, $zero, 17\nsyscall\naddi $t0, $zero, 1')
+    assert sim.saida.getvalue() == '-42'
+    assert sim.motivo == 'exit' and sim.codigo_saida == 7
+    assert sim.get_register('$t0') == 0
+    assert sim.pc == TEXTO_BASE + 24
+    assert _roda('break\naddi $t0, $zero, 1').motivo == 'break'
+
+
+def test_escrita_no_zero_descartada():
+    sim = _roda('addi $zero, $zero, 5\nlui $zero, 0xFFFF\nadd $t0, $zero, $zero\njal fim\nfim: jalr $zero, $t1',
+                t1=TEXTO_BASE + 20)
+    assert sim.get_register('$zero') == 0 and sim.get_register('$t0') == 0
+    sim.set_register('$zero', 9)
+    assert sim.get_register(0) == 0
+
+
+def test_rastreia_da_endereco_do_lwc1_e_swc1():
+    sim = MIPSSimulator()
+    # o montador só conhece os nomes dos registradores inteiros: $0/$2 aqui são o $f0/$f2
+    sim.load(assemble('lui $t0, 0x1001\nswc1 $0, 8($t0)\nlwc1 $2, 12($t0)'))
+    eventos = list(sim.rastreia())
+    assert [evento[3] for evento in eventos] == [None, 0x10010008, 0x1001000C]
+    caches = CacheHierarchy()
+    caches.processa(eventos)
+    l1d = caches.l1d.estatisticas()
+    assert (l1d['leituras'], l1d['escritas']) == (1, 1)
+
+
+def test_codigo_que_se_modifica():
+    # o sw troca o "addi $t1, $zero, 1" do fim por "addi $t1, $zero, 2" antes de chegar nele
+    novo = assemble('addi $t1, $zero, 2')[0]
+    sim = _roda(f'''
+        lui $t0, {TEXTO_BASE >> 16}
+        lui $t2, {novo >> 16}
+        ori $t2, $t2, {novo & 0xFFFF}
+        sw $t2, 20($t0)
+        sll $zero, $zero, 0
+        addi $t1, $zero, 1''')
+    assert sim.get_register('$t1') == 2